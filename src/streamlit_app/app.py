@@ -2,86 +2,111 @@ from __future__ import annotations
 
 import datetime
 import sys
-import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
 import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # Add src directory to Python path for imports
 SRC_DIR = str(Path(__file__).resolve().parents[1])
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
-from streamlit_app.config import resolve_network_config
+from streamlit_app.config import VIEWER_ONLY, WORKER_IDLE_TTL_S
 from streamlit_app.core.abi import find_all_events, load_abi_from_json
-from streamlit_app.core.app_logic import run_initial_sync, run_live_tick
-from streamlit_app.datasources.blockscout import BlockscoutClient
-from streamlit_app.datasources.rpc import RpcClient
+from streamlit_app.core.sync import event_topic0
+from streamlit_app.core.worker import SyncState, SyncWorker
+from streamlit_app.service import SyncHub, create_worker
 from streamlit_app.ui.sidebar import render_sidebar
-from streamlit_app.ui.state import ensure_session_state
-from streamlit_app.ui.views import render_main
+from streamlit_app.ui.state import AppState, ensure_session_state
+from streamlit_app.ui.views import format_sync_progress, render_main
 from streamlit_app.utils.secrets import load_secrets_from_dotenv
 
 
-# Cache heavy resources (connections, clients)
+# One background sync worker per (chain, contract, event), shared by all sessions
 @st.cache_resource
-def get_clients(chain: str) -> tuple[BlockscoutClient, RpcClient]:
-    """Get cached Blockscout and RPC clients."""
-    network_config = resolve_network_config(chain)
-    blockscout = BlockscoutClient(
-        base_url=network_config["blockscout_api"],
-        api_key=None,
-        rate_limit_qps=3.0,  # Will be overridden by user setting
+def get_hub() -> SyncHub:
+    """Get the process-wide hub of sync workers and their session subscriptions."""
+    return SyncHub(idle_ttl=WORKER_IDLE_TTL_S)
+
+
+def _session_id() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else ""
+
+
+def _new_worker(chain: str, contract_address: str, event_abi: dict[str, Any]) -> SyncWorker:
+    worker = create_worker(chain=chain, contract_address=contract_address, event_abi=event_abi, read_only=VIEWER_ONLY)
+    if worker.read_only or worker.state.syncing:
+        # Follow the log, or resume a backfill interrupted by a restart
+        worker.start()
+    return worker
+
+
+def get_worker(chain: str, contract_address: str, topic0: str, event_abi: dict[str, Any]) -> SyncWorker:
+    """Subscribe this session to the shared worker that owns the clients and event store for a key.
+
+    With ``VIEWER_ONLY`` the worker only follows the event log written by
+    ``distributor-monitor sync``.
+    """
+    hub = refresh_hub()
+    return hub.subscribe(
+        _session_id(), (chain, contract_address, topic0), lambda: _new_worker(chain, contract_address, event_abi)
     )
-    rpc = RpcClient(base_url=network_config["ankr_rpc"])
-    return blockscout, rpc
-
-
-# Add caching for data fetching with TTL
-@st.cache_data(ttl=5)  # Cache for 5 seconds to prevent excessive API calls
-def fetch_data_cached(
-    chain: str,
-    contract_address: str,
-    event_abi: dict[str, Any],
-    from_block: int,
-    page_size: int,
-    decimals: int,
-    is_live: bool = False,
-    existing_events: list[dict[str, Any]] | None = None,
-    confirmation_blocks: int = 6,
-) -> tuple[list[dict[str, Any]], int, datetime.datetime]:
-    """Cached data fetching function."""
-    blockscout, rpc = get_clients(chain)
-    blockscout._qps = 3.0  # Default rate limit
-
-    current_time = datetime.datetime.now()
-
-    if is_live and existing_events:
-        # Live update
-        res = run_live_tick(
-            blockscout_client=blockscout,
-            rpc_client=rpc,
-            address=contract_address,
-            event_abi=event_abi,
-            existing_events=existing_events,
-            confirmation_blocks=confirmation_blocks,
-            page_size=page_size,
-            decimals=decimals,
-        )
-    else:
-        # Initial sync
-        res = run_initial_sync(
-            blockscout_client=blockscout,
-            rpc_client=rpc,
-            address=contract_address,
-            event_abi=event_abi,
-            from_block=from_block,
-            page_size=page_size,
-            decimals=decimals,
-        )
 
-    return res.events, res.cursor.last_block, current_time
+
+def refresh_hub() -> SyncHub:
+    """Drop subscriptions of closed sessions and evict workers nobody watches any more."""
+    hub = get_hub()
+    if runtime.exists():
+        hub.prune(runtime.get_instance().is_active_session)
+    hub.evict_idle()
+    return hub
+
+
+# Live regions redraw once a second, like the status line they replace
+LIVE_TICK_SECONDS: float = 1.0
+
+
+def follow_worker(worker: SyncWorker, state: SyncState, *, refresh_seconds: int) -> Callable[[AppState], None]:
+    """Return a live-fragment tick that pulls the worker's latest state into the session.
+
+    Ticks only redraw the metrics, chart and table fragment. When a change also
+    affects the rest of the page (the sync finished or failed, live sync started
+    or stopped, the store was replaced or got its first events) the whole script
+    reruns instead.
+    """
+    had_events = len(state.store) > 0
+
+    def tick(app: AppState) -> None:
+        current = worker.state
+        if (
+            current.syncing != state.syncing
+            or current.live != state.live
+            or current.error != state.error
+            or current.store is not state.store
+            or had_events != (len(current.store) > 0)
+        ):
+            st.rerun()
+        app.store = current.store
+        app.events = current.store
+        app.last_block = current.last_block
+        app.last_sync_time = current.last_sync_time
+        if current.progress is not None:
+            st.progress(current.progress.fraction, text=f"🔄 Syncing: {format_sync_progress(current.progress)}")
+        elif current.syncing:
+            st.info("🔄 Sync running in background...")
+        elif current.last_sync_time is not None:
+            time_since_last = (datetime.datetime.now() - current.last_sync_time).total_seconds()
+            next_update_in = max(0, refresh_seconds - time_since_last)
+            st.info(f"🔄 Next update in {next_update_in:.0f} seconds...")
+        else:
+            st.info("🔄 Waiting for first update...")
+
+    return tick
 
 
 def main() -> None:
@@ -91,6 +116,9 @@ def main() -> None:
     render_sidebar()
 
     app = ensure_session_state(st)
+    # A reset applies to the contract watched when it was clicked: if no worker
+    # resolves in this run, it must not wipe whichever contract is picked next
+    reset_requested, app.trigger_reset = app.trigger_reset, False
 
     # Upload ABI and select events (support default ABI)
     abi_file = st.sidebar.file_uploader("Upload ABI.json", type=["json"])
@@ -112,108 +140,65 @@ def main() -> None:
         default_names = claim_names if claim_names else names[:1]  # At least one event
         app.selected_event_names = st.sidebar.multiselect("Events to monitor", options=names, default=default_names)
 
-    # Async actions
+    # Background sync: sessions control the shared worker and read its published state
+    worker: SyncWorker | None = None
     if app.contract_address and app.abi_events:
         selected_events = [e for e in app.abi_events if e.get("name") in app.selected_event_names]
         if selected_events:
             # For now, use the first selected event ABI
             event_abi = selected_events[0]
-
-            # Clients (cached for better performance)
-            blockscout, rpc = get_clients(app.chain)
-            # Update rate limit from user settings
-            blockscout._qps = app.rate_limit_qps
-
-            if app.trigger_initial_sync:
-                try:
-                    with st.spinner("Running initial sync..."):
-                        st.info(f"Syncing from block {app.from_block} for contract {app.contract_address}")
-                        events, last_block, sync_time = fetch_data_cached(
-                            chain=app.chain,
-                            contract_address=app.contract_address,
-                            event_abi=event_abi,
-                            from_block=app.from_block,
-                            page_size=app.page_size,
-                            decimals=app.token_decimals,
-                            is_live=False,
-                        )
-                        app.events = events
-                        app.last_block = last_block
-                        app.last_sync_time = sync_time
-                        app.trigger_initial_sync = False
-                        if not events:
-                            st.warning(f"No events found from block {app.from_block}. Try a different block range or check the contract address.")
-                        else:
-                            st.success(f"Found {len(events)} events, last block: {last_block}")
-                except Exception as exc:
-                    st.error(f"Initial Sync failed: {exc}")
-                    app.trigger_initial_sync = False
-
-    # Render main content first
-    render_main()
-
-    # Live mode with st.empty() approach
-    if app.live_running and app.contract_address and app.abi_events:
-        selected_events = [e for e in app.abi_events if e.get("name") in app.selected_event_names]
-        if selected_events:
-            event_abi = selected_events[0]
             refresh_seconds = max(5, int(app.poll_interval_ms / 1000))
 
-            # Create placeholder for live updates
-            live_placeholder = st.empty()
-
-            try:
-                while app.live_running:
-                    current_time = datetime.datetime.now()
-
-                    # Check if we need to update
-                    should_update = (
-                        app.last_sync_time is None or
-                        (current_time - app.last_sync_time).total_seconds() >= refresh_seconds
-                    )
-
-                    if should_update:
-                        with live_placeholder.container():
-                            st.info("🔄 Updating data...")
-
-                            events, last_block, sync_time = fetch_data_cached(
-                                chain=app.chain,
-                                contract_address=app.contract_address,
-                                event_abi=event_abi,
-                                from_block=app.from_block,
-                                page_size=app.page_size,
-                                decimals=app.token_decimals,
-                                is_live=True,
-                                existing_events=app.events,
-                                confirmation_blocks=app.confirmation_blocks,
-                            )
-
-                            # Update state
-                            old_count = len(app.events)
-                            app.events = events
-                            app.last_block = last_block
-                            app.last_sync_time = sync_time
-                            new_count = len(events)
-
-                            # Show result
-                            if new_count > old_count:
-                                st.success(f"✅ Found {new_count - old_count} new events! Total: {new_count}")
-                            else:
-                                st.info(f"✅ No new events. Total: {new_count}")
-                    else:
-                        # Show countdown
-                        if app.last_sync_time is not None:
-                            time_since_last = (current_time - app.last_sync_time).total_seconds()
-                            next_update_in = max(0, refresh_seconds - time_since_last)
-                            with live_placeholder.container():
-                                st.info(f"🔄 Next update in {next_update_in:.0f} seconds...")
-
-                    # Wait before next check
-                    time.sleep(1)
-
-            except Exception as exc:
-                st.error(f"Live update failed: {exc}")
-                app.live_running = False
+            worker = get_worker(app.chain, app.contract_address.lower(), event_topic0(event_abi), event_abi)
+            # Token decimals stay per session (aggregates are rescaled per viewer), so
+            # viewers with different settings do not rebuild the shared totals
+            if not get_hub().configure(
+                _session_id(),
+                page_size=app.page_size,
+                confirmation_blocks=app.confirmation_blocks,
+                poll_interval_s=refresh_seconds,
+                rate_limit_qps=app.rate_limit_qps,
+                backfill_chunk_blocks=app.backfill_chunk_blocks,
+            ):
+                st.warning("Other viewers of this contract sync it with different settings; yours apply once they leave.")
+            if worker.read_only:
+                # Sessions cannot start syncs; the headless sync process writes the log
+                app.trigger_initial_sync = False
+                app.pending_snapshot = None
+            else:
+                if reset_requested:
+                    worker.reset()
+                if app.pending_snapshot is not None:
+                    baseline = app.pending_snapshot
+                    worker.import_snapshot(baseline)
+                    app.pending_snapshot = None
+                    st.info(f"Imported snapshot up to block {baseline.last_block}; live sync resumes from block {baseline.last_block + 1}")
+                if app.trigger_initial_sync:
+                    st.info(f"Syncing from block {app.from_block} for contract {app.contract_address}")
+                    worker.request_initial_sync(app.from_block)
+                    app.trigger_initial_sync = False
+                # Live sync runs while any viewer of the worker has it on
+                get_hub().set_live(_session_id(), app.live_running)
+
+            state = worker.state
+            app.store = state.store
+            app.events = state.store
+            app.last_block = state.last_block
+            app.last_sync_time = state.last_sync_time
+            if state.error:
+                st.error(f"Sync failed: {state.error}")
+            elif not state.syncing and state.last_sync_time is not None and not len(state.store) and state.store.baseline is None:
+                st.warning(f"No events found from block {app.from_block}. Try a different block range or check the contract address.")
+
+    if worker is None:
+        # Watching nothing: release this session's subscription, if any
+        refresh_hub().unsubscribe(_session_id())
+
+    # Refresh the live regions while the worker is syncing, live or following a sync process
+    if worker is not None and (app.live_running or state.syncing or worker.read_only):
+        render_main(on_tick=follow_worker(worker, state, refresh_seconds=refresh_seconds), run_every=LIVE_TICK_SECONDS)
+    else:
+        render_main()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from .config import API_QPS, DATA_DIR, NETWORKS, PAGE_SIZE_DEFAULT
+from .core.abi import find_all_events, load_abi_from_json
+from .core.event_log import SqliteEventLog, event_log_path
+from .core.exports import (
+    COMPRESSIONS,
+    CompressionError,
+    SnapshotCache,
+    compression_for_path,
+    write_events_csv,
+)
+from .core.sync import event_topic0
+from .core.worker import SyncState, SyncWorker
+from .service import create_worker
+from .utils.secrets import load_secrets_from_dotenv
+
+logger = logging.getLogger("distributor_monitor.sync")
+
+
+def select_event_abi(abi: list[dict[str, Any]], name: str | None) -> dict[str, Any]:
+    """Pick the event to sync: ``name`` if given, else the first claim-like event."""
+    events = find_all_events(abi)
+    if name is not None:
+        matches = [e for e in events if e.get("name") == name]
+    else:
+        matches = [e for e in events if "claim" in str(e.get("name", "")).lower()] or events[:1]
+    if not matches:
+        raise ValueError(f"Event {name!r} not found in ABI" if name else "ABI has no events")
+    return matches[0]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="distributor-monitor", description="Distributor Monitor tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser(
+        "sync",
+        help="Sync claim events headless into the shared event log",
+        description=(
+            "Run initial sync (when the log is empty or --resync is given), then poll for new "
+            "events until interrupted. The Streamlit UI started with VIEWER_ONLY=1 reads the same log."
+        ),
+    )
+    _add_log_arguments(sync)
+    sync.add_argument("--from-block", type=int, default=0, help="Start block for initial sync")
+    sync.add_argument("--resync", action="store_true", help="Run initial sync even if the log has data")
+    sync.add_argument("--page-size", type=int, default=PAGE_SIZE_DEFAULT)
+    sync.add_argument("--confirmations", type=int, default=6)
+    sync.add_argument("--chunk-blocks", type=int, default=100_000, help="Backfill chunk size, newest first")
+    sync.add_argument("--interval", type=float, default=5.0, help="Seconds between live ticks")
+    sync.add_argument("--qps", type=float, default=API_QPS, help="Blockscout request rate limit")
+    sync.add_argument("--once", action="store_true", help="Exit once caught up (or on the first error)")
+
+    export = commands.add_parser(
+        "export",
+        help="Stream events CSV and/or a snapshot from the event log to files",
+        description="Compression is taken from --compression or the file suffix (.gz for gzip, .zst for zstd).",
+    )
+    _add_log_arguments(export)
+    export.add_argument("--events", type=Path, default=None, help="Write the events CSV here")
+    export.add_argument("--snapshot", type=Path, default=None, help="Write the snapshot JSON here")
+    export.add_argument("--compression", choices=COMPRESSIONS, default=None)
+    return parser
+
+
+def _add_log_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments selecting the (chain, contract, event) log and how to read it."""
+    parser.add_argument("--chain", choices=list(NETWORKS), default="sepolia")
+    parser.add_argument("--contract", required=True, help="Distributor contract address")
+    parser.add_argument("--abi", type=Path, default=Path("abi_distributor.json"), help="ABI JSON file")
+    parser.add_argument("--event", default=None, help="Event name (default: first claim-like event)")
+    parser.add_argument("--decimals", type=int, default=18)
+    parser.add_argument("--data-dir", default=DATA_DIR or "data", help="Directory for event logs")
+
+
+def _log_state(state: SyncState) -> None:
+    if state.error:
+        logger.error("sync failed: %s", state.error)
+    else:
+        logger.info(
+            "events=%d claims=%d last_block=%d syncing=%s backfill_from=%s",
+            len(state.store),
+            state.aggregates.claims_count,
+            state.last_block,
+            state.syncing,
+            state.backfill_from,
+        )
+
+
+def run_sync(args: argparse.Namespace, stop: threading.Event) -> int:
+    """Run the sync worker until ``stop`` is set (or after one step with ``--once``)."""
+    event_abi = select_event_abi(load_abi_from_json(args.abi.read_bytes()), args.event)
+    worker: SyncWorker = create_worker(
+        chain=args.chain,
+        contract_address=args.contract,
+        event_abi=event_abi,
+        data_dir=args.data_dir,
+        rate_limit_qps=args.qps,
+    )
+    worker.configure(
+        decimals=args.decimals,
+        page_size=args.page_size,
+        confirmation_blocks=args.confirmations,
+        poll_interval_s=args.interval,
+        backfill_chunk_blocks=args.chunk_blocks,
+    )
+    event_log = worker.event_log
+    needs_initial = args.resync or event_log is None or event_log.head().cursor is None
+    logger.info(
+        "syncing %s on %s into %s", event_abi.get("name"), args.chain, event_log.path if event_log else "memory"
+    )
+
+    initial = worker.state
+    if needs_initial:
+        worker.request_initial_sync(args.from_block)
+    if not (args.once and needs_initial):
+        worker.set_live(True)
+
+    last = initial
+    try:
+        while not stop.wait(1.0):
+            state = worker.state
+            if state is last:
+                continue
+            _log_state(state)
+            last = state
+            if args.once and (state.error or (not state.syncing and state.last_sync_time is not None)):
+                break
+    finally:
+        worker.stop(timeout=30)
+    return 1 if last.error else 0
+
+
+def run_export(args: argparse.Namespace) -> int:
+    """Stream exports of a synced event log to files without building them in memory."""
+    if args.events is None and args.snapshot is None:
+        logger.error("nothing to export: pass --events and/or --snapshot")
+        return 2
+    event_abi = select_event_abi(load_abi_from_json(args.abi.read_bytes()), args.event)
+    path = event_log_path(args.data_dir, chain=args.chain, contract=args.contract, topic0=event_topic0(event_abi))
+    if not path.exists():
+        logger.error("no event log at %s; run the sync command first", path)
+        return 1
+    store = SqliteEventLog(path).load(decimals=args.decimals)
+    try:
+        if args.events is not None:
+            write_events_csv(store, args.events, compression=args.compression or compression_for_path(args.events))
+            logger.info("wrote %d events to %s", len(store), args.events)
+        if args.snapshot is not None:
+            cache = SnapshotCache(chain=args.chain, contract=args.contract)
+            cache.write(
+                store, args.snapshot, decimals=args.decimals, compression=args.compression or compression_for_path(args.snapshot)
+            )
+            logger.info("wrote snapshot at block %d to %s", store.last_block, args.snapshot)
+    except CompressionError as exc:
+        logger.error("%s", exc)
+        return 1
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    load_secrets_from_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args = build_parser().parse_args(argv)
+
+    if args.command == "export":
+        return run_export(args)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        return run_sync(args, stop)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -29,6 +29,12 @@ NETWORKS: dict[str, NetworkTemplate] = {
 PAGE_SIZE_DEFAULT: int = 1000
 API_QPS: int = 3
 CACHE_TTL_SEC: int = 30
+# Directory for durable per-contract event logs; empty disables persistence
+DATA_DIR: str = os.getenv("DATA_DIR", "data")
+# Run the UI as a read-only viewer of logs written by `distributor-monitor sync`
+VIEWER_ONLY: bool = os.getenv("VIEWER_ONLY", "").lower() in ("1", "true", "yes")
+# Seconds a sync worker nobody is watching is kept before it is stopped and dropped
+WORKER_IDLE_TTL_S: float = float(os.getenv("WORKER_IDLE_TTL_S", "300"))
 
 
 def _with_ankr_key(url_template: str) -> str:
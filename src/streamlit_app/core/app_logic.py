@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from typing import Any
 
-from .sync import SyncResult, incremental_sync, initial_sync
+from .event_store import EventStore
+from .sync import Cursor, ProgressCallback, SyncResult, incremental_sync, initial_sync
 
 
 def run_initial_sync(
@@ -15,8 +16,14 @@ def run_initial_sync(
     from_block: int,
     page_size: int,
     decimals: int,
+    store: EventStore | None = None,
+    progress: ProgressCallback | None = None,
 ) -> SyncResult:
-    """Synchronous initial sync."""
+    """Synchronous initial sync.
+
+    ``progress`` receives a ``SyncProgress`` (blocks covered, pages, logs/s, ETA)
+    after every fetched page.
+    """
     latest_block: int = rpc_client.get_latest_block_number()  # Remove await
     if latest_block <= 0:
         # Fallback if RPC is not configured/available. Use a very high block number
@@ -30,6 +37,8 @@ def run_initial_sync(
         to_block=latest_block,
         page_size=page_size,
         decimals=decimals,
+        store=store,
+        progress=progress,
     )
 
 
@@ -39,22 +48,24 @@ def run_live_tick(
     rpc_client: Any,
     address: str,
     event_abi: dict[str, Any],
-    existing_events: Iterable[dict[str, Any]],
     confirmation_blocks: int,
     page_size: int,
     decimals: int,
+    existing_events: Iterable[Mapping[str, Any]] | None = None,
+    store: EventStore | None = None,
 ) -> SyncResult:
     """Synchronous live tick."""
     latest_block: int = rpc_client.get_latest_block_number()  # Remove await
     if latest_block <= 0:
         # If we cannot get latest, do a no-op tick to avoid clearing data
-        from .claims_aggregate import aggregate_claims
-        from .sync import Cursor
-
-        events_list = list(existing_events)
-        aggregates = aggregate_claims(events_list, decimals=decimals)
-        last_block = max((int(e.get("block_number", 0)) for e in events_list), default=0)
-        return SyncResult(events=events_list, aggregates=aggregates, cursor=Cursor(last_block=last_block))
+        if store is None:
+            store = EventStore(existing_events, decimals=decimals)
+        return SyncResult(
+            events=store,
+            aggregates=store.aggregates(decimals=decimals),
+            cursor=Cursor(last_block=store.last_block),
+            store=store,
+        )
     return incremental_sync(  # Remove await
         blockscout_client=blockscout_client,
         address=address,
@@ -64,6 +75,7 @@ def run_live_tick(
         page_size=page_size,
         decimals=decimals,
         existing_events=existing_events,
+        store=store,
     )
 
 
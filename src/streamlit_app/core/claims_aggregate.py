@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from decimal import Decimal, getcontext
 from typing import Any
@@ -17,14 +17,23 @@ class ClaimsAggregate:
     distribution_by_address: dict[str, Decimal]
 
 
+@dataclass(frozen=True)
+class ClaimsBaseline:
+    """Claim totals carried over from a snapshot, covering blocks up to ``last_block``."""
+
+    last_block: int
+    claimed_raw: dict[str, int]
+    claims_count: int
+
+
 def _to_decimal(value: int, decimals: int) -> Decimal:
     factor: Decimal = Decimal(10) ** decimals
     return Decimal(value) / factor
 
 
-def deduplicate_events(events: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+def deduplicate_events(events: Iterable[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
     seen: set[tuple[str, int]] = set()
-    out: list[dict[str, Any]] = []
+    out: list[Mapping[str, Any]] = []
     for e in events:
         key = (str(e.get("tx_hash", "")), int(e.get("log_index", 0)))
         if key in seen:
@@ -34,31 +43,75 @@ def deduplicate_events(events: Iterable[dict[str, Any]]) -> list[dict[str, Any]]
     return out
 
 
-def aggregate_claims(events: Iterable[dict[str, Any]], *, decimals: int) -> ClaimsAggregate:
-    total_raw: int = 0
-    dist: dict[str, Decimal] = {}
-    claimers: set[str] = set()
-    count: int = 0
-    for e in events:
-        claimer = str(e.get("claimer", "")).lower()
-        amount_raw = int(e.get("amount_raw", 0))
-        total_raw += amount_raw
-        dist[claimer] = dist.get(claimer, Decimal(0)) + _to_decimal(amount_raw, decimals)
-        claimers.add(claimer)
-        count += 1
-
-    return ClaimsAggregate(
-        total_claimed_raw=total_raw,
-        total_claimed_adj=_to_decimal(total_raw, decimals),
-        unique_claimers=len(claimers),
-        claims_count=count,
-        distribution_by_address=dist,
-    )
+class ClaimsAccumulator:
+    """Running claim totals that can be extended one event at a time.
+
+    The distribution dict is owned by the accumulator and keeps growing as events
+    are added; aggregates produced by :meth:`result` share it instead of copying.
+    """
+
+    def __init__(self, *, decimals: int) -> None:
+        self.decimals: int = decimals
+        self.total_raw: int = 0
+        self.count: int = 0
+        self.distribution: dict[str, Decimal] = {}
+
+    def add(self, event: Mapping[str, Any]) -> None:
+        self.add_claim(str(event.get("claimer", "")).lower(), int(event.get("amount_raw", 0)))
+
+    def add_claim(self, claimer: str, amount_raw: int) -> None:
+        """Add one claim; ``claimer`` must already be lowercased."""
+        self.total_raw += amount_raw
+        self.distribution[claimer] = self.distribution.get(claimer, Decimal(0)) + _to_decimal(amount_raw, self.decimals)
+        self.count += 1
+
+    def remove_claim(self, claimer: str, amount_raw: int, *, drop: bool = False) -> None:
+        """Take back a claim added with :meth:`add_claim`; ``drop`` also forgets the claimer."""
+        self.total_raw -= amount_raw
+        if drop:
+            del self.distribution[claimer]
+        else:
+            self.distribution[claimer] -= _to_decimal(amount_raw, self.decimals)
+        self.count -= 1
+
+    def add_baseline(self, baseline: ClaimsBaseline) -> None:
+        # Claim counts per address are not in a snapshot; use the recorded total
+        self.add_totals(baseline.claimed_raw.items(), baseline.claims_count)
+
+    def add_totals(self, claimed_raw: Iterable[tuple[str, int]], claims_count: int) -> None:
+        """Add ``claims_count`` claims given as one (lowercased) total per claimer.
+
+        Each total is normalized once, however many claims it sums.
+        """
+        claimers = 0
+        for claimer, amount_raw in claimed_raw:
+            self.add_claim(claimer, amount_raw)
+            claimers += 1
+        self.count += claims_count - claimers
+
+    def extend(self, events: Iterable[Mapping[str, Any]]) -> None:
+        for e in events:
+            self.add(e)
+
+    def result(self) -> ClaimsAggregate:
+        return ClaimsAggregate(
+            total_claimed_raw=self.total_raw,
+            total_claimed_adj=_to_decimal(self.total_raw, self.decimals),
+            unique_claimers=len(self.distribution),
+            claims_count=self.count,
+            distribution_by_address=self.distribution,
+        )
+
+
+def aggregate_claims(events: Iterable[Mapping[str, Any]], *, decimals: int) -> ClaimsAggregate:
+    acc = ClaimsAccumulator(decimals=decimals)
+    acc.extend(events)
+    return acc.result()
 
 
-def build_cumulative_series(events: Iterable[dict[str, Any]], *, decimals: int) -> list[tuple[int, Decimal]]:
+def build_cumulative_series(events: Iterable[Mapping[str, Any]], *, decimals: int) -> list[tuple[int, Decimal]]:
     # sort by timestamp, then block/log for stability
-    items: list[dict[str, Any]] = sorted(
+    items: list[Mapping[str, Any]] = sorted(
         list(events), key=lambda e: (int(e.get("timestamp", 0)), int(e.get("block_number", 0)), int(e.get("log_index", 0)))
     )
     cumulative: Decimal = Decimal(0)
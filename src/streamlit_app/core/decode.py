@@ -1,14 +1,43 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
 from typing import Any, cast
 
-from eth_abi.abi import decode as abi_decode
-from eth_utils.abi import event_abi_to_log_topic
-from eth_utils.address import to_checksum_address
+CLAIM_EVENT_FIELDS: tuple[str, ...] = ("claimer", "amount_raw", "tx_hash", "block_number", "log_index", "timestamp")
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ClaimEvent(Mapping[str, Any]):
+    """Normalized claim record.
+
+    Slotted to avoid a per-event dict, but still a read-only mapping so code that
+    indexes events by field name (``e["tx_hash"]``, ``e.get(...)``) keeps working
+    and events compare equal to plain dicts with the same fields.
+    """
+
+    claimer: str
+    amount_raw: int
+    tx_hash: str
+    block_number: int
+    log_index: int
+    timestamp: int
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in CLAIM_EVENT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CLAIM_EVENT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(CLAIM_EVENT_FIELDS)
 
 
 def _topic0_hex(event_abi: dict[str, Any]) -> str:
+    from eth_utils.abi import event_abi_to_log_topic
+
     return event_abi_to_log_topic(cast(Any, event_abi)).hex()
 
 
@@ -25,14 +54,18 @@ def _parse_int(value: Any) -> int:
         return 0
 
 
-def decode_logs(events_abi: Iterable[dict[str, Any]], logs: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+def decode_logs(events_abi: Iterable[dict[str, Any]], logs: Iterable[dict[str, Any]]) -> list[ClaimEvent]:
     """Decode logs using provided event ABIs.
 
     Supports non-indexed parameters for the common Claim(address,uint256) shape.
 
-    Returns a list of normalized event dicts with keys:
+    Returns a list of normalized ``ClaimEvent`` records with fields:
       - claimer, amount_raw, tx_hash, block_number, log_index, timestamp
     """
+    # eth_abi/eth_utils cost ~0.3s to import, so load them on first decode, not at startup
+    from eth_abi.abi import decode as abi_decode
+    from eth_utils.address import to_checksum_address
+
     abi_by_topic: dict[str, dict[str, Any]] = {}
     for e in events_abi:
         try:
@@ -46,7 +79,7 @@ def decode_logs(events_abi: Iterable[dict[str, Any]], logs: Iterable[dict[str, A
         except Exception:
             continue
 
-    decoded: list[dict[str, Any]] = []
+    decoded: list[ClaimEvent] = []
     for log in logs:
         topics: list[str] = list(log.get("topics", []))
         if not topics:
@@ -125,14 +158,14 @@ def decode_logs(events_abi: Iterable[dict[str, Any]], logs: Iterable[dict[str, A
                 amount_raw = int(val) if isinstance(val, int) else 0
 
         decoded.append(
-            {
-                "claimer": claimer or "",
-                "amount_raw": amount_raw if amount_raw is not None else 0,
-                "tx_hash": str(log.get("transactionHash", "")),
-                "block_number": _parse_int(log.get("blockNumber", 0)),
-                "log_index": _parse_int(log.get("logIndex", 0)),
-                "timestamp": _parse_int(log.get("timeStamp", 0)),
-            }
+            ClaimEvent(
+                claimer=claimer or "",
+                amount_raw=amount_raw if amount_raw is not None else 0,
+                tx_hash=str(log.get("transactionHash", "")),
+                block_number=_parse_int(log.get("blockNumber", 0)),
+                log_index=_parse_int(log.get("logIndex", 0)),
+                timestamp=_parse_int(log.get("timeStamp", 0)),
+            )
         )
 
     return decoded
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+from .claims_aggregate import ClaimsBaseline
+from .event_store import EventStore, PackedEvent
+
+_SELECT_ROWS: str = "SELECT block_number, log_index, timestamp, claimer, amount, tx_hash FROM events"
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash BLOB NOT NULL,
+    timestamp INTEGER NOT NULL,
+    claimer BLOB NOT NULL,
+    amount BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_chain_order ON events (block_number, log_index);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# A log is identified by (tx_hash, log_index), as in the store. Logs written
+# before this key was unique may hold a reorged log twice: the latest row wins.
+_LOG_KEY_INDEX: str = """
+DELETE FROM events WHERE seq NOT IN (SELECT MAX(seq) FROM events GROUP BY tx_hash, log_index);
+CREATE UNIQUE INDEX events_log_key ON events (tx_hash, log_index);
+"""
+
+# A log that reappears at another block is moved there and gets a new seq, so
+# followers reading rows_since() pick the move up; an exact repeat is a no-op.
+_UPSERT: str = """
+INSERT INTO events (block_number, log_index, timestamp, claimer, amount, tx_hash) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (tx_hash, log_index) DO UPDATE SET
+    seq = (SELECT MAX(seq) FROM events) + 1,
+    block_number = excluded.block_number,
+    timestamp = excluded.timestamp,
+    claimer = excluded.claimer,
+    amount = excluded.amount
+WHERE block_number != excluded.block_number
+"""
+
+
+def event_log_path(data_dir: str | Path, *, chain: str, contract: str, topic0: str) -> Path:
+    """Return the log file for a (chain, contract, topic0) key inside ``data_dir``."""
+    parts = (chain, contract.lower(), topic0.lower().removeprefix("0x"))
+    name = "_".join(re.sub(r"[^0-9a-zA-Z]+", "-", p) for p in parts)
+    return Path(data_dir) / f"{name}.sqlite"
+
+
+class LogHead(NamedTuple):
+    """Change markers of a log.
+
+    ``generation`` changes when the log is replaced or cleared; ``last_seq`` grows
+    with every appended row.
+    """
+
+    generation: int
+    last_seq: int
+    cursor: int | None
+
+
+class SqliteEventLog:
+    """Durable, append-only event log for one (chain, contract, topic0) key.
+
+    Rows use the ``EventStore`` storage layout, so warm start is one ordered
+    bulk read straight into a store. The scan cursor (last block synced) is
+    stored alongside so sync can resume incrementally, as is the store's
+    baseline when it was seeded from a snapshot. A connection is opened
+    per operation, which keeps the log safe to use from a worker thread.
+
+    Several processes can share one log: a headless sync writes while viewers
+    follow it with :meth:`head` and :meth:`rows_since`.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path: Path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            # WAL lets viewers read while a sync process writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'events_log_key'").fetchone() is None:
+                conn.executescript(_LOG_KEY_INDEX)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def append(self, rows: Iterable[PackedEvent], *, cursor: int) -> None:
+        """Append rows and advance the cursor, atomically.
+
+        Rows are keyed by ``(tx_hash, log_index)``: duplicates are ignored and a
+        log seen before at another block (a reorg) is moved to the new block.
+        """
+        with self._connect() as conn:
+            self._insert(conn, rows)
+            self._set_cursor(conn, cursor)
+
+    def replace(self, rows: Iterable[PackedEvent], *, cursor: int, baseline: ClaimsBaseline | None = None) -> None:
+        """Replace the whole log, e.g. after a full resync or a snapshot import."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM events")
+            conn.execute("DELETE FROM meta WHERE key IN ('baseline', 'backfill')")
+            self._bump_generation(conn)
+            self._insert(conn, rows)
+            self._set_cursor(conn, cursor)
+            if baseline is not None:
+                value = json.dumps(
+                    {
+                        "last_block": baseline.last_block,
+                        "claims_count": baseline.claims_count,
+                        "claimed_raw": {addr: str(raw) for addr, raw in baseline.claimed_raw.items()},
+                    }
+                )
+                conn.execute("INSERT INTO meta (key, value) VALUES ('baseline', ?)", (value,))
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM events")
+            conn.execute("DELETE FROM meta WHERE key != 'generation'")
+            self._bump_generation(conn)
+
+    def head(self) -> LogHead:
+        with self._connect() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('generation', 'cursor')").fetchall())
+            (last_seq,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()
+        cursor = meta.get("cursor")
+        return LogHead(
+            generation=int(meta.get("generation", 0)),
+            last_seq=int(last_seq),
+            cursor=int(cursor) if cursor is not None else None,
+        )
+
+    def rows_since(self, seq: int) -> list[PackedEvent]:
+        """Return rows appended after ``seq`` (see :meth:`head`), in append order."""
+        with self._connect() as conn:
+            rows = conn.execute(f"{_SELECT_ROWS} WHERE seq > ? ORDER BY seq", (seq,)).fetchall()
+        return [PackedEvent(*r) for r in rows]
+
+    def cursor(self) -> int | None:
+        """Return the last block synced into the log, or ``None`` if never synced."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'cursor'").fetchone()
+        return int(row[0]) if row else None
+
+    def set_backfill(self, pending: tuple[int, int] | None) -> None:
+        """Record the block range still to backfill (``None`` once complete)."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM meta WHERE key = 'backfill'")
+            if pending is not None:
+                conn.execute("INSERT INTO meta (key, value) VALUES ('backfill', ?)", (json.dumps(list(pending)),))
+
+    def backfill(self) -> tuple[int, int] | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'backfill'").fetchone()
+        if row is None:
+            return None
+        lo, hi = json.loads(row[0])
+        return int(lo), int(hi)
+
+    def baseline(self) -> ClaimsBaseline | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'baseline'").fetchone()
+        if row is None:
+            return None
+        parsed = json.loads(row[0])
+        return ClaimsBaseline(
+            last_block=int(parsed["last_block"]),
+            claimed_raw={addr: int(raw) for addr, raw in parsed["claimed_raw"].items()},
+            claims_count=int(parsed["claims_count"]),
+        )
+
+    def load(self, *, decimals: int) -> EventStore:
+        """Read every stored event in chain order into a new store."""
+        baseline = self.baseline()
+        with self._connect() as conn:
+            # Streamed from the cursor into the store's columns, never materialized as a list
+            rows = conn.execute(f"{_SELECT_ROWS} ORDER BY block_number, log_index, seq")
+            return EventStore.from_packed(rows, decimals=decimals, baseline=baseline)
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, rows: Iterable[PackedEvent]) -> None:
+        conn.executemany(_UPSERT, rows)
+
+    @staticmethod
+    def _bump_generation(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('generation', '1')"
+            " ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    @staticmethod
+    def _set_cursor(conn: sqlite3.Connection, cursor: int) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('cursor', ?)", (str(cursor),))
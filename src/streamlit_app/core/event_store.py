@@ -0,0 +1,772 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, NamedTuple, overload
+
+import numpy as np
+import numpy.typing as npt
+
+from .claims_aggregate import ClaimsAccumulator, ClaimsAggregate, ClaimsBaseline
+from .decode import ClaimEvent
+
+ADDRESS_BYTES: int = 20
+HASH_BYTES: int = 32
+AMOUNT_BYTES: int = 32
+
+# Claimer index entries pack ``(block_number, log_index)`` into one int64
+_LOG_INDEX_BITS: int = 32
+_LOG_INDEX_MASK: int = (1 << _LOG_INDEX_BITS) - 1
+# Dedup keys fold a log's ``(tx_hash, log_index)`` into 64 bits: the tx hash's
+# low 8 bytes mixed with the log index. A key only flags a possible duplicate;
+# the row itself is compared before anything is dropped.
+_LOG_KEY_MIX: int = 0x9E3779B97F4A7C15
+_U64_MASK: int = (1 << 64) - 1
+# A lowercased claimer prefix without its ``0x``
+_HEX_PREFIX: re.Pattern[str] = re.compile(r"[0-9a-f]*")
+# New claimers up to this many are inserted one by one into the sorted prefix list; more are merged
+_INSORT_MAX: int = 64
+
+# Versions are unique across all stores in the process, so a version alone is a
+# safe cache key even when a store is replaced by a fresh one.
+_versions: itertools.count[int] = itertools.count(1)
+
+
+def _pack_hex(value: Any, width: int) -> bytes:
+    """Pack a hex string into a fixed-width big-endian value (0 if unparsable)."""
+    s: str = str(value).strip()
+    if s[:2] in ("0x", "0X"):
+        s = s[2:]
+    try:
+        n = int(s, 16) if s else 0
+    except ValueError:
+        n = 0
+    return n.to_bytes(width, "big")
+
+
+def _parse_address(address: str) -> bytes | None:
+    try:
+        raw = bytes.fromhex(address.strip().lower().removeprefix("0x"))
+    except ValueError:
+        return None
+    return raw if len(raw) == ADDRESS_BYTES else None
+
+
+def _log_key(tx_hash: bytes, log_index: int) -> int:
+    return (int.from_bytes(tx_hash[-8:], "big") ^ (log_index * _LOG_KEY_MIX)) & _U64_MASK
+
+
+class PackedEvent(NamedTuple):
+    """One event in the store's storage layout (also used by the durable event log)."""
+
+    block_number: int
+    log_index: int
+    timestamp: int
+    claimer: bytes
+    amount: bytes
+    tx_hash: bytes
+
+
+def pack_event(event: Mapping[str, Any]) -> PackedEvent:
+    return PackedEvent(
+        block_number=int(event.get("block_number", 0)),
+        log_index=int(event.get("log_index", 0)),
+        timestamp=int(event.get("timestamp", 0)),
+        claimer=_pack_hex(event.get("claimer", ""), ADDRESS_BYTES),
+        amount=int(event.get("amount_raw", 0)).to_bytes(AMOUNT_BYTES, "big"),
+        tx_hash=_pack_hex(event.get("tx_hash", ""), HASH_BYTES),
+    )
+
+
+class PackedColumns(NamedTuple):
+    """A point-in-time copy of the store's packed column buffers."""
+
+    claimers: bytes
+    amounts: bytes
+    tx_hashes: bytes
+    blocks: array[int]
+    log_indexes: array[int]
+    timestamps: array[int]
+
+
+def hex_column(buf: bytes | bytearray, width: int) -> list[str]:
+    """Split a packed buffer of ``width``-byte values into ``0x`` hex strings."""
+    text = buf.hex()
+    step = width * 2
+    return ["0x" + text[i : i + step] for i in range(0, len(text), step)]
+
+
+def _sum_uint256_by_group(amounts: bytes | bytearray, groups: npt.NDArray[np.intp], count: int) -> list[int]:
+    """Sum packed 32-byte big-endian amounts per group (``groups[i]`` in ``[0, count)``).
+
+    Amounts are split into 16-bit limbs summed with ``bincount``; float64 sums
+    of 16-bit values are exact for up to 2**37 rows. Carries are then
+    propagated per group, so Python ints are only built once per group.
+    """
+    limbs = np.frombuffer(amounts, dtype=">u2").reshape(-1, AMOUNT_BYTES // 2)
+    sums = np.empty((count, limbs.shape[1]), dtype=np.uint64)
+    for j in range(limbs.shape[1]):
+        sums[:, j] = np.bincount(groups, weights=limbs[:, j], minlength=count)
+    carry = np.zeros(count, dtype=np.uint64)
+    for j in range(limbs.shape[1] - 1, -1, -1):
+        sums[:, j] += carry
+        carry = sums[:, j] >> np.uint64(16)
+        sums[:, j] &= np.uint64(0xFFFF)
+    packed = sums.astype(">u2").tobytes()
+    # Totals past 2**256 keep the carry out of the top limb
+    return [
+        int.from_bytes(packed[i * AMOUNT_BYTES : (i + 1) * AMOUNT_BYTES], "big") + (high << 256)
+        for i, high in enumerate(carry.tolist())
+    ]
+
+
+def _decode_columns(
+    claimers: bytes | bytearray,
+    amounts: bytes | bytearray,
+    tx_hashes: bytes | bytearray,
+    blocks: array[int],
+    log_indexes: array[int],
+    timestamps: array[int],
+    start: int,
+    stop: int,
+) -> dict[str, list[Any]]:
+    """Decode rows ``[start, stop)`` of packed columns into plain column lists."""
+    amounts_chunk = bytes(amounts[start * AMOUNT_BYTES : stop * AMOUNT_BYTES])
+    return {
+        "claimer": hex_column(claimers[start * ADDRESS_BYTES : stop * ADDRESS_BYTES], ADDRESS_BYTES),
+        "amount_raw": [
+            int.from_bytes(amounts_chunk[i : i + AMOUNT_BYTES], "big") for i in range(0, len(amounts_chunk), AMOUNT_BYTES)
+        ],
+        "tx_hash": hex_column(tx_hashes[start * HASH_BYTES : stop * HASH_BYTES], HASH_BYTES),
+        "block_number": blocks[start:stop].tolist(),
+        "log_index": log_indexes[start:stop].tolist(),
+        "timestamp": timestamps[start:stop].tolist(),
+    }
+
+
+class EventStore(Sequence[ClaimEvent]):
+    """Deduplicated claim events kept in chain order as packed columns.
+
+    Each event's columns take 108 bytes: block number, log index and timestamp
+    in ``array('q')`` columns, and claimer (20 bytes), amount (uint256, 32 bytes)
+    and tx hash (32 bytes) packed into ``bytearray`` columns. With the claim
+    journal (20 bytes) and claimer index (8 bytes) an event costs about 136
+    bytes, and the dedup index about 60 more; add about 450 bytes per distinct
+    claimer for its running total and index entry. Rows are materialized as
+    ``ClaimEvent`` only when read; claimers and tx hashes come back as
+    lowercase ``0x`` hex.
+
+    Rows are kept sorted by ``(block_number, log_index)``. A log is identified
+    by ``(tx_hash, log_index)``, as in ``deduplicate_events``: a standing index
+    of 64-bit keys of every stored log flags a possible duplicate, which is
+    confirmed by bisecting to the row's block. A known log that arrives at
+    another block (a reorg re-included its transaction) replaces the old row
+    instead of being counted twice. Merging a batch therefore costs
+    O(batch * log N) and does not rescan history; a batch of new logs that no
+    stored row falls within (an append, or a page of a newest-first backfill)
+    is spliced in as one slice rather than shifting the columns per row.
+    Running aggregates are maintained on insert.
+
+    A store can be seeded with a ``ClaimsBaseline`` (e.g. from an imported
+    snapshot): its totals are included in the aggregates, ``last_block`` starts
+    at the baseline's block, and events at or below it are ignored on merge.
+
+    A claimer index maps each address to the ``(block_number, log_index)``
+    keys of its events, kept sorted (8 bytes per event), plus a sorted list of
+    claimers for prefix search. Keys rather than positions are stored so that
+    inserts before existing rows do not invalidate them; a key is resolved to
+    its row by bisection, so :meth:`get_claimer_history` costs O(k log N) for
+    k events. Claimers first seen since the last prefix search are merged into
+    the sorted list (linearly, never re-sorted) on the next :meth:`find_claimers`.
+
+    ``version`` changes on every mutation. ``epoch`` changes only when events may
+    have been removed or totals recomputed (clear, seed, a reorged log); within
+    an epoch events are only added, so ``cache_key`` identifies the content and
+    :meth:`changed_claimers` gives the delta between two points, from a journal
+    of the packed claimers added this epoch.
+
+    Mutations take ``lock``; readers running alongside a background writer
+    should hold it too while reading several columns or the aggregate
+    distribution.
+    """
+
+    def __init__(self, events: Iterable[Mapping[str, Any]] | None = None, *, decimals: int = 18) -> None:
+        self._blocks: array[int] = array("q")
+        self._log_indexes: array[int] = array("q")
+        self._timestamps: array[int] = array("q")
+        self._claimers: bytearray = bytearray()
+        self._amounts: bytearray = bytearray()
+        self._tx_hashes: bytearray = bytearray()
+        self._acc: ClaimsAccumulator = ClaimsAccumulator(decimals=decimals)
+        # Claimer of every event added this epoch, in the order added (20 bytes each)
+        self._journal: bytearray = bytearray()
+        # Aggregates for other decimals: (version, changed_claimers mark, aggregate)
+        self._rescaled: dict[int, tuple[int, tuple[int, int], ClaimsAggregate]] = {}
+        self._log_keys: set[int] = set()
+        self._claimer_keys: dict[bytes, array[int]] = {}
+        self._sorted_claimers: list[bytes] = []
+        self._new_claimers: list[bytes] = []
+        self.baseline: ClaimsBaseline | None = None
+        self.version: int = next(_versions)
+        self.epoch: int = self.version
+        self.lock: threading.RLock = threading.RLock()
+        if events is not None:
+            self.merge(events)
+
+    @classmethod
+    def from_packed(
+        cls,
+        rows: Iterable[tuple[int, int, int, bytes, bytes, bytes]],
+        *,
+        decimals: int = 18,
+        baseline: ClaimsBaseline | None = None,
+        chunk_rows: int = 65_536,
+    ) -> EventStore:
+        """Build a store in one pass from rows already in chain order without duplicates.
+
+        ``rows`` are ``PackedEvent``s or plain tuples in the same field order,
+        e.g. a database cursor. They are consumed ``chunk_rows`` at a time
+        straight into the packed columns, so only one chunk is held as Python
+        objects; totals are summed per claimer in vectorized passes and
+        normalized once per claimer.
+        Rows must all be above ``baseline.last_block`` when a baseline is given.
+        """
+        store = cls(decimals=decimals)
+        if baseline is not None:
+            store.seed(baseline)
+        count = 0
+        stream = iter(rows)
+        while chunk := list(itertools.islice(stream, chunk_rows)):
+            blocks, log_indexes, timestamps, claimers, amounts, tx_hashes = zip(*chunk, strict=True)
+            store._blocks.extend(blocks)
+            store._log_indexes.extend(log_indexes)
+            store._timestamps.extend(timestamps)
+            store._claimers += b"".join(claimers)
+            store._amounts += b"".join(amounts)
+            store._tx_hashes += b"".join(tx_hashes)
+            count += len(chunk)
+        if not count:
+            return store
+        store._journal = bytearray(store._claimers)
+        store._index_bulk()
+        store.version = next(_versions)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __iter__(self) -> Iterator[ClaimEvent]:
+        for i in range(len(self._blocks)):
+            yield self._row(i)
+
+    @overload
+    def __getitem__(self, index: int) -> ClaimEvent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ClaimEvent]: ...
+
+    def __getitem__(self, index: int | slice) -> ClaimEvent | list[ClaimEvent]:
+        if isinstance(index, slice):
+            with self.lock:
+                return [self._row(i) for i in range(*index.indices(len(self._blocks)))]
+        if index < 0:
+            index += len(self._blocks)
+        if not 0 <= index < len(self._blocks):
+            raise IndexError("event index out of range")
+        return self._row(index)
+
+    def _row(self, i: int) -> ClaimEvent:
+        return ClaimEvent(
+            claimer="0x" + self._claimers[i * ADDRESS_BYTES : (i + 1) * ADDRESS_BYTES].hex(),
+            amount_raw=int.from_bytes(self._amounts[i * AMOUNT_BYTES : (i + 1) * AMOUNT_BYTES], "big"),
+            tx_hash="0x" + self._tx_hashes[i * HASH_BYTES : (i + 1) * HASH_BYTES].hex(),
+            block_number=self._blocks[i],
+            log_index=self._log_indexes[i],
+            timestamp=self._timestamps[i],
+        )
+
+    def _order_at(self, i: int) -> tuple[int, int]:
+        return (self._blocks[i], self._log_indexes[i])
+
+    @property
+    def last_block(self) -> int:
+        if self._blocks:
+            return self._blocks[-1]
+        return self.baseline.last_block if self.baseline is not None else 0
+
+    @property
+    def cache_key(self) -> tuple[int, int, int]:
+        """``(epoch, event count, last block)``: equal keys mean equal content."""
+        with self.lock:
+            return (self.epoch, len(self._blocks), self.last_block)
+
+    def changed_claimers(self, mark: tuple[int, int] | None) -> tuple[tuple[int, int], list[str] | None]:
+        """Return a new mark and the claimers whose totals changed since ``mark``.
+
+        Claimers are listed once each, in the order they changed. The list is
+        ``None`` when the delta is unknown (no mark, or a new epoch), in which
+        case every total should be treated as changed.
+        """
+        with self.lock:
+            new_mark = (self.epoch, len(self._journal) // ADDRESS_BYTES)
+            if mark is None or mark[0] != self.epoch:
+                return new_mark, None
+            # Only the delta is decoded
+            return new_mark, list(dict.fromkeys(hex_column(self._journal[mark[1] * ADDRESS_BYTES :], ADDRESS_BYTES)))
+
+    def seed(self, baseline: ClaimsBaseline) -> None:
+        """Carry over totals up to ``baseline.last_block`` and drop events already covered."""
+        with self.lock:
+            keep = [row for row in self.packed_rows() if row.block_number > baseline.last_block]
+            self._clear()
+            self.baseline = baseline
+            self._acc.add_baseline(baseline)
+            for row in keep:
+                self._merge_one(row)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the column buffers in bytes."""
+        return (
+            self._blocks.itemsize * len(self._blocks) * 3
+            + len(self._claimers)
+            + len(self._amounts)
+            + len(self._tx_hashes)
+        )
+
+    def merge(self, events: Iterable[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+        """Insert events not seen before and return them in the order added."""
+        with self.lock:
+            return self._merge(events)
+
+    def _merge(self, events: Iterable[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+        events_list = list(events)
+        kept = self._merge_rows([pack_event(e) for e in events_list])
+        added: list[Mapping[str, Any]] = [events_list[i] for i in kept]
+        if added:
+            self.version = next(_versions)
+        return added
+
+    def merge_packed(self, rows: Iterable[PackedEvent]) -> int:
+        """Insert packed rows not seen before and return how many were added.
+
+        Rows that no stored row falls between (e.g. a bulk load) are spliced in as one slice.
+        """
+        with self.lock:
+            added = len(self._merge_rows(list(rows)))
+            if added:
+                self.version = next(_versions)
+            return added
+
+    def _merge_rows(self, rows: list[PackedEvent]) -> list[int]:
+        """Merge rows and return the indexes of those added."""
+        if len(rows) > 1:
+            kept = self._splice(rows)
+            if kept is not None:
+                return kept
+        return [i for i, row in enumerate(rows) if self._merge_one(row)]
+
+    def _splice(self, rows: list[PackedEvent]) -> list[int] | None:
+        """Insert a batch as one slice when no stored row falls within its key range.
+
+        This covers appends and every page of a newest-first backfill chunk (each
+        page lands between the previous page and the newer history), so a page
+        costs one bisection and one memmove per column instead of a shift per
+        row. Returns ``None`` when the batch overlaps stored rows.
+        """
+        order = sorted(range(len(rows)), key=lambda i: (rows[i].block_number, rows[i].log_index))
+        first, last = rows[order[0]], rows[order[-1]]
+        n = len(self._blocks)
+        pos = bisect_left(range(n), (first.block_number, first.log_index), key=self._order_at)
+        if pos < n and self._order_at(pos) <= (last.block_number, last.log_index):
+            return None
+        kept: list[int] = []
+        logs: dict[int, PackedEvent] = {}
+        for i in order:
+            row = rows[i]
+            if self.baseline is not None and row.block_number <= self.baseline.last_block:
+                continue
+            key = _log_key(row.tx_hash, row.log_index)
+            if key in self._log_keys:
+                # A stored log may reappear (or have moved): dedup row by row
+                return None
+            seen = logs.get(key)
+            if seen is not None:
+                if (seen.tx_hash, seen.log_index, seen.block_number) == (row.tx_hash, row.log_index, row.block_number):
+                    continue
+                return None
+            logs[key] = row
+            kept.append(i)
+        batch = [rows[i] for i in kept]
+        self._blocks[pos:pos] = array("q", (r.block_number for r in batch))
+        self._log_indexes[pos:pos] = array("q", (r.log_index for r in batch))
+        self._timestamps[pos:pos] = array("q", (r.timestamp for r in batch))
+        self._claimers[pos * ADDRESS_BYTES : pos * ADDRESS_BYTES] = b"".join(r.claimer for r in batch)
+        self._amounts[pos * AMOUNT_BYTES : pos * AMOUNT_BYTES] = b"".join(r.amount for r in batch)
+        self._tx_hashes[pos * HASH_BYTES : pos * HASH_BYTES] = b"".join(r.tx_hash for r in batch)
+        self._journal += b"".join(r.claimer for r in batch)
+        self._log_keys.update(logs)
+        by_claimer: dict[bytes, list[int]] = {}
+        for r in batch:
+            self._acc.add_claim("0x" + r.claimer.hex(), int.from_bytes(r.amount, "big"))
+            by_claimer.setdefault(r.claimer, []).append((r.block_number << _LOG_INDEX_BITS) | (r.log_index & _LOG_INDEX_MASK))
+        for claimer, new_keys in by_claimer.items():
+            self._index_keys(claimer, new_keys)
+        return kept
+
+    def _merge_one(self, row: PackedEvent) -> bool:
+        if self.baseline is not None and row.block_number <= self.baseline.last_block:
+            return False
+        order = (row.block_number, row.log_index)
+        key = _log_key(row.tx_hash, row.log_index)
+        if key in self._log_keys:
+            lo = bisect_left(range(len(self._blocks)), order, key=self._order_at)
+            hi = bisect_right(range(len(self._blocks)), order, lo=lo, key=self._order_at)
+            if any(self._tx_hashes[i * HASH_BYTES : (i + 1) * HASH_BYTES] == row.tx_hash for i in range(lo, hi)):
+                return False
+            moved = self._find_log(row.tx_hash, row.log_index)
+            if moved is not None:
+                # Reorged into another block: the old row is replaced, not counted twice
+                self._remove(moved)
+        n = len(self._blocks)
+        if n == 0 or order >= self._order_at(n - 1):
+            pos = n
+        else:
+            pos = bisect_right(range(n), order, key=self._order_at)
+        self._insert(pos, row)
+        self._log_keys.add(key)
+        self._journal += row.claimer
+        self._acc.add_claim("0x" + row.claimer.hex(), int.from_bytes(row.amount, "big"))
+        self._index_claim(row.claimer, row.block_number, row.log_index)
+        return True
+
+    def _find_log(self, tx_hash: bytes, log_index: int) -> int | None:
+        """Return the row of log ``(tx_hash, log_index)`` at whatever block it is stored, if any.
+
+        A vectorized scan of the columns; only reached for a log whose block changed.
+        """
+        candidates = np.flatnonzero(np.frombuffer(self._log_indexes, dtype=np.int64) == log_index)
+        hashes = np.frombuffer(self._tx_hashes, dtype=np.uint8).reshape(-1, HASH_BYTES)[candidates]
+        hits = candidates[(hashes == np.frombuffer(tx_hash, dtype=np.uint8)).all(axis=1)]
+        return int(hits[0]) if len(hits) else None
+
+    def _remove(self, pos: int) -> None:
+        """Delete row ``pos`` and take it out of the totals and indexes; starts a new epoch."""
+        block_number, log_index = self._order_at(pos)
+        claimer = bytes(self._claimers[pos * ADDRESS_BYTES : (pos + 1) * ADDRESS_BYTES])
+        amount = int.from_bytes(self._amounts[pos * AMOUNT_BYTES : (pos + 1) * AMOUNT_BYTES], "big")
+        self._log_keys.discard(_log_key(bytes(self._tx_hashes[pos * HASH_BYTES : (pos + 1) * HASH_BYTES]), log_index))
+        del self._blocks[pos]
+        del self._log_indexes[pos]
+        del self._timestamps[pos]
+        del self._claimers[pos * ADDRESS_BYTES : (pos + 1) * ADDRESS_BYTES]
+        del self._amounts[pos * AMOUNT_BYTES : (pos + 1) * AMOUNT_BYTES]
+        del self._tx_hashes[pos * HASH_BYTES : (pos + 1) * HASH_BYTES]
+        keys = self._claimer_keys[claimer]
+        del keys[bisect_left(keys, (block_number << _LOG_INDEX_BITS) | (log_index & _LOG_INDEX_MASK))]
+        if not keys:
+            del self._claimer_keys[claimer]
+            i = bisect_left(self._sorted_claimers, claimer)
+            if i < len(self._sorted_claimers) and self._sorted_claimers[i] == claimer:
+                del self._sorted_claimers[i]
+            else:
+                self._new_claimers.remove(claimer)
+        address = "0x" + claimer.hex()
+        in_baseline = self.baseline is not None and address in self.baseline.claimed_raw
+        self._acc.remove_claim(address, amount, drop=not keys and not in_baseline)
+        # Deltas since an earlier mark no longer hold
+        self._journal = bytearray()
+        self.version = next(_versions)
+        self.epoch = self.version
+
+    def _index_bulk(self) -> None:
+        """Build the claimer index, dedup keys and totals of a freshly loaded store in vectorized passes."""
+        n = len(self._blocks)
+        claimers = np.frombuffer(self._claimers, dtype=f"S{ADDRESS_BYTES}")
+        # A stable sort keeps each claimer's keys in chain order
+        order = np.argsort(claimers, kind="stable")
+        sorted_claimers = claimers[order]
+        firsts = np.r_[True, sorted_claimers[1:] != sorted_claimers[:-1]]
+        raw = sorted_claimers.tobytes()
+        keys = (np.frombuffer(self._blocks, dtype=np.int64) << _LOG_INDEX_BITS) | (
+            np.frombuffer(self._log_indexes, dtype=np.int64) & _LOG_INDEX_MASK
+        )
+        sorted_keys = keys[order].tobytes()
+        del claimers, sorted_claimers, keys
+        starts = np.flatnonzero(firsts).tolist()
+        claimer_keys = self._claimer_keys
+        for start, stop in itertools.pairwise([*starts, n]):
+            keys_array = array("q")
+            keys_array.frombytes(sorted_keys[start * 8 : stop * 8])
+            claimer_keys[raw[start * ADDRESS_BYTES : (start + 1) * ADDRESS_BYTES]] = keys_array
+        self._sorted_claimers = list(claimer_keys)
+        del sorted_keys
+
+        # Row -> claimer group, for summing each claimer's amounts without Python ints per row
+        groups = np.empty(n, dtype=np.intp)
+        groups[order] = np.cumsum(firsts) - 1
+        del order, firsts
+        totals = _sum_uint256_by_group(self._amounts, groups, len(starts))
+        self._acc.add_totals(
+            (("0x" + raw[start * ADDRESS_BYTES : (start + 1) * ADDRESS_BYTES].hex(), total) for start, total in zip(starts, totals, strict=True)),
+            n,
+        )
+        del groups, totals
+
+        tails = np.frombuffer(self._tx_hashes, dtype=">u8").reshape(-1, HASH_BYTES // 8)[:, -1]
+        mixed = np.frombuffer(self._log_indexes, dtype=np.int64).astype(np.uint64) * np.uint64(_LOG_KEY_MIX)
+        log_keys = self._log_keys
+        # In chunks, so the keys never exist as one list of Python ints
+        for part in np.array_split(tails ^ mixed, max(1, n // 65_536)):
+            log_keys.update(part.tolist())
+
+    def _index_claim(self, claimer: bytes, block_number: int, log_index: int) -> None:
+        self._index_keys(claimer, [(block_number << _LOG_INDEX_BITS) | (log_index & _LOG_INDEX_MASK)])
+
+    def _index_keys(self, claimer: bytes, new_keys: list[int]) -> None:
+        """Add sorted index keys of one claimer, as one slice when they fit between existing keys."""
+        keys = self._claimer_keys.get(claimer)
+        if keys is None:
+            keys = self._claimer_keys[claimer] = array("q")
+            self._new_claimers.append(claimer)
+        pos = bisect_right(keys, new_keys[0])
+        if pos == len(keys) or keys[pos] > new_keys[-1]:
+            keys[pos:pos] = array("q", new_keys)
+            return
+        for key in new_keys:
+            keys.insert(bisect_right(keys, key), key)
+
+    def _insert(self, pos: int, row: PackedEvent) -> None:
+        if pos == len(self._blocks):
+            self._blocks.append(row.block_number)
+            self._log_indexes.append(row.log_index)
+            self._timestamps.append(row.timestamp)
+            self._claimers += row.claimer
+            self._amounts += row.amount
+            self._tx_hashes += row.tx_hash
+            return
+        self._blocks.insert(pos, row.block_number)
+        self._log_indexes.insert(pos, row.log_index)
+        self._timestamps.insert(pos, row.timestamp)
+        self._claimers[pos * ADDRESS_BYTES : pos * ADDRESS_BYTES] = row.claimer
+        self._amounts[pos * AMOUNT_BYTES : pos * AMOUNT_BYTES] = row.amount
+        self._tx_hashes[pos * HASH_BYTES : pos * HASH_BYTES] = row.tx_hash
+
+    def packed_rows(self) -> list[PackedEvent]:
+        """Return all events in storage layout, in chain order."""
+        with self.lock:
+            return [
+                PackedEvent(
+                    block_number=self._blocks[i],
+                    log_index=self._log_indexes[i],
+                    timestamp=self._timestamps[i],
+                    claimer=bytes(self._claimers[i * ADDRESS_BYTES : (i + 1) * ADDRESS_BYTES]),
+                    amount=bytes(self._amounts[i * AMOUNT_BYTES : (i + 1) * AMOUNT_BYTES]),
+                    tx_hash=bytes(self._tx_hashes[i * HASH_BYTES : (i + 1) * HASH_BYTES]),
+                )
+                for i in range(len(self._blocks))
+            ]
+
+    def events_from_block(self, block: int) -> list[ClaimEvent]:
+        """Return stored events with ``block_number >= block``."""
+        return self[bisect_left(self._blocks, block) :]
+
+    def to_columns(self) -> dict[str, list[Any]]:
+        """Return all events as plain column lists, e.g. for ``pd.DataFrame``."""
+        columns = self.packed_columns()
+        return _decode_columns(*columns, 0, len(columns.blocks))
+
+    def iter_columns(self, chunk_rows: int = 50_000) -> Iterator[dict[str, list[Any]]]:
+        """Yield events in chain order as ``to_columns``-style chunks of ``chunk_rows``.
+
+        The packed buffers are copied once under the lock (about 108 bytes per
+        event), so writers are not blocked while chunks are decoded and consumed.
+        """
+        columns = self.packed_columns()
+        n = len(columns.blocks)
+        for start in range(0, n, max(1, chunk_rows)):
+            yield _decode_columns(*columns, start, min(start + chunk_rows, n))
+
+    def packed_columns(self, start: int = 0, stop: int | None = None) -> PackedColumns:
+        """Copy the packed buffers of rows ``[start, stop)`` under the lock.
+
+        A memcpy of about 108 bytes per event. ``amounts`` holds 32-byte
+        big-endian uint256 values, ``claimers`` 20-byte addresses and
+        ``tx_hashes`` 32-byte hashes, all in chain order.
+        """
+        with self.lock:
+            start, stop, _ = slice(start, stop).indices(len(self._blocks))
+            return PackedColumns(
+                bytes(memoryview(self._claimers)[start * ADDRESS_BYTES : stop * ADDRESS_BYTES]),
+                bytes(memoryview(self._amounts)[start * AMOUNT_BYTES : stop * AMOUNT_BYTES]),
+                bytes(memoryview(self._tx_hashes)[start * HASH_BYTES : stop * HASH_BYTES]),
+                self._blocks[start:stop],
+                self._log_indexes[start:stop],
+                self._timestamps[start:stop],
+            )
+
+    def columns_at(self, positions: Iterable[int]) -> dict[str, list[Any]]:
+        """Return rows at ``positions`` (in that order) as ``to_columns``-style lists.
+
+        Only the requested rows are copied and decoded, e.g. one page of a table.
+        """
+        with self.lock:
+            rows = [int(i) for i in positions]
+            claimers = b"".join(self._claimers[i * ADDRESS_BYTES : (i + 1) * ADDRESS_BYTES] for i in rows)
+            amounts = b"".join(self._amounts[i * AMOUNT_BYTES : (i + 1) * AMOUNT_BYTES] for i in rows)
+            tx_hashes = b"".join(self._tx_hashes[i * HASH_BYTES : (i + 1) * HASH_BYTES] for i in rows)
+            blocks = array("q", (self._blocks[i] for i in rows))
+            log_indexes = array("q", (self._log_indexes[i] for i in rows))
+            timestamps = array("q", (self._timestamps[i] for i in rows))
+        return _decode_columns(claimers, amounts, tx_hashes, blocks, log_indexes, timestamps, 0, len(rows))
+
+    def block_range(self, from_block: int | None = None, to_block: int | None = None) -> tuple[int, int]:
+        """Return the row range ``[start, stop)`` of events with ``from_block <= block <= to_block``."""
+        with self.lock:
+            start = 0 if from_block is None else bisect_left(self._blocks, from_block)
+            stop = len(self._blocks) if to_block is None else bisect_right(self._blocks, to_block)
+            return start, max(start, stop)
+
+    def claimer_positions(self, address: str) -> list[int]:
+        """Return the rows of ``address``'s events (any case, ``0x``-prefixed), in chain order."""
+        claimer = _parse_address(address)
+        if claimer is None:
+            return []
+        with self.lock:
+            keys = self._claimer_keys.get(claimer)
+            if not keys:
+                return []
+            n = len(self._blocks)
+            positions: list[int] = []
+            for key in keys:
+                order = (key >> _LOG_INDEX_BITS, key & _LOG_INDEX_MASK)
+                # Rows sharing a key (same log in different txs) follow each other
+                lo = positions[-1] + 1 if positions and self._order_at(positions[-1]) == order else 0
+                i = bisect_left(range(n), order, lo=lo, key=self._order_at)
+                while i < n and self._order_at(i) == order:
+                    if self._claimers[i * ADDRESS_BYTES : (i + 1) * ADDRESS_BYTES] == claimer:
+                        positions.append(i)
+                        break
+                    i += 1
+            return positions
+
+    def claimer_mask(self, prefix: str) -> npt.NDArray[np.bool_]:
+        """Flag the rows whose claimer starts with ``prefix`` (hex, any case, ``0x`` optional).
+
+        A full address is resolved through the claimer index; a shorter prefix
+        is a vectorized compare on the packed claimer column, read in place.
+        Text that is not hex matches nothing.
+        """
+        text = prefix.strip().lower().removeprefix("0x")
+        with self.lock:
+            mask = np.zeros(len(self._blocks), dtype=bool)
+            if len(text) >= 2 * ADDRESS_BYTES:
+                mask[self.claimer_positions(text)] = True
+                return mask
+            if not _HEX_PREFIX.fullmatch(text):
+                return mask
+            whole = bytes.fromhex(text[: len(text) // 2 * 2])
+            column = np.frombuffer(self._claimers, dtype=np.uint8).reshape(-1, ADDRESS_BYTES)
+            mask[:] = (column[:, : len(whole)] == np.frombuffer(whole, dtype=np.uint8)).all(axis=1)
+            if len(text) % 2:
+                # An odd-length prefix ends with the high nibble of the next byte
+                mask &= (column[:, len(whole)] >> 4) == int(text[-1], 16)
+            return mask
+
+    def get_claimer_history(self, address: str) -> list[ClaimEvent]:
+        """Return every stored claim of ``address``, in chain order."""
+        with self.lock:
+            return [self._row(i) for i in self.claimer_positions(address)]
+
+    def find_claimers(self, prefix: str, limit: int = 20) -> list[str]:
+        """Return up to ``limit`` claimers whose address starts with ``prefix`` (hex, ``0x`` optional), sorted."""
+        text = prefix.strip().lower().removeprefix("0x")
+        try:
+            start = bytes.fromhex(text + "0" * (len(text) % 2))
+        except ValueError:
+            return []
+        with self.lock:
+            if self._new_claimers:
+                new = sorted(self._new_claimers)
+                if len(new) <= _INSORT_MAX:
+                    # A live tick's few new claimers: one bisection and memmove each
+                    for claimer in new:
+                        insort(self._sorted_claimers, claimer)
+                else:
+                    self._sorted_claimers = list(heapq.merge(self._sorted_claimers, new))
+                self._new_claimers = []
+            claimers = self._sorted_claimers
+            matches: list[str] = []
+            for i in range(bisect_left(claimers, start), len(claimers)):
+                address = claimers[i].hex()
+                if not address.startswith(text) or len(matches) >= limit:
+                    break
+                matches.append("0x" + address)
+            return matches
+
+    def key_at(self, index: int) -> tuple[int, int]:
+        """Return the ``(block_number, log_index)`` of row ``index``."""
+        return self._blocks[index], self._log_indexes[index]
+
+    def aggregates(self, *, decimals: int) -> ClaimsAggregate:
+        """Return running aggregates with amounts normalized by ``decimals``.
+
+        The running totals use the store's own decimals. Other values (e.g. a
+        viewer with a different token setting) get an exact rescaled copy whose
+        distribution is kept per ``decimals`` and updated in place from
+        :meth:`changed_claimers`, so a new event rescales only its claimer; the
+        copy is rebuilt only in a new epoch. Neither rebuilds the running totals.
+        """
+        with self.lock:
+            agg = self._acc.result()
+            if decimals == self._acc.decimals:
+                return agg
+            cached = self._rescaled.get(decimals)
+            if cached is not None and cached[0] == self.version:
+                return cached[2]
+            shift = self._acc.decimals - decimals
+            mark, changed = self.changed_claimers(None if cached is None else cached[1])
+            source = agg.distribution_by_address
+            if cached is None or changed is None:
+                distribution = {addr: amount.scaleb(shift) for addr, amount in source.items()}
+            else:
+                distribution = cached[2].distribution_by_address
+                for addr in changed:
+                    distribution[addr] = source[addr].scaleb(shift)
+            rescaled = ClaimsAggregate(
+                total_claimed_raw=agg.total_claimed_raw,
+                total_claimed_adj=agg.total_claimed_adj.scaleb(shift),
+                unique_claimers=agg.unique_claimers,
+                claims_count=agg.claims_count,
+                distribution_by_address=distribution,
+            )
+            self._rescaled[decimals] = (self.version, mark, rescaled)
+            return rescaled
+
+    def clear(self) -> None:
+        """Drop all events and any baseline."""
+        with self.lock:
+            self._clear()
+            self.baseline = None
+
+    def _clear(self) -> None:
+        self._blocks = array("q")
+        self._log_indexes = array("q")
+        self._timestamps = array("q")
+        self._claimers = bytearray()
+        self._amounts = bytearray()
+        self._tx_hashes = bytearray()
+        self._acc = ClaimsAccumulator(decimals=self._acc.decimals)
+        self._journal = bytearray()
+        self._rescaled = {}
+        self._log_keys = set()
+        self._claimer_keys = {}
+        self._sorted_claimers = []
+        self._new_claimers = []
+        self.version = next(_versions)
+        self.epoch = self.version
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .event_store import ADDRESS_BYTES, AMOUNT_BYTES, EventStore
+
+# Columns a table can be sorted by; ``block_number`` is the store's own (chain) order
+SORT_COLUMNS: tuple[str, ...] = ("block_number", "amount_raw", "claimer")
+
+
+@dataclass(frozen=True)
+class EventQuery:
+    """Sort order and filters of an events table."""
+
+    sort: str = "block_number"
+    descending: bool = True
+    # A full address or a hex prefix of one, any case
+    claimer: str | None = None
+    from_block: int | None = None
+    to_block: int | None = None
+
+
+@dataclass(frozen=True)
+class EventPage:
+    """One page of a query: the decoded rows and their store positions, in display order."""
+
+    columns: dict[str, list[Any]]
+    positions: npt.NDArray[np.intp]
+    total: int  # rows matching the query across all pages
+
+
+class EventTable:
+    """Pages of an :class:`EventStore`, sorted and filtered without decoding other rows.
+
+    Chain order is the store's own order and block ranges bisect its sorted
+    block column, so an unfiltered page in block order costs O(page) whatever
+    the history size. Other orders are a stable argsort of the packed column,
+    computed once per store version and reused for every page; claimer and
+    ``mask`` filters are vectorized (a full address's rows come from the
+    store's claimer index, a prefix is matched on the packed column). Only the
+    rows of the requested page are decoded.
+    """
+
+    def __init__(self, store: EventStore) -> None:
+        self.store: EventStore = store
+        self._lock = threading.Lock()
+        self._orders: dict[str, tuple[int, npt.NDArray[np.intp]]] = {}
+
+    def _order(self, column: str) -> npt.NDArray[np.intp]:
+        with self._lock:
+            cached = self._orders.get(column)
+            if cached is not None and cached[0] == self.store.version:
+                return cached[1]
+            columns = self.store.packed_columns()
+            if column == "amount_raw":
+                # Big-endian fixed-width bytes sort in numeric order
+                keys = np.frombuffer(columns.amounts, dtype=f"S{AMOUNT_BYTES}")
+            elif column == "claimer":
+                keys = np.frombuffer(columns.claimers, dtype=f"S{ADDRESS_BYTES}")
+            else:
+                raise ValueError(f"Unsupported sort column: {column}")
+            order = np.argsort(keys, kind="stable")
+            self._orders[column] = (self.store.version, order)
+            return order
+
+    def query(
+        self, query: EventQuery, *, offset: int = 0, limit: int = 100, mask: npt.NDArray[np.bool_] | None = None
+    ) -> EventPage:
+        """Return rows ``[offset, offset + limit)`` of ``query``.
+
+        ``mask`` (one flag per store row, e.g. from verification results) keeps
+        only the flagged rows.
+        """
+        if query.sort not in SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {query.sort}")
+        offset, limit = max(0, offset), max(0, limit)
+        store = self.store
+        with store.lock:
+            n = len(store)
+            if mask is not None and len(mask) != n:
+                raise ValueError(f"mask has {len(mask)} rows, store has {n}")
+            start, stop = store.block_range(query.from_block, query.to_block)
+            if query.sort == "block_number" and query.claimer is None and mask is None:
+                total = stop - start
+                if query.descending:
+                    positions = np.arange(stop - 1 - offset, max(stop - 1 - offset - limit, start - 1), -1)
+                else:
+                    positions = np.arange(start + offset, min(start + offset + limit, stop))
+            else:
+                keep = np.zeros(n, dtype=bool)
+                keep[start:stop] = True
+                if query.claimer is not None:
+                    keep &= self._claimer_mask(query.claimer)
+                if mask is not None:
+                    keep &= mask
+                order = np.arange(n) if query.sort == "block_number" else self._order(query.sort)
+                if query.descending:
+                    order = order[::-1]
+                selected = order[keep[order]]
+                total = len(selected)
+                positions = selected[offset : offset + limit]
+            return EventPage(columns=store.columns_at(positions), positions=positions, total=total)
+
+    def _claimer_mask(self, claimer: str) -> npt.NDArray[np.bool_]:
+        # A full address comes from the store's claimer index, a prefix from its packed column
+        return self.store.claimer_mask(claimer)
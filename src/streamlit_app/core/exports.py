@@ -1,17 +1,59 @@
 from __future__ import annotations
 
 import csv
+import gzip
+import importlib.util
 import io
-from collections.abc import Iterable
-from typing import Any
+import json
+import threading
+import zlib
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import IO, Any, cast
 
-from .claims_aggregate import aggregate_claims
+from .claims_aggregate import ClaimsAggregate, ClaimsBaseline, aggregate_claims
+from .event_store import ADDRESS_BYTES, AMOUNT_BYTES, HASH_BYTES, EventStore, hex_column
 
+CSV_COLUMNS: list[str] = ["claimer", "amount_raw", "tx_hash", "block_number", "log_index", "timestamp"]
 
-def build_snapshot(*, chain: str, contract: str, events: Iterable[dict[str, Any]], decimals: int) -> dict[str, Any]:
-    events_list: list[dict[str, Any]] = list(events)
-    agg = aggregate_claims(events_list, decimals=decimals)
-    last_block: int = max((int(e.get("block_number", 0)) for e in events_list), default=0)
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file cannot be parsed."""
+
+
+class CompressionError(Exception):
+    """Raised when data cannot be (de)compressed: a corrupt archive or a codec that is not installed."""
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    chain: str
+    contract: str
+    baseline: ClaimsBaseline
+
+
+def build_snapshot(
+    *,
+    chain: str,
+    contract: str,
+    events: Iterable[Mapping[str, Any]],
+    decimals: int,
+    aggregates: ClaimsAggregate | None = None,
+    last_block: int | None = None,
+) -> dict[str, Any]:
+    """Build a JSON-serializable snapshot of claim totals.
+
+    Pass ``aggregates`` and ``last_block`` when they are already known (e.g. from
+    an ``EventStore``) to skip recomputing them from ``events``.
+    """
+    if aggregates is None or last_block is None:
+        events_list: list[Mapping[str, Any]] = list(events)
+        aggregates = aggregate_claims(events_list, decimals=decimals)
+        last_block = max((int(e.get("block_number", 0)) for e in events_list), default=0)
+    agg = aggregates
 
     # Distribution with string amounts to preserve exact decimal text
     claimed_by: dict[str, str] = {addr: str(amount.normalize()) for addr, amount in agg.distribution_by_address.items()}
@@ -20,25 +62,367 @@ def build_snapshot(*, chain: str, contract: str, events: Iterable[dict[str, Any]
         "chain": chain,
         "contract": contract,
         "last_block": last_block,
+        "decimals": decimals,
+        "claims_count": agg.claims_count,
         "claimed_by": claimed_by,
     }
 
 
-def events_to_csv(events: Iterable[dict[str, Any]]) -> str:
+def load_snapshot(data: bytes | str, *, decimals: int) -> Snapshot:
+    """Parse a snapshot produced by :func:`build_snapshot`.
+
+    Args:
+        data: Snapshot JSON as bytes or string; gzip/zstd-compressed bytes are accepted.
+        decimals: Token decimals to use when the snapshot does not record them.
+
+    Returns:
+        Chain, contract and the claim totals as a ``ClaimsBaseline`` in raw units.
+    """
+    try:
+        text: str = decompress(data).decode("utf-8") if isinstance(data, bytes) else data
+    except (CompressionError, UnicodeDecodeError) as exc:
+        raise SnapshotError(f"Cannot read snapshot: {exc}") from exc
+    try:
+        parsed = json.loads(text)
+        decimals = int(parsed.get("decimals", decimals))
+        claimed_raw: dict[str, int] = {}
+        for addr, amount in dict(parsed["claimed_by"]).items():
+            raw = Decimal(str(amount)).scaleb(decimals)
+            if raw != raw.to_integral_value():
+                raise SnapshotError(f"Amount for {addr} has more than {decimals} decimals")
+            claimed_raw[str(addr).lower()] = int(raw)
+        baseline = ClaimsBaseline(
+            last_block=int(parsed["last_block"]),
+            claimed_raw=claimed_raw,
+            claims_count=int(parsed.get("claims_count", len(claimed_raw))),
+        )
+        return Snapshot(chain=str(parsed.get("chain", "")), contract=str(parsed.get("contract", "")), baseline=baseline)
+    except SnapshotError:
+        raise
+    except (AttributeError, KeyError, TypeError, ValueError, InvalidOperation) as exc:
+        raise SnapshotError(f"Invalid snapshot: {exc}") from exc
+
+
+def iter_snapshot_json(snapshot: Mapping[str, Any], *, chunk_entries: int = 50_000) -> Iterator[str]:
+    """Yield the compact JSON of ``snapshot`` in chunks of ``chunk_entries`` addresses.
+
+    The output is identical to ``json.dumps(snapshot, separators=(",", ":"))``
+    but ``claimed_by`` is never serialized as one string.
+    """
+    yield "{"
+    for i, (key, value) in enumerate(snapshot.items()):
+        sep = "," if i else ""
+        if key != "claimed_by" or not isinstance(value, Mapping):
+            yield f"{sep}{json.dumps(key)}:{json.dumps(value, separators=(',', ':'))}"
+            continue
+        yield f"{sep}{json.dumps(key)}:{{"
+        batch: list[str] = []
+        for j, (addr, amount) in enumerate(value.items()):
+            batch.append(f"{',' if j else ''}{json.dumps(addr)}:{json.dumps(amount)}")
+            if len(batch) >= chunk_entries:
+                yield "".join(batch)
+                batch.clear()
+        yield "".join(batch) + "}"
+    yield "}"
+
+
+def snapshot_to_json(snapshot: Mapping[str, Any]) -> str:
+    return "".join(iter_snapshot_json(snapshot))
+
+
+class SnapshotCache:
+    """Keep the snapshot of one ``EventStore`` current from the delta of new claims.
+
+    Results are cached by the store's ``cache_key``, so repeated calls between
+    merges are free. After a merge only the claimers whose totals changed are
+    re-normalized; a full rebuild happens only when the store's epoch changes
+    (clear, seed or a different store) or ``decimals`` differs from the last call.
+
+    The returned snapshot shares its ``claimed_by`` dict with the cache, which
+    updates it in place on the next call: serialize it before calling again (or
+    use :meth:`write`, which holds the cache while streaming) and do not modify it.
+    """
+
+    def __init__(self, *, chain: str, contract: str) -> None:
+        self.chain: str = chain
+        self.contract: str = contract
+        self._lock = threading.RLock()
+        self._key: tuple[int, int, int, int] | None = None
+        self._mark: tuple[int, int] | None = None
+        self._claimed_by: dict[str, str] = {}
+        self._snapshot: dict[str, Any] | None = None
+
+    def snapshot(self, store: EventStore, *, decimals: int) -> dict[str, Any]:
+        with self._lock, store.lock:
+            agg = store.aggregates(decimals=decimals)
+            key = (*store.cache_key, decimals)
+            if self._snapshot is not None and key == self._key:
+                return self._snapshot
+            mark = self._mark if self._key is not None and self._key[3] == decimals else None
+            self._mark, changed = store.changed_claimers(mark)
+            dist = agg.distribution_by_address
+            if changed is None:
+                self._claimed_by = {addr: str(amount.normalize()) for addr, amount in dist.items()}
+            else:
+                for addr in changed:
+                    self._claimed_by[addr] = str(dist[addr].normalize())
+            self._key = key
+            self._snapshot = {
+                "chain": self.chain,
+                "contract": self.contract,
+                "last_block": store.last_block,
+                "decimals": decimals,
+                "claims_count": agg.claims_count,
+                "claimed_by": self._claimed_by,
+            }
+            return self._snapshot
+
+    def write(
+        self, store: EventStore, sink: str | Path | IO[bytes], *, decimals: int, compression: str | None = None
+    ) -> None:
+        """Stream the current snapshot to ``sink`` (see :func:`write_snapshot`)."""
+        with self._lock:
+            write_snapshot(self.snapshot(store, decimals=decimals), sink, compression=compression)
+
+
+def _csv_row(e: Mapping[str, Any]) -> list[Any]:
+    return [
+        str(e.get("claimer", "")),
+        int(e.get("amount_raw", 0)),
+        str(e.get("tx_hash", "")),
+        int(e.get("block_number", 0)),
+        int(e.get("log_index", 0)),
+        int(e.get("timestamp", 0)),
+    ]
+
+
+def iter_events_csv(events: Iterable[Mapping[str, Any]], *, chunk_rows: int = 50_000) -> Iterator[str]:
+    """Yield CSV text in chunks of about ``chunk_rows`` rows, header first.
+
+    An ``EventStore`` is read column-wise in chunks, so memory stays bounded by
+    one chunk of text on top of the store's packed buffers.
+    """
     buf = io.StringIO()
     writer = csv.writer(buf)
-    writer.writerow(["claimer", "amount_raw", "tx_hash", "block_number", "log_index", "timestamp"])
-    for e in events:
-        writer.writerow(
+    writer.writerow(CSV_COLUMNS)
+    if isinstance(events, EventStore):
+        for columns in events.iter_columns(chunk_rows):
+            writer.writerows(zip(*(columns[name] for name in CSV_COLUMNS), strict=True))
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    else:
+        for i, e in enumerate(events, 1):
+            writer.writerow(_csv_row(e))
+            if i % chunk_rows == 0:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def events_to_csv(events: Iterable[Mapping[str, Any]]) -> str:
+    return "".join(iter_events_csv(events))
+
+
+# Compressed output: "gzip" uses the stdlib, "zstd" the optional zstandard package.
+COMPRESSIONS: tuple[str, ...] = ("gzip", "zstd")
+COMPRESSION_SUFFIXES: dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+_GZIP_MAGIC: bytes = b"\x1f\x8b"
+_ZSTD_MAGIC: bytes = b"\x28\xb5\x2f\xfd"
+
+
+def zstd_available() -> bool:
+    """Whether the optional zstandard package is installed (``"zstd"`` can be used)."""
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def _require_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise CompressionError("zstd compression requires zstandard: pip install 'distributor-monitor[zstd]'") from exc
+    return zstandard
+
+
+def compression_for_path(path: str | Path) -> str | None:
+    """Infer the compression from a file suffix (``.gz``/``.zst``), ``None`` otherwise."""
+    suffix = Path(path).suffix.lower()
+    return next((name for name, ext in COMPRESSION_SUFFIXES.items() if ext == suffix), None)
+
+
+@contextmanager
+def _open_sink(sink: str | Path | IO[bytes]) -> Iterator[IO[bytes]]:
+    if isinstance(sink, (str, Path)):
+        with open(sink, "wb") as f:
+            yield f
+    else:
+        yield sink
+
+
+@contextmanager
+def compressed_writer(sink: str | Path | IO[bytes], compression: str | None = None) -> Iterator[IO[bytes]]:
+    """Open a binary writer on ``sink`` that compresses as it goes.
+
+    File-like sinks are left open; only the compression frame is finished.
+    Raises ``CompressionError`` for ``"zstd"`` when zstandard is not installed.
+    """
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression {compression!r}; expected one of {COMPRESSIONS}")
+    # Checked before the sink is opened, so a missing codec leaves no empty file behind
+    zstandard = _require_zstandard() if compression == "zstd" else None
+    with _open_sink(sink) as raw:
+        if compression is None:
+            yield raw
+        elif zstandard is None:
+            # mtime=0 keeps the output deterministic for identical content
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+                yield cast(IO[bytes], gz)
+        else:
+            with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as zw:
+                yield cast(IO[bytes], zw)
+
+
+def write_text_chunks(chunks: Iterable[str], sink: str | Path | IO[bytes], *, compression: str | None = None) -> None:
+    """Encode text chunks as UTF-8 and stream them to ``sink``, optionally compressed."""
+    with compressed_writer(sink, compression) as out:
+        for chunk in chunks:
+            out.write(chunk.encode("utf-8"))
+
+
+def write_events_csv(
+    events: Iterable[Mapping[str, Any]],
+    sink: str | Path | IO[bytes],
+    *,
+    compression: str | None = None,
+    chunk_rows: int = 50_000,
+) -> None:
+    """Stream the events CSV to ``sink`` without building the full text."""
+    write_text_chunks(iter_events_csv(events, chunk_rows=chunk_rows), sink, compression=compression)
+
+
+def write_snapshot(
+    snapshot: Mapping[str, Any], sink: str | Path | IO[bytes], *, compression: str | None = None
+) -> None:
+    """Stream a snapshot from :func:`build_snapshot` to ``sink`` as JSON."""
+    write_text_chunks(iter_snapshot_json(snapshot), sink, compression=compression)
+
+
+def decompress(data: bytes) -> bytes:
+    """Return ``data`` decompressed if it starts with a gzip or zstd header, else unchanged.
+
+    Raises:
+        CompressionError: The archive is truncated or corrupt, or zstandard is not installed.
+    """
+    if data.startswith(_GZIP_MAGIC):
+        try:
+            return gzip.decompress(data)
+        except (EOFError, OSError, zlib.error) as exc:
+            # EOFError when truncated, BadGzipFile (an OSError) or zlib.error when corrupt
+            raise CompressionError(f"Corrupt gzip data: {exc}") from exc
+    if data.startswith(_ZSTD_MAGIC):
+        zstandard = _require_zstandard()
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+                return cast(bytes, reader.read())
+        except zstandard.ZstdError as exc:
+            raise CompressionError(f"Corrupt zstd data: {exc}") from exc
+    return data
+
+
+def read_snapshot(source: str | Path | IO[bytes], *, decimals: int) -> Snapshot:
+    """Load a snapshot file written by :func:`write_snapshot`, compressed or not."""
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return load_snapshot(f.read(), decimals=decimals)
+    return load_snapshot(source.read(), decimals=decimals)
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError("Parquet/Arrow export requires pyarrow: pip install 'distributor-monitor[arrow]'") from exc
+    return pyarrow
+
+
+def arrow_schema() -> Any:
+    """Schema of columnar exports.
+
+    uint256 needs 78 decimal digits but Arrow decimals stop at 76, so
+    ``amount_raw`` is stored exactly as 32-byte big-endian fixed-size binary.
+    """
+    pa = _require_pyarrow()
+    return pa.schema(
+        [
+            pa.field("claimer", pa.string()),
+            pa.field("amount_raw", pa.binary(AMOUNT_BYTES), metadata={"encoding": "uint256-be"}),
+            pa.field("tx_hash", pa.string()),
+            pa.field("block_number", pa.int64()),
+            pa.field("log_index", pa.int64()),
+            pa.field("timestamp", pa.int64()),
+        ]
+    )
+
+
+def iter_record_batches(events: Iterable[Mapping[str, Any]], *, chunk_rows: int = 100_000) -> Iterator[Any]:
+    """Yield ``pyarrow.RecordBatch`` chunks of at most ``chunk_rows`` events in chain order.
+
+    Amounts are sliced straight from the store's packed buffer without going
+    through Python ints.
+    """
+    pa = _require_pyarrow()
+    store = events if isinstance(events, EventStore) else EventStore(events)
+    schema = arrow_schema()
+    cols = store.packed_columns()
+    n = len(cols.blocks)
+    step = max(1, chunk_rows)
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        amounts = pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(AMOUNT_BYTES),
+            stop - start,
+            [None, pa.py_buffer(cols.amounts[start * AMOUNT_BYTES : stop * AMOUNT_BYTES])],
+        )
+        yield pa.record_batch(
             [
-                str(e.get("claimer", "")),
-                int(e.get("amount_raw", 0)),
-                str(e.get("tx_hash", "")),
-                int(e.get("block_number", 0)),
-                int(e.get("log_index", 0)),
-                int(e.get("timestamp", 0)),
-            ]
+                pa.array(hex_column(cols.claimers[start * ADDRESS_BYTES : stop * ADDRESS_BYTES], ADDRESS_BYTES), pa.string()),
+                amounts,
+                pa.array(hex_column(cols.tx_hashes[start * HASH_BYTES : stop * HASH_BYTES], HASH_BYTES), pa.string()),
+                pa.array(cols.blocks[start:stop], pa.int64()),
+                pa.array(cols.log_indexes[start:stop], pa.int64()),
+                pa.array(cols.timestamps[start:stop], pa.int64()),
+            ],
+            schema=schema,
         )
-    return buf.getvalue()
 
 
+def write_events_parquet(
+    events: Iterable[Mapping[str, Any]],
+    sink: str | IO[bytes],
+    *,
+    chunk_rows: int = 100_000,
+    compression: str = "zstd",
+) -> None:
+    """Write events to Parquet, one row group per ``chunk_rows`` events."""
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(sink, arrow_schema(), compression=compression) as writer:
+        for batch in iter_record_batches(events, chunk_rows=chunk_rows):
+            writer.write_batch(batch, row_group_size=chunk_rows)
+
+
+def write_events_arrow_ipc(events: Iterable[Mapping[str, Any]], sink: str | IO[bytes], *, chunk_rows: int = 100_000) -> None:
+    """Write events as an Arrow IPC file, one record batch per ``chunk_rows`` events."""
+    pa = _require_pyarrow()
+    with pa.ipc.new_file(sink, arrow_schema()) as writer:
+        for batch in iter_record_batches(events, chunk_rows=chunk_rows):
+            writer.write_batch(batch)
+
+
+def uint256_values(column: Any) -> list[int]:
+    """Decode an exported ``amount_raw`` column (Arrow array or list of bytes) to ints."""
+    values = column.to_pylist() if hasattr(column, "to_pylist") else list(column)
+    return [int.from_bytes(v, "big") for v in values]
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
 from typing import Any, cast
 
-from eth_utils.abi import event_abi_to_log_topic
-
-from .claims_aggregate import ClaimsAggregate, aggregate_claims, deduplicate_events
-from .decode import decode_logs
+from .claims_aggregate import ClaimsAggregate
+from .decode import ClaimEvent, decode_logs
+from .event_store import EventStore
 
 
 @dataclass
@@ -17,9 +17,192 @@ class Cursor:
 
 @dataclass
 class SyncResult:
-    events: list[dict[str, Any]]
+    events: Sequence[Mapping[str, Any]]
     aggregates: ClaimsAggregate
     cursor: Cursor
+    store: EventStore | None = None
+    new_events: list[Mapping[str, Any]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SyncProgress:
+    """Progress of an initial sync, reported after every fetched page."""
+
+    from_block: int
+    to_block: int
+    blocks_covered: int
+    pages: int
+    logs: int
+    elapsed_s: float
+
+    @property
+    def total_blocks(self) -> int:
+        return max(0, self.to_block - self.from_block + 1)
+
+    @property
+    def fraction(self) -> float:
+        return min(1.0, self.blocks_covered / self.total_blocks) if self.total_blocks else 1.0
+
+    @property
+    def logs_per_s(self) -> float:
+        return self.logs / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def eta_s(self) -> float | None:
+        """Estimated seconds left, from the block coverage rate so far."""
+        if self.blocks_covered <= 0 or self.elapsed_s <= 0:
+            return None
+        return (self.total_blocks - self.blocks_covered) * self.elapsed_s / self.blocks_covered
+
+
+ProgressCallback = Callable[[SyncProgress], None]
+PageCallback = Callable[[list[dict[str, Any]]], None]
+
+
+class ProgressTracker:
+    """Turn fetched pages into ``SyncProgress`` for a sync over ``[from_block, to_block]``.
+
+    The range may be fetched as several sub-ranges in any order (e.g. newest-first
+    backfill chunks); wrap each in :meth:`start_range`/:meth:`finish_range`. Within a
+    range, pages are block-ascending, so the last log of a page marks coverage.
+    """
+
+    def __init__(
+        self,
+        from_block: int,
+        to_block: int,
+        callback: ProgressCallback | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.from_block: int = from_block
+        self.to_block: int = to_block
+        self.callback: ProgressCallback | None = callback
+        self._clock: Callable[[], float] = clock
+        self._started: float = clock()
+        self._done_blocks: int = 0
+        self._range: tuple[int, int] | None = None
+        self._seen_to: int | None = None
+        self._pages: int = 0
+        self._logs: int = 0
+
+    def start_range(self, from_block: int, to_block: int) -> None:
+        self._range = (from_block, to_block)
+        self._seen_to = None
+
+    def page(self, logs: list[dict[str, Any]]) -> None:
+        self._pages += 1
+        self._logs += len(logs)
+        if logs:
+            self._seen_to = int(logs[-1].get("blockNumber", 0))
+        self._emit()
+
+    def finish_range(self) -> None:
+        if self._range is not None:
+            self._done_blocks += self._range[1] - self._range[0] + 1
+        self._range = None
+        self._emit()
+
+    def progress(self) -> SyncProgress:
+        covered = self._done_blocks
+        if self._range is not None and self._seen_to is not None:
+            covered += max(0, self._seen_to - self._range[0] + 1)
+        return SyncProgress(
+            from_block=self.from_block,
+            to_block=self.to_block,
+            blocks_covered=min(covered, max(0, self.to_block - self.from_block + 1)),
+            pages=self._pages,
+            logs=self._logs,
+            elapsed_s=self._clock() - self._started,
+        )
+
+    def _emit(self) -> None:
+        if self.callback is not None:
+            self.callback(self.progress())
+
+
+def event_topic0(event_abi: dict[str, Any]) -> str:
+    """Return the ``0x``-prefixed topic0 hash of an event ABI entry."""
+    from eth_utils.abi import event_abi_to_log_topic
+
+    topic0_raw: str = event_abi_to_log_topic(cast(Any, event_abi)).hex()
+    return "0x" + topic0_raw if not topic0_raw.startswith("0x") else topic0_raw
+
+
+def live_window(cursor: int, latest_block: int, confirmation_blocks: int) -> tuple[int, int]:
+    """Return the ``(from_block, to_block)`` range for a live tick from ``cursor``.
+
+    The range re-scans ``confirmation_blocks`` below the cursor to guard against
+    short reorgs and stops the same distance below the chain head.
+    """
+    from_block: int = max(0, cursor - confirmation_blocks)
+    to_block: int = max(0, latest_block - confirmation_blocks) if confirmation_blocks > 0 else latest_block
+    return from_block, to_block
+
+
+def backfill_ranges(from_block: int, to_block: int, chunk_blocks: int) -> list[tuple[int, int]]:
+    """Split ``[from_block, to_block]`` into inclusive chunks, newest first.
+
+    Fetching the most recent history first lets callers show recent claims
+    while older ranges are still loading.
+    """
+    if chunk_blocks <= 0:
+        return [(from_block, to_block)] if from_block <= to_block else []
+    ranges: list[tuple[int, int]] = []
+    hi = to_block
+    while hi >= from_block:
+        lo = max(from_block, hi - chunk_blocks + 1)
+        ranges.append((lo, hi))
+        hi = lo - 1
+    return ranges
+
+
+def fetch_decoded(
+    *,
+    blockscout_client: Any,
+    address: str,
+    event_abi: dict[str, Any],
+    from_block: int,
+    to_block: int,
+    page_size: int,
+    on_page: PageCallback | None = None,
+) -> list[ClaimEvent]:
+    """Fetch all logs for ``event_abi`` in a block range and decode them.
+
+    ``on_page`` is called with the raw logs of every fetched page.
+    """
+    extra: dict[str, Any] = {"on_page": on_page} if on_page is not None else {}
+    logs = blockscout_client.fetch_logs_paginated(  # Remove await
+        address=address,
+        topic0=event_topic0(event_abi),
+        from_block=from_block,
+        to_block=to_block,
+        page_size=page_size,
+        **extra,
+    )
+    return decode_logs([event_abi], logs)
+
+
+def _store_from_events(
+    event_abi: dict[str, Any], events: Iterable[Mapping[str, Any]] | None, decimals: int
+) -> EventStore:
+    """Build a store from caller-supplied events, decoding any raw logs among them."""
+    existing_list: list[Mapping[str, Any]] = list(events or [])
+    raw_logs: list[dict[str, Any]] = [dict(e) for e in existing_list if "tx_hash" not in e]
+    store = EventStore((e for e in existing_list if "tx_hash" in e), decimals=decimals)
+    if raw_logs:
+        store.merge(decode_logs([event_abi], raw_logs))
+    return store
+
+
+def _result(store: EventStore, added: list[Mapping[str, Any]], decimals: int) -> SyncResult:
+    return SyncResult(
+        events=store,
+        aggregates=store.aggregates(decimals=decimals),
+        cursor=Cursor(last_block=store.last_block),
+        store=store,
+        new_events=added,
+    )
 
 
 def initial_sync(
@@ -31,24 +214,31 @@ def initial_sync(
     to_block: int,
     page_size: int,
     decimals: int,
-    existing_events: Iterable[dict[str, Any]] | None = None,
+    existing_events: Iterable[Mapping[str, Any]] | None = None,
+    store: EventStore | None = None,
+    progress: ProgressCallback | None = None,
 ) -> SyncResult:
-    """Synchronous initial sync."""
-    topic0_raw: str = event_abi_to_log_topic(cast(Any, event_abi)).hex()
-    topic0: str = "0x" + topic0_raw if not topic0_raw.startswith("0x") else topic0_raw
-    logs = blockscout_client.fetch_logs_paginated(  # Remove await
+    """Synchronous initial sync.
+
+    When ``store`` is given, fetched events are merged into it in place and
+    ``existing_events`` is ignored. ``progress`` is called after every page.
+    """
+    if store is None:
+        store = EventStore(existing_events, decimals=decimals)
+    tracker = ProgressTracker(from_block, to_block, progress)
+    tracker.start_range(from_block, to_block)
+    decoded = fetch_decoded(
+        blockscout_client=blockscout_client,
         address=address,
-        topic0=topic0,
+        event_abi=event_abi,
         from_block=from_block,
         to_block=to_block,
         page_size=page_size,
+        on_page=tracker.page if progress is not None else None,
     )
-    decoded = decode_logs([event_abi], logs)
-    merged: list[dict[str, Any]] = list(existing_events or []) + decoded
-    deduped = deduplicate_events(merged)
-    last_block = max((int(e.get("block_number", 0)) for e in deduped), default=0)
-    aggregates = aggregate_claims(deduped, decimals=decimals)
-    return SyncResult(events=deduped, aggregates=aggregates, cursor=Cursor(last_block=last_block))
+    tracker.finish_range()
+    added = store.merge(decoded)
+    return _result(store, added, decimals)
 
 
 def incremental_sync(
@@ -60,37 +250,28 @@ def incremental_sync(
     confirmation_blocks: int,
     page_size: int,
     decimals: int,
-    existing_events: Iterable[dict[str, Any]],
+    existing_events: Iterable[Mapping[str, Any]] | None = None,
+    store: EventStore | None = None,
 ) -> SyncResult:
-    """Synchronous incremental sync."""
-    # Determine from_block with overlap window to guard against reorg
-    existing_list: list[dict[str, Any]] = list(existing_events)
-    last_block: int = max((int(e.get("block_number", 0)) for e in existing_list), default=0)
-    from_block: int = max(0, last_block - confirmation_blocks)
-    to_block: int = max(0, latest_block - confirmation_blocks) if confirmation_blocks > 0 else latest_block
+    """Synchronous incremental sync.
 
-    topic0_raw: str = event_abi_to_log_topic(cast(Any, event_abi)).hex()
-    topic0: str = "0x" + topic0_raw if not topic0_raw.startswith("0x") else topic0_raw
-    logs = blockscout_client.fetch_logs_paginated(  # Remove await
+    With a persistent ``store`` a tick costs O(new + overlap): only the overlap
+    window is refetched and merged through the store's dedup index. Without one,
+    a store is built from ``existing_events`` (raw logs are decoded first).
+    """
+    if store is None:
+        store = _store_from_events(event_abi, existing_events, decimals)
+    # Determine from_block with overlap window to guard against reorg
+    from_block, to_block = live_window(store.last_block, latest_block, confirmation_blocks)
+    decoded = fetch_decoded(
+        blockscout_client=blockscout_client,
         address=address,
-        topic0=topic0,
+        event_abi=event_abi,
         from_block=from_block,
         to_block=to_block,
         page_size=page_size,
     )
-    decoded_new = decode_logs([event_abi], logs)
-
-    # Normalize existing events: if items look like raw logs, decode them
-    raw_logs: list[dict[str, Any]] = [e for e in existing_list if "tx_hash" not in e]
-    already_norm: list[dict[str, Any]] = [e for e in existing_list if "tx_hash" in e]
-    decoded_existing: list[dict[str, Any]] = []
-    if raw_logs:
-        decoded_existing = decode_logs([event_abi], raw_logs)
-
-    merged: list[dict[str, Any]] = already_norm + decoded_existing + decoded_new
-    deduped = deduplicate_events(merged)
-    new_last_block = max((int(e.get("block_number", 0)) for e in deduped), default=last_block)
-    aggregates = aggregate_claims(deduped, decimals=decimals)
-    return SyncResult(events=deduped, aggregates=aggregates, cursor=Cursor(last_block=new_last_block))
+    added = store.merge(decoded)
+    return _result(store, added, decimals)
 
 
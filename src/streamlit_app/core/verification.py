@@ -0,0 +1,671 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import struct
+import threading
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from functools import cached_property
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .event_store import ADDRESS_BYTES, AMOUNT_BYTES, EventStore
+from .exports import write_text_chunks
+
+ADDRESS_COLUMN: str = "address"
+# Wave amount columns, e.g. ``wave1_bard_wei``; ordered by wave number
+WAVE_COLUMN_PATTERN: re.Pattern[str] = re.compile(r"wave(\d+)\w*_wei", re.IGNORECASE)
+
+# Wei amounts are parsed in base 10**9 groups (see ``_packed_amounts``)
+_GROUP_DIGITS: int = 9
+_GROUP_BASE: np.uint64 = np.uint64(10**_GROUP_DIGITS)
+_GROUP_WEIGHTS: npt.NDArray[np.uint64] = 10 ** np.arange(_GROUP_DIGITS - 1, -1, -1, dtype=np.uint64)
+_MAX_DIGITS: int = len(str(2**256 - 1))
+
+
+class AllowlistError(Exception):
+    """Raised when a verification CSV cannot be parsed."""
+
+
+@dataclass(frozen=True, eq=False)
+class Allowlist:
+    """Expected claim amounts per address, packed and sorted by address.
+
+    ``addresses`` holds unique 20-byte addresses (``S20``) in ascending order and
+    ``amounts[i, j]`` the exact wei for address ``i`` in wave ``waves[j]`` as a
+    32-byte big-endian uint256 (``S32``). Lookups bisect the address column, so
+    a multi-million-row allowlist costs about ``20 + 32 * waves`` bytes per row.
+
+    ``S`` arrays drop trailing zero bytes when single items are read; use
+    :meth:`address_at` and :meth:`amount_at` rather than indexing directly.
+    ``digest`` is the SHA-256 of the source CSV when loaded through
+    :func:`load_allowlist_cached`.
+    """
+
+    addresses: npt.NDArray[np.bytes_]
+    amounts: npt.NDArray[np.bytes_]
+    waves: tuple[str, ...]
+    digest: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __contains__(self, address: object) -> bool:
+        return isinstance(address, str) and self.index(address) >= 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.addresses.nbytes + self.amounts.nbytes)
+
+    def index(self, address: str) -> int:
+        """Return the row of ``address`` (any case, ``0x``-prefixed), or -1."""
+        try:
+            key = np.array([bytes.fromhex(address.lower().removeprefix("0x"))], dtype=f"S{ADDRESS_BYTES}")
+        except ValueError:
+            return -1
+        i = int(np.searchsorted(self.addresses, key)[0])
+        if i < len(self.addresses) and self.addresses[i : i + 1].tobytes() == key.tobytes():
+            return i
+        return -1
+
+    def address_at(self, i: int) -> str:
+        return "0x" + self.addresses[i : i + 1].tobytes().hex()
+
+    def amount_at(self, i: int, wave: int) -> int:
+        return int.from_bytes(self.amounts[i : i + 1, wave].tobytes(), "big")
+
+    def expected(self, address: str) -> dict[str, int] | None:
+        """Return ``{wave column: wei}`` for ``address``, or ``None`` if not listed."""
+        i = self.index(address)
+        if i < 0:
+            return None
+        return {wave: self.amount_at(i, j) for j, wave in enumerate(self.waves)}
+
+    def sample(self, n: int = 3) -> list[str]:
+        return [self.address_at(i) for i in range(min(n, len(self)))]
+
+    @cached_property
+    def wave_index(self) -> WaveIndex:
+        """Amount-to-wave lookup, built once and shared by every verifier of this allowlist."""
+        return WaveIndex.build(self)
+
+    @cached_property
+    def totals(self) -> AllowlistTotals:
+        """Listed entries and expected wei per wave, built once and shared by every reconciliation."""
+        return AllowlistTotals.build(self)
+
+
+def _byte_view(column: npt.NDArray[np.bytes_], width: int) -> npt.NDArray[np.uint8]:
+    """View a packed ``S<width>`` column as ``(..., width)`` bytes, without copying a contiguous (or mapped) one."""
+    return np.ascontiguousarray(column).view(np.uint8).reshape(*column.shape, width)
+
+
+def find_wave_columns(header: Sequence[str]) -> list[str]:
+    """Return the wave amount columns of a CSV header, ordered by wave number."""
+    numbered = [(int(m.group(1)), c) for c in header if (m := WAVE_COLUMN_PATTERN.fullmatch(c))]
+    return [c for _, c in sorted(numbered)]
+
+
+def _packed_addresses(values: list[str], first_row: int) -> npt.NDArray[np.bytes_]:
+    # Fast path: "x" is not a hex digit, so removing "0x" only strips prefixes
+    hex_text = "".join(values).lower().replace("0x", "")
+    if len(hex_text) != len(values) * ADDRESS_BYTES * 2:
+        hex_text = "".join(v.strip().lower().removeprefix("0x") for v in values)
+    try:
+        if len(hex_text) != len(values) * ADDRESS_BYTES * 2:
+            raise ValueError("wrong length")
+        packed = bytes.fromhex(hex_text)
+    except ValueError as exc:
+        bad = next((i for i, v in enumerate(values) if not _is_address(v)), 0)
+        raise AllowlistError(f"Invalid address on line {first_row + bad + 2}: {values[bad]!r}") from exc
+    return np.frombuffer(packed, dtype=f"S{ADDRESS_BYTES}")
+
+
+def _is_address(value: str) -> bool:
+    text = value.strip().lower().removeprefix("0x")
+    return len(text) == ADDRESS_BYTES * 2 and all(c in "0123456789abcdef" for c in text)
+
+
+def _packed_amounts(values: list[str], column: str, first_row: int) -> npt.NDArray[np.bytes_]:
+    """Convert decimal wei strings (empty means 0) to 32-byte big-endian values.
+
+    Digits are read in groups of 9 and folded into eight 32-bit words with
+    vectorized long multiplication, so every uint256 stays exact.
+    """
+    text = np.char.strip(np.asarray(values, dtype=str))
+    n = len(text)
+    width = max(int(np.char.str_len(text).max(initial=0)), 1)
+    lines = f"lines {first_row + 2}-{first_row + n + 1}"
+    if width > _MAX_DIGITS:
+        raise AllowlistError(f"Column {column!r} has amounts above uint256 ({lines})")
+    width += -width % _GROUP_DIGITS
+    digits = np.char.zfill(text, width).view(np.uint32).reshape(n, width) - ord("0")
+    if (digits > 9).any():
+        raise AllowlistError(f"Column {column!r} must hold non-negative integer wei ({lines})")
+    groups = digits.reshape(n, -1, _GROUP_DIGITS).astype(np.uint64) @ _GROUP_WEIGHTS
+    words = np.zeros((AMOUNT_BYTES // 4, n), dtype=np.uint64)  # little-endian 32-bit words
+    for k in range(groups.shape[1]):
+        carry = groups[:, k]
+        for w in range(len(words)):
+            t = words[w] * _GROUP_BASE + carry
+            words[w] = t & 0xFFFFFFFF
+            carry = t >> 32
+        if carry.any():
+            raise AllowlistError(f"Column {column!r} has amounts above uint256 ({lines})")
+    packed = words[::-1].T.astype(">u4")
+    return np.ascontiguousarray(packed).view(f"S{AMOUNT_BYTES}").ravel()
+
+
+def _csv_chunks(source: str | Path | IO[bytes], columns: list[str], chunk_rows: int) -> Iterator[dict[str, list[str]]]:
+    """Yield ``{column: values}`` chunks with every value read as text.
+
+    Uses pyarrow's multithreaded CSV reader when installed, else pandas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        import pandas as pd
+
+        reader: Any = pd.read_csv(source, usecols=columns, dtype=str, na_filter=False, chunksize=chunk_rows)
+        for frame in reader:
+            yield {c: frame[c].tolist() for c in columns}
+        return
+    # Arrow reads blocks of bytes; size them to roughly chunk_rows rows of ~100 bytes
+    stream = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=max(1 << 20, chunk_rows * 100)),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={c: pa.string() for c in columns},
+            strings_can_be_null=False,
+        ),
+    )
+    for batch in stream:
+        yield {c: batch.column(c).to_pylist() for c in columns}
+
+
+def load_allowlist(
+    source: bytes | str | Path | IO[bytes],
+    *,
+    wave_columns: Sequence[str] | None = None,
+    chunk_rows: int = 500_000,
+) -> Allowlist:
+    """Load a verification CSV (``address`` plus one wei column per wave).
+
+    ``wave_columns`` defaults to every ``wave<N>..._wei`` column in the header, in
+    wave order, so any number of waves is supported. The file is parsed in chunks
+    of about ``chunk_rows`` with every column read as text, so wei amounts stay
+    exact beyond int64; empty amounts count as 0. Extra columns are ignored. When
+    an address is listed twice, the last row wins.
+    """
+    import pandas as pd  # only loaded once a CSV is uploaded; ~0.4s at startup otherwise
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        header = [str(c) for c in pd.read_csv(source, nrows=0).columns]
+    except (ValueError, pd.errors.ParserError) as exc:
+        raise AllowlistError(f"Cannot read CSV: {exc}") from exc
+    if wave_columns is None:
+        wave_columns = find_wave_columns(header)
+    columns = [ADDRESS_COLUMN, *wave_columns]
+    missing = [c for c in columns if c not in header]
+    if missing or not wave_columns:
+        raise AllowlistError(
+            f"CSV must contain columns: {', '.join(columns)} and at least one wave<N>_..._wei column"
+            f" (found: {', '.join(header)})"
+        )
+    if not isinstance(source, (str, Path)):
+        source.seek(0)
+
+    address_chunks: list[npt.NDArray[np.bytes_]] = []
+    amount_chunks: list[npt.NDArray[np.bytes_]] = []
+    row = 0
+    try:
+        for chunk in _csv_chunks(source, columns, chunk_rows):
+            n = len(chunk[ADDRESS_COLUMN])
+            address_chunks.append(_packed_addresses(chunk[ADDRESS_COLUMN], row))
+            amounts = np.empty((n, len(wave_columns)), dtype=f"S{AMOUNT_BYTES}")
+            for j, column in enumerate(wave_columns):
+                amounts[:, j] = _packed_amounts(chunk[column], column, row)
+            amount_chunks.append(amounts)
+            row += n
+    except (OSError, ValueError) as exc:  # parser errors of pandas and pyarrow are ValueErrors
+        raise AllowlistError(f"Cannot read CSV: {exc}") from exc
+
+    if not address_chunks:
+        return Allowlist(
+            addresses=np.empty(0, dtype=f"S{ADDRESS_BYTES}"),
+            amounts=np.empty((0, len(wave_columns)), dtype=f"S{AMOUNT_BYTES}"),
+            waves=tuple(wave_columns),
+        )
+    addresses = np.concatenate(address_chunks)
+    all_amounts = np.concatenate(amount_chunks)
+    # Stable sort keeps file order among duplicates, so the last one is kept
+    order = np.argsort(addresses, kind="stable")
+    addresses, all_amounts = addresses[order], all_amounts[order]
+    keep = np.ones(len(addresses), dtype=bool)
+    keep[:-1] = addresses[1:] != addresses[:-1]
+    return Allowlist(addresses=addresses[keep], amounts=all_amounts[keep], waves=tuple(wave_columns))
+
+
+# Binary index file: magic, 4-byte little-endian header length, JSON header,
+# then the address column and the amount matrix as raw bytes.
+_INDEX_MAGIC: bytes = b"DMALLOW1"
+INDEX_SUFFIX: str = ".allowlist"
+
+
+def allowlist_digest(data: bytes) -> str:
+    """Return the content hash that keys cached allowlist indexes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def save_allowlist(allowlist: Allowlist, path: str | Path) -> None:
+    """Write ``allowlist`` as a compact binary index (written atomically)."""
+    path = Path(path)
+    header = json.dumps({"rows": len(allowlist), "waves": list(allowlist.waves), "digest": allowlist.digest}).encode()
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_INDEX_MAGIC + struct.pack("<I", len(header)) + header)
+        f.write(np.ascontiguousarray(allowlist.addresses).tobytes())
+        f.write(np.ascontiguousarray(allowlist.amounts).tobytes())
+    os.replace(tmp, path)
+
+
+def read_allowlist(path: str | Path) -> Allowlist:
+    """Open an index written by :func:`save_allowlist`.
+
+    The columns are memory-mapped read-only, so opening is instant and the OS
+    page cache shares them between processes.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(len(_INDEX_MAGIC) + 4)
+        if len(prefix) < len(_INDEX_MAGIC) + 4 or not prefix.startswith(_INDEX_MAGIC):
+            raise AllowlistError(f"{path} is not an allowlist index")
+        (header_len,) = struct.unpack("<I", prefix[len(_INDEX_MAGIC) :])
+        header = json.loads(f.read(header_len))
+    rows, waves = int(header["rows"]), tuple(str(w) for w in header["waves"])
+    offset = len(prefix) + header_len
+    if rows == 0:
+        addresses = np.empty(0, dtype=f"S{ADDRESS_BYTES}")
+        amounts = np.empty((0, len(waves)), dtype=f"S{AMOUNT_BYTES}")
+    else:
+        addresses = np.memmap(path, dtype=f"S{ADDRESS_BYTES}", mode="r", offset=offset, shape=(rows,))
+        amounts = np.memmap(
+            path, dtype=f"S{AMOUNT_BYTES}", mode="r", offset=offset + rows * ADDRESS_BYTES, shape=(rows, len(waves))
+        )
+    return Allowlist(addresses=addresses, amounts=amounts, waves=waves, digest=header.get("digest"))
+
+
+def load_allowlist_cached(
+    data: bytes,
+    *,
+    cache_dir: str | Path | None = None,
+    wave_columns: Sequence[str] | None = None,
+    digest: str | None = None,
+) -> Allowlist:
+    """Load a verification CSV, reusing the binary index for identical content.
+
+    With ``cache_dir`` the parsed index is stored there as ``<sha256>.allowlist``
+    and later loads of the same bytes only map that file. Pass ``digest`` when
+    :func:`allowlist_digest` was already computed.
+    """
+    digest = digest or allowlist_digest(data)
+    path = Path(cache_dir) / f"{digest}{INDEX_SUFFIX}" if cache_dir else None
+    if path is not None and path.exists():
+        try:
+            cached = read_allowlist(path)
+        except (AllowlistError, OSError, ValueError, KeyError):
+            pass  # unreadable or truncated; parse again and overwrite
+        else:
+            if wave_columns is None or cached.waves == tuple(wave_columns):
+                return cached
+    allowlist = replace(load_allowlist(data, wave_columns=wave_columns), digest=digest)
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        save_allowlist(allowlist, path)
+    return allowlist
+
+
+class Check(IntEnum):
+    """Verification result of one claim event."""
+
+    FIRST = 1  # amount matches a wave the address has not claimed yet
+    DUPLICATE = 2  # amount matches, but every wave with that amount was already claimed
+    MISMATCH = 3  # address is listed but the amount matches no wave
+    UNLISTED = 4  # address is not in the allowlist
+    LATE = 5  # amount matches an unclaimed wave, but after that wave's deadline
+
+
+_KEY_BYTES: int = ADDRESS_BYTES + AMOUNT_BYTES
+
+
+def _pair_keys(addresses: npt.NDArray[np.uint8], amounts: npt.NDArray[np.uint8]) -> npt.NDArray[np.bytes_]:
+    """Concatenate ``(n, 20)`` address and ``(n, 32)`` amount bytes into ``S52`` keys."""
+    keys = np.empty((len(addresses), _KEY_BYTES), dtype=np.uint8)
+    keys[:, :ADDRESS_BYTES] = addresses
+    keys[:, ADDRESS_BYTES:] = amounts
+    return keys.view(f"S{_KEY_BYTES}").ravel()
+
+
+@dataclass(frozen=True, eq=False)
+class WaveIndex:
+    """Amount-to-wave lookup for every ``(address, amount)`` pair of an allowlist.
+
+    ``keys`` are the unique pairs (address bytes followed by amount bytes) in
+    sorted order, and pair ``u`` is claimable in waves
+    ``waves[starts[u]:starts[u + 1]]`` (ascending). One bisection of ``keys``
+    resolves a claim to its waves, whatever the number of wave columns; an
+    address with the same amount in several waves can claim it once per wave.
+    Zero amounts are not claimable.
+    """
+
+    keys: npt.NDArray[np.bytes_]
+    starts: npt.NDArray[np.int64]
+    waves: npt.NDArray[np.int8]
+
+    @classmethod
+    def build(cls, allowlist: Allowlist) -> WaveIndex:
+        addresses = _byte_view(allowlist.addresses, ADDRESS_BYTES)
+        amounts = _byte_view(allowlist.amounts, AMOUNT_BYTES)
+        rows, waves = np.nonzero(allowlist.totals.listed)  # row-major, so waves ascend within a row
+        keys = _pair_keys(addresses[rows], amounts[rows, waves])
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        first = np.r_[True, keys[1:] != keys[:-1]] if len(keys) else np.empty(0, dtype=bool)
+        starts = np.append(np.flatnonzero(first), len(keys)).astype(np.int64)
+        return cls(keys=keys[first], starts=starts, waves=waves[order].astype(np.int8))
+
+    def find(self, keys: npt.NDArray[np.bytes_]) -> npt.NDArray[np.intp]:
+        """Return the pair index of each key, or -1 where the pair is not listed."""
+        if not len(self.keys):
+            return np.full(len(keys), -1, dtype=np.intp)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where(self.keys[pos] == keys, pos, -1)
+
+
+def _rank_within_groups(keys: npt.NDArray[np.intp]) -> npt.NDArray[np.intp]:
+    """Return, for each item, how many earlier items share its key (a grouped cumcount)."""
+    positions = np.arange(len(keys))
+    if not len(keys):
+        return positions
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    group_start = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+    ranks = np.empty_like(positions)
+    ranks[order] = positions - np.maximum.accumulate(np.where(group_start, positions, 0))
+    return ranks
+
+
+def _uint32_words(amounts: npt.NDArray[np.uint8]) -> npt.NDArray[Any]:
+    """View ``(..., 32)`` big-endian uint256 bytes as ``(..., 8)`` big-endian uint32 words."""
+    return np.ascontiguousarray(amounts).view(">u4")
+
+
+def _words_to_int(words: npt.NDArray[np.uint64]) -> int:
+    """Combine per-word sums (most significant word first) into an exact integer."""
+    return sum(int(w) << (32 * (len(words) - 1 - k)) for k, w in enumerate(words))
+
+
+@dataclass(frozen=True, eq=False)
+class AllowlistTotals:
+    """The immutable side of a reconciliation: what each allowlist row is owed.
+
+    ``listed[i, j]`` is set where row ``i`` has a nonzero amount in wave ``j``;
+    ``expected_words[j]`` sums wave ``j``'s amounts per 32-bit word.
+    """
+
+    listed: npt.NDArray[np.bool_]
+    listed_counts: npt.NDArray[np.int64]
+    listed_addresses: int
+    expected_words: npt.NDArray[np.uint64]
+
+    @classmethod
+    def build(cls, allowlist: Allowlist) -> AllowlistTotals:
+        amounts = _byte_view(allowlist.amounts, AMOUNT_BYTES)
+        listed = np.asarray(amounts.any(axis=2))
+        return cls(
+            listed=listed,
+            listed_counts=np.count_nonzero(listed, axis=0).astype(np.int64),
+            listed_addresses=int(np.count_nonzero(listed.any(axis=1))),
+            expected_words=_uint32_words(amounts).sum(axis=0, dtype=np.uint64),
+        )
+
+
+@dataclass(frozen=True)
+class WaveReconciliation:
+    """Claimed and outstanding totals of one wave column."""
+
+    wave: str
+    listed: int  # addresses with a nonzero amount in this wave
+    claimed: int
+    expected_wei: int
+    claimed_wei: int
+
+    @property
+    def unclaimed(self) -> int:
+        return self.listed - self.claimed
+
+    @property
+    def outstanding_wei(self) -> int:
+        return self.expected_wei - self.claimed_wei
+
+
+class Reconciliation:
+    """Which allowlist entries were claimed, and how much is still owed per wave.
+
+    A bitmap over ``(allowlist row, wave)`` holds the claimed/unclaimed sets;
+    counts and claimed wei are kept as running totals. Wei totals are summed as
+    32-bit words in ``uint64`` accumulators and only combined into exact
+    integers when read, so :meth:`record` costs O(1) per claim and never
+    rescans the allowlist. A :class:`ClaimVerifier` records every claim that
+    takes a wave (on time or :attr:`Check.LATE`).
+
+    What is owed comes from :attr:`Allowlist.totals`, shared by every
+    reconciliation of the allowlist; only the claimed state is per instance.
+    """
+
+    def __init__(self, allowlist: Allowlist) -> None:
+        self.allowlist: Allowlist = allowlist
+        n, n_waves = allowlist.amounts.shape
+        self._totals: AllowlistTotals = allowlist.totals
+        self._lock = threading.Lock()
+        self._claimed: npt.NDArray[np.bool_] = np.zeros((n, n_waves), dtype=bool)
+        self._row_claims: npt.NDArray[np.int8] = np.zeros(n, dtype=np.int8)
+        self._claimed_counts: npt.NDArray[np.int64] = np.zeros(n_waves, dtype=np.int64)
+        self._claimed_words: npt.NDArray[np.uint64] = np.zeros((n_waves, AMOUNT_BYTES // 4), dtype=np.uint64)
+        self._claimed_addresses: int = 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._claimed[:] = False
+            self._row_claims[:] = 0
+            self._claimed_counts[:] = 0
+            self._claimed_words[:] = 0
+            self._claimed_addresses = 0
+
+    def record(self, rows: npt.NDArray[np.intp], waves: npt.NDArray[np.int8], amounts: npt.NDArray[np.uint8]) -> None:
+        """Mark wave ``waves[i]`` of allowlist row ``rows[i]`` as claimed for ``amounts[i]`` wei.
+
+        Each ``(row, wave)`` must be recorded at most once; :class:`ClaimVerifier`
+        guarantees it by consuming waves.
+        """
+        with self._lock:
+            first = rows[self._row_claims[rows] == 0]
+            self._claimed_addresses += len(np.unique(first))
+            np.add.at(self._row_claims, rows, 1)
+            self._claimed[rows, waves] = True
+            np.add.at(self._claimed_counts, waves, 1)
+            np.add.at(self._claimed_words, waves, _uint32_words(amounts).astype(np.uint64))
+
+    @property
+    def listed_addresses(self) -> int:
+        return self._totals.listed_addresses
+
+    @property
+    def claimed_addresses(self) -> int:
+        """Listed addresses that claimed at least one wave."""
+        with self._lock:
+            return self._claimed_addresses
+
+    def summary(self) -> list[WaveReconciliation]:
+        """Per-wave listed/claimed counts and expected/claimed wei, in wave order."""
+        with self._lock:
+            return [
+                WaveReconciliation(
+                    wave=wave,
+                    listed=int(self._totals.listed_counts[j]),
+                    claimed=int(self._claimed_counts[j]),
+                    expected_wei=_words_to_int(self._totals.expected_words[j]),
+                    claimed_wei=_words_to_int(self._claimed_words[j]),
+                )
+                for j, wave in enumerate(self.allowlist.waves)
+            ]
+
+    def is_claimed(self, address: str, wave: str) -> bool:
+        i = self.allowlist.index(address)
+        with self._lock:
+            return i >= 0 and bool(self._claimed[i, self.allowlist.waves.index(wave)])
+
+    def unclaimed_addresses(self, wave: str | None = None) -> list[str]:
+        """Listed addresses with an unclaimed amount (in ``wave``, or in any wave)."""
+        with self._lock:
+            outstanding = self._totals.listed & ~self._claimed
+        mask = outstanding.any(axis=1) if wave is None else outstanding[:, self.allowlist.waves.index(wave)]
+        raw = self.allowlist.addresses[mask].tobytes().hex()
+        step = 2 * ADDRESS_BYTES
+        return ["0x" + raw[k : k + step] for k in range(0, len(raw), step)]
+
+    def iter_csv(self, *, chunk_rows: int = 50_000) -> Iterator[str]:
+        """Yield the unclaimed report as CSV text chunks, header first.
+
+        One row per address with anything outstanding: the unclaimed wei of each
+        wave (0 where claimed or not listed) and their total.
+        """
+        with self._lock:
+            outstanding = self._totals.listed & ~self._claimed
+        rows = np.flatnonzero(outstanding.any(axis=1))
+        n_waves = len(self.allowlist.waves)
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow([ADDRESS_COLUMN, *self.allowlist.waves, "outstanding_wei"])
+        for start in range(0, len(rows), chunk_rows):
+            chunk = rows[start : start + chunk_rows]
+            addresses = self.allowlist.addresses[chunk].tobytes().hex()
+            amounts = _byte_view(self.allowlist.amounts[chunk], AMOUNT_BYTES)
+            raw = (amounts * outstanding[chunk][:, :, None]).tobytes()
+            wei = [int.from_bytes(raw[k : k + AMOUNT_BYTES], "big") for k in range(0, len(raw), AMOUNT_BYTES)]
+            step = 2 * ADDRESS_BYTES
+            writer.writerows(
+                ["0x" + addresses[k * step : (k + 1) * step], *row, sum(row)]
+                for k, row in enumerate(zip(*(iter(wei),) * n_waves, strict=True))
+            )
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+
+    def write_csv(self, sink: str | Path | IO[bytes], *, compression: str | None = None) -> None:
+        """Stream :meth:`iter_csv` to ``sink``, optionally compressed (see ``exports``)."""
+        write_text_chunks(self.iter_csv(), sink, compression=compression)
+
+
+class ClaimVerifier:
+    """Verify a store's claim events against an allowlist, incrementally.
+
+    Events are joined to the allowlist's :class:`WaveIndex` in vectorized
+    passes. A claim takes the first wave with its amount that the address has
+    not claimed yet; ranks come from a grouped cumulative count per
+    ``(address, amount)`` pair in chain order plus the waves already consumed.
+    ``deadlines`` maps wave columns to unix timestamps; a claim after the
+    deadline of the wave it takes is :attr:`Check.LATE` (and still consumes it).
+
+    :meth:`update` only verifies rows appended since the previous call. When the
+    store changed otherwise (rows inserted before the ones already verified, e.g.
+    by a backfill, or a clear), it re-verifies everything. Every wave taken is
+    recorded in :attr:`reconciliation`.
+    """
+
+    def __init__(self, allowlist: Allowlist, *, deadlines: Mapping[str, int] | None = None) -> None:
+        self.allowlist: Allowlist = allowlist
+        self.deadlines: dict[str, int] = dict(deadlines or {})
+        self._index: WaveIndex = allowlist.wave_index
+        self._deadline_ts: npt.NDArray[np.int64] = np.array(
+            [self.deadlines.get(w, np.iinfo(np.int64).max) for w in allowlist.waves], dtype=np.int64
+        )
+        self._lock = threading.Lock()
+        self._epoch: int | None = None
+        self._last_key: tuple[int, int] | None = None
+        self._status: array[int] = array("b")
+        self._claim_waves: array[int] = array("b")
+        self._consumed: npt.NDArray[np.int64] = np.zeros(len(self._index.keys), dtype=np.int64)
+        self.reconciliation: Reconciliation = Reconciliation(allowlist)
+
+    @property
+    def claim_waves(self) -> npt.NDArray[np.int8]:
+        """Wave index taken by each verified row (-1 for rows that took none)."""
+        with self._lock:
+            return np.frombuffer(self._claim_waves, dtype=np.int8).copy()
+
+    def update(self, store: EventStore) -> npt.NDArray[np.int8]:
+        """Return a :class:`Check` code for every row of ``store``, in store order."""
+        with self._lock, store.lock:
+            done = len(self._status)
+            appended_only = (
+                self._epoch == store.epoch
+                and done <= len(store)
+                and (done == 0 or store.key_at(done - 1) == self._last_key)
+            )
+            if not appended_only:
+                self._status = array("b")
+                self._claim_waves = array("b")
+                self._consumed[:] = 0
+                self.reconciliation.reset()
+                done = 0
+            self._epoch = store.epoch
+            if done < len(store):
+                columns = store.packed_columns(done)
+                status, waves = self._verify(columns.claimers, columns.amounts, columns.timestamps)
+                self._status.frombytes(status.tobytes())
+                self._claim_waves.frombytes(waves.tobytes())
+                self._last_key = store.key_at(len(store) - 1)
+            return np.frombuffer(self._status, dtype=np.int8).copy()
+
+    def _verify(
+        self, claimers_buf: bytes, amounts_buf: bytes, timestamps: array[int]
+    ) -> tuple[npt.NDArray[np.int8], npt.NDArray[np.int8]]:
+        n = len(claimers_buf) // ADDRESS_BYTES
+        status = np.full(n, Check.UNLISTED, dtype=np.int8)
+        claim_waves = np.full(n, -1, dtype=np.int8)
+        allowlist, index = self.allowlist, self._index
+        if not len(allowlist):
+            return status, claim_waves
+        claimers = np.frombuffer(claimers_buf, dtype=f"S{ADDRESS_BYTES}")
+        rows = np.minimum(np.searchsorted(allowlist.addresses, claimers), len(allowlist) - 1)
+        status[allowlist.addresses[rows] == claimers] = Check.MISMATCH
+
+        amounts = np.frombuffer(amounts_buf, dtype=np.uint8).reshape(n, AMOUNT_BYTES)
+        pairs = index.find(_pair_keys(np.frombuffer(claimers_buf, dtype=np.uint8).reshape(n, ADDRESS_BYTES), amounts))
+        matched = pairs >= 0
+        u = pairs[matched]
+        taken = _rank_within_groups(u) + self._consumed[u]
+        available = taken < index.starts[u + 1] - index.starts[u]
+        wave = np.where(available, index.waves[np.minimum(index.starts[u] + taken, index.starts[u + 1] - 1)], -1)
+        late = available & (np.frombuffer(timestamps, dtype=np.int64)[matched] > self._deadline_ts[wave])
+        status[matched] = np.select([late, available], [Check.LATE, Check.FIRST], Check.DUPLICATE)
+        claim_waves[matched] = wave
+        np.add.at(self._consumed, u, 1)
+        self.reconciliation.record(rows[matched][available], wave[available], amounts[matched][available])
+        return status, claim_waves
@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import datetime
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .claims_aggregate import ClaimsAggregate, ClaimsBaseline
+from .decode import ClaimEvent, decode_logs
+from .event_log import LogHead, SqliteEventLog
+from .event_store import EventStore, pack_event
+from .sync import (
+    ProgressTracker,
+    SyncProgress,
+    backfill_ranges,
+    event_topic0,
+    fetch_decoded,
+    live_window,
+)
+
+# Used as to_block when the RPC head is unavailable so Blockscout treats it as latest
+_UNKNOWN_HEAD: int = 999_999_999
+
+
+class _Superseded(Exception):
+    """Raised inside a step when a reset or snapshot import is pending, to abandon it."""
+
+
+@dataclass(frozen=True)
+class SyncState:
+    """State published by a ``SyncWorker`` after each step.
+
+    ``store`` and ``aggregates.distribution_by_address`` are shared with the
+    worker; hold ``store.lock`` while reading several columns or iterating the
+    distribution.
+    """
+
+    store: EventStore
+    aggregates: ClaimsAggregate
+    last_block: int
+    version: int
+    last_sync_time: datetime.datetime | None = None
+    syncing: bool = False
+    live: bool = False
+    error: str | None = None
+    # Oldest block loaded so far while history is still backfilling
+    backfill_from: int | None = None
+    progress: SyncProgress | None = None
+
+
+class SyncWorker:
+    """Long-lived background sync for one (chain, contract, event) key.
+
+    The worker owns its clients and event store and runs initial sync and live
+    ticks on its own thread; sessions only read ``state``. API load therefore
+    does not grow with the number of viewers.
+
+    Initial sync is a newest-first backfill: the range is fetched in chunks of
+    ``backfill_chunk_blocks`` from the head down, each chunk is published as it
+    lands, and live ticks keep running between chunks. Pages are merged and
+    published as they arrive, with ``SyncState.progress`` for the whole range.
+
+    With an ``event_log`` the worker starts from the events persisted by earlier
+    runs and resumes from the stored cursor, and every sync step is written back
+    to the log.
+
+    A ``read_only`` worker never calls the APIs: it follows an event log written
+    by another process (e.g. ``distributor-monitor sync``) and republishes the
+    state whenever the log changes.
+
+    ``reset`` and ``import_snapshot`` are requested from session threads but
+    applied between steps (or right away when the thread is not running), so
+    they never interleave with a step that is writing the store or the log. A
+    step in flight is abandoned at its next page and publishes nothing.
+    """
+
+    def __init__(
+        self,
+        *,
+        blockscout_client: Any,
+        rpc_client: Any,
+        address: str,
+        event_abi: dict[str, Any],
+        decimals: int = 18,
+        page_size: int = 1000,
+        confirmation_blocks: int = 6,
+        poll_interval_s: float = 5.0,
+        backfill_chunk_blocks: int = 100_000,
+        event_log: SqliteEventLog | None = None,
+        read_only: bool = False,
+    ) -> None:
+        if read_only and event_log is None:
+            raise ValueError("A read-only worker needs an event log to follow")
+        self.blockscout_client: Any = blockscout_client
+        self.rpc_client: Any = rpc_client
+        self.address: str = address
+        self.event_abi: dict[str, Any] = event_abi
+        self.decimals: int = decimals
+        self.page_size: int = page_size
+        self.confirmation_blocks: int = confirmation_blocks
+        self.poll_interval_s: float = poll_interval_s
+        self.backfill_chunk_blocks: int = backfill_chunk_blocks
+        self.event_log: SqliteEventLog | None = event_log
+        self.read_only: bool = read_only
+
+        self._store: EventStore = EventStore(decimals=decimals)
+        self._scanned_to: int = 0
+        self._log_head: LogHead | None = None
+        # Block ranges still to fetch, newest first
+        self._backfill: list[tuple[int, int]] = []
+        self._progress: ProgressTracker | None = None
+        if event_log is not None:
+            # Read the head first: rows appended meanwhile are re-read and deduplicated
+            self._log_head = event_log.head()
+            self._store = event_log.load(decimals=decimals)
+            self._scanned_to = self._log_head.cursor or 0
+            pending = event_log.backfill()
+            if pending is not None and not read_only:
+                self._backfill = backfill_ranges(*pending, backfill_chunk_blocks)
+                self._progress = ProgressTracker(*pending)
+        self._pending_from_block: int | None = None
+        # Requested data replacement: ``(baseline,)`` to import a snapshot, ``(None,)`` to reset
+        self._pending_replace: tuple[ClaimsBaseline | None] | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._step_lock: threading.Lock = threading.Lock()
+        self._next_live_at: float = 0.0
+        self._live: bool = False
+        self._wake: threading.Event = threading.Event()
+        self._stop: threading.Event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._state: SyncState = self._snapshot(last_sync_time=None)
+
+    @property
+    def state(self) -> SyncState:
+        return self._state
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def configure(
+        self,
+        *,
+        decimals: int | None = None,
+        page_size: int | None = None,
+        confirmation_blocks: int | None = None,
+        poll_interval_s: float | None = None,
+        rate_limit_qps: float | None = None,
+        backfill_chunk_blocks: int | None = None,
+    ) -> None:
+        """Update sync parameters; takes effect from the next step."""
+        if decimals is not None:
+            self.decimals = decimals
+        if page_size is not None:
+            self.page_size = page_size
+        if confirmation_blocks is not None:
+            self.confirmation_blocks = confirmation_blocks
+        if poll_interval_s is not None:
+            self.poll_interval_s = poll_interval_s
+        if rate_limit_qps is not None:
+            self.blockscout_client._qps = rate_limit_qps
+        if backfill_chunk_blocks is not None:
+            self.backfill_chunk_blocks = backfill_chunk_blocks
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise RuntimeError("Sync worker is read-only; run `distributor-monitor sync` to sync")
+
+    def request_initial_sync(self, from_block: int) -> None:
+        """Schedule a full resync from ``from_block`` and start the thread."""
+        self._check_writable()
+        self._pending_from_block = from_block
+        self._publish()
+        self.start()
+        self._wake.set()
+
+    def set_live(self, live: bool) -> None:
+        if live == self._live:
+            return
+        self._live = live
+        self._publish()
+        if live:
+            self.start()
+        self._wake.set()
+
+    def import_snapshot(self, baseline: ClaimsBaseline) -> None:
+        """Replace all data with a snapshot baseline; live sync resumes after its block."""
+        self._check_writable()
+        self._pending_from_block = None
+        self._request_replace(baseline)
+
+    def reset(self) -> None:
+        """Drop all synced events and stop live polling."""
+        self._check_writable()
+        self._live = False
+        self._pending_from_block = None
+        self._request_replace(None)
+
+    def _request_replace(self, baseline: ClaimsBaseline | None) -> None:
+        with self._lock:
+            self._pending_replace = (baseline,)
+            self._state = replace(self._state, syncing=True, live=self._live)
+        if not self.running:
+            with self._step_lock:
+                self._apply_replace()
+        self._wake.set()
+
+    def _apply_replace(self) -> None:
+        with self._lock:
+            pending, self._pending_replace = self._pending_replace, None
+        if pending is None:
+            return
+        (baseline,) = pending
+        self._backfill = []
+        self._progress = None
+        store = EventStore(decimals=self.decimals)
+        if baseline is not None:
+            store.seed(baseline)
+        if self.event_log is not None:
+            if baseline is not None:
+                self.event_log.replace([], cursor=baseline.last_block, baseline=baseline)
+            else:
+                self.event_log.clear()
+        self._store = store
+        self._scanned_to = baseline.last_block if baseline is not None else 0
+        self._state = self._snapshot(last_sync_time=datetime.datetime.now() if baseline is not None else None)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"sync-worker-{self.address[:10]}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.run_once()
+            except Exception as exc:
+                self._publish(error=str(exc))
+            else:
+                if self._backfill:
+                    continue
+            # Also reached after a failed backfill chunk, so it is retried after a pause
+            polling = self._live or self.read_only or self._backfill
+            self._wake.wait(self.poll_interval_s if polling else None)
+
+    def run_once(self) -> SyncState:
+        """Run one step and publish the result.
+
+        A step is, in order of priority: start a requested initial sync (fetching
+        its newest chunk), a live tick when live and due, the next backfill chunk,
+        or a live tick. A read-only worker instead picks up whatever was written
+        to its log.
+        """
+        if self.read_only:
+            self._follow_log()
+            return self._state
+        with self._step_lock:
+            self._apply_replace()
+            try:
+                self._step()
+            except _Superseded:
+                pass
+            self._apply_replace()
+        return self._state
+
+    def _step(self) -> None:
+        from_block = self._pending_from_block
+        if from_block is not None:
+            self._pending_from_block = None
+            self._initial_sync(from_block)
+        elif self._backfill and not (self._live and time.monotonic() >= self._next_live_at):
+            self._backfill_step()
+        elif self._live:
+            self._live_tick()
+
+    def _initial_sync(self, from_block: int) -> None:
+        latest: int = self.rpc_client.get_latest_block_number()
+        if latest > 0:
+            ranges = backfill_ranges(from_block, latest, self.backfill_chunk_blocks)
+        else:
+            ranges = [(from_block, _UNKNOWN_HEAD)]
+        self._progress = ProgressTracker(from_block, ranges[0][1] if ranges else from_block)
+        # Fill a new store from the newest chunk; it replaces the old one on the
+        # first page, so the old data is kept if the fetch fails before that
+        store = EventStore(decimals=self.decimals)
+        try:
+            if ranges:
+                self._fetch_into(store, *ranges[0])
+        except _Superseded:
+            raise
+        except Exception:
+            if self._store is store:
+                # Part of the first chunk is already shown: keep it and retry the
+                # chunk as a backfill step
+                self._adopt(store, latest if latest > 0 else max(from_block, store.last_block), ranges)
+            else:
+                self._progress = None
+            raise
+        self._adopt(store, latest if latest > 0 else max(from_block, store.last_block), ranges[1:])
+        self._finish_backfill_chunk()
+
+    def _adopt(self, store: EventStore, scanned_to: int, remaining: list[tuple[int, int]]) -> None:
+        if self.event_log is not None:
+            self.event_log.replace(store.packed_rows(), cursor=scanned_to)
+            self.event_log.set_backfill((remaining[-1][0], remaining[0][1]) if remaining else None)
+        self._store = store
+        self._scanned_to = scanned_to
+        self._backfill = remaining
+
+    def _backfill_step(self) -> None:
+        from_block, to_block = self._backfill[0]
+        added = self._fetch_into(self._store, from_block, to_block)
+        self._backfill.pop(0)
+        if self.event_log is not None:
+            # Rows first: if we stop in between, the chunk is refetched and deduplicated
+            self.event_log.append([pack_event(e) for e in added], cursor=self._scanned_to)
+            remaining = self._backfill
+            self.event_log.set_backfill((remaining[-1][0], remaining[0][1]) if remaining else None)
+        self._finish_backfill_chunk()
+
+    def _finish_backfill_chunk(self) -> None:
+        if not self._backfill:
+            self._progress = None
+        self._publish(last_sync_time=datetime.datetime.now())
+
+    def _fetch_into(self, store: EventStore, from_block: int, to_block: int) -> list[Mapping[str, Any]]:
+        """Fetch a backfill range page by page, merging and publishing each page."""
+        added: list[Mapping[str, Any]] = []
+        paged = False
+        progress = self._progress
+        if progress is not None:
+            progress.start_range(from_block, to_block)
+
+        def on_page(logs: list[dict[str, Any]]) -> None:
+            nonlocal paged
+            if self._pending_replace is not None:
+                raise _Superseded
+            paged = True
+            added.extend(store.merge(decode_logs([self.event_abi], logs)))
+            self._store = store
+            if progress is not None:
+                progress.page(logs)
+            self._publish()
+
+        logs = self.blockscout_client.fetch_logs_paginated(
+            address=self.address,
+            topic0=event_topic0(self.event_abi),
+            from_block=from_block,
+            to_block=to_block,
+            page_size=self.page_size,
+            on_page=on_page,
+        )
+        if not paged:
+            # Clients without page callbacks return everything at the end
+            added.extend(store.merge(decode_logs([self.event_abi], logs)))
+        if progress is not None:
+            progress.finish_range()
+        return added
+
+    def _fetch(self, from_block: int, to_block: int) -> list[ClaimEvent]:
+        return fetch_decoded(
+            blockscout_client=self.blockscout_client,
+            address=self.address,
+            event_abi=self.event_abi,
+            from_block=from_block,
+            to_block=to_block,
+            page_size=self.page_size,
+        )
+
+    def _live_tick(self) -> None:
+        self._next_live_at = time.monotonic() + self.poll_interval_s
+        latest: int = self.rpc_client.get_latest_block_number()
+        if latest <= 0:
+            # If we cannot get latest, do a no-op tick to avoid clearing data
+            self._publish(last_sync_time=datetime.datetime.now())
+            return
+        from_block, to_block = live_window(
+            max(self._scanned_to, self._store.last_block), latest, self.confirmation_blocks
+        )
+        baseline = self._store.baseline
+        if baseline is not None:
+            # Blocks covered by an imported snapshot are never refetched
+            from_block = max(from_block, baseline.last_block + 1)
+        added = self._store.merge(self._fetch(from_block, to_block))
+        self._scanned_to = max(self._scanned_to, to_block)
+        if self.event_log is not None:
+            self.event_log.append([pack_event(e) for e in added], cursor=self._scanned_to)
+        self._publish(last_sync_time=datetime.datetime.now())
+
+    def _follow_log(self) -> None:
+        log = self.event_log
+        if log is None:
+            return
+        head = log.head()
+        previous = self._log_head
+        if head == previous:
+            return
+        if previous is None or head.generation != previous.generation:
+            self._store = log.load(decimals=self.decimals)
+        else:
+            self._store.merge_packed(log.rows_since(previous.last_seq))
+        self._log_head = head
+        self._scanned_to = head.cursor or 0
+        self._publish(last_sync_time=datetime.datetime.now())
+
+    def _snapshot(self, *, last_sync_time: datetime.datetime | None, error: str | None = None) -> SyncState:
+        store = self._store
+        return SyncState(
+            store=store,
+            aggregates=store.aggregates(decimals=self.decimals),
+            last_block=store.last_block,
+            version=store.version,
+            last_sync_time=last_sync_time,
+            syncing=self._pending_from_block is not None or bool(self._backfill),
+            live=self._live,
+            error=error,
+            backfill_from=self._backfill[0][1] + 1 if self._backfill else None,
+            progress=self._progress.progress() if self._progress is not None else None,
+        )
+
+    def _publish(self, *, last_sync_time: datetime.datetime | None = None, error: str | None = None) -> None:
+        state = self._snapshot(last_sync_time=last_sync_time or self._state.last_sync_time, error=error)
+        with self._lock:
+            # A step finishing after a reset/import was requested must not show its data
+            if self._pending_replace is None:
+                self._state = state
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Callable
 from typing import Any
 
 import httpx
@@ -97,8 +98,12 @@ class BlockscoutClient:
         to_block: int,
         page_size: int,
         start_page: int = 1,
+        on_page: Callable[[list[dict[str, Any]]], None] | None = None,
     ) -> list[dict[str, Any]]:
-        """Fetch logs with pagination synchronously."""
+        """Fetch logs with pagination synchronously.
+
+        ``on_page`` is called with the new logs of each page as it arrives.
+        """
         page = start_page
         collected: list[dict[str, Any]] = []
         seen: set[tuple[str, int]] = set()
@@ -131,6 +136,8 @@ class BlockscoutClient:
             # If no new items were added, pages likely repeat -> stop to avoid infinite loop
             if added_this_page == 0:
                 break
+            if on_page is not None:
+                on_page(collected[-added_this_page:])
             page += 1
         return collected
 
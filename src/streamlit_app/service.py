@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .config import API_QPS, DATA_DIR, resolve_network_config
+from .core.event_log import SqliteEventLog, event_log_path
+from .core.sync import event_topic0
+from .core.worker import SyncWorker
+from .datasources.blockscout import BlockscoutClient
+from .datasources.rpc import RpcClient
+
+
+def create_worker(
+    *,
+    chain: str,
+    contract_address: str,
+    event_abi: dict[str, Any],
+    data_dir: str = DATA_DIR,
+    read_only: bool = False,
+    rate_limit_qps: float = API_QPS,
+) -> SyncWorker:
+    """Create a sync worker with network clients and, if ``data_dir`` is set, its event log.
+
+    The UI and the headless ``distributor-monitor sync`` command both build their
+    workers here, so they resolve the same log file for the same contract.
+    """
+    network_config = resolve_network_config(chain)
+    blockscout = BlockscoutClient(
+        base_url=network_config["blockscout_api"],
+        api_key=None,
+        rate_limit_qps=rate_limit_qps,
+    )
+    rpc = RpcClient(base_url=network_config["ankr_rpc"])
+    event_log = (
+        SqliteEventLog(
+            event_log_path(data_dir, chain=chain, contract=contract_address, topic0=event_topic0(event_abi))
+        )
+        if data_dir
+        else None
+    )
+    return SyncWorker(
+        blockscout_client=blockscout,
+        rpc_client=rpc,
+        address=contract_address.lower(),
+        event_abi=event_abi,
+        event_log=event_log,
+        read_only=read_only,
+    )
+
+
+# (chain, lowercase contract address, event topic0)
+WorkerKey = tuple[str, str, str]
+
+
+@dataclass
+class _HubEntry:
+    worker: SyncWorker
+    sessions: set[str] = field(default_factory=set)
+    # Sessions that want live sync
+    live: set[str] = field(default_factory=set)
+    # Sync settings last applied through the hub (None until a session configures it)
+    settings: dict[str, Any] | None = None
+    idle_since: float | None = None
+
+
+class SyncHub:
+    """Process-wide sync workers shared by every session watching the same key.
+
+    One :class:`SyncWorker` (and so one store and one set of API calls) exists
+    per ``(chain, contract, topic0)`` key. Sessions :meth:`subscribe` to the key
+    they watch, counted once per session; subscribing to another key moves the
+    subscription. When a worker has no subscribers it is kept for ``idle_ttl``
+    seconds, so a page reload reconnects to the warm store, and then stopped
+    and dropped on the next :meth:`evict_idle`.
+
+    Live sync and sync settings are shared by a worker's sessions, so they go
+    through the hub too: a worker polls while any of its sessions wants live
+    sync (:meth:`set_live`), and its settings change only while the session
+    changing them is the only one watching (:meth:`configure`).
+
+    Workers are built outside the hub lock (loading a large event log takes a
+    while), so other sessions are not blocked; sessions subscribing to a key
+    that is being built wait for that build instead of loading it again.
+    """
+
+    def __init__(self, *, idle_ttl: float = 300.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.idle_ttl: float = idle_ttl
+        self._clock: Callable[[], float] = clock
+        self._lock = threading.Lock()
+        self._entries: dict[WorkerKey, _HubEntry] = {}
+        self._session_keys: dict[str, WorkerKey] = {}
+        self._building: dict[WorkerKey, threading.Event] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def subscribe(self, session_id: str, key: WorkerKey, factory: Callable[[], SyncWorker]) -> SyncWorker:
+        """Return the worker for ``key``, created with ``factory`` if needed, and count ``session_id`` on it."""
+        while True:
+            with self._lock:
+                self._leave(session_id, keep=key)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return self._join(session_id, key, entry)
+                building = self._building.get(key)
+                if building is None:
+                    building = self._building[key] = threading.Event()
+                    break
+            building.wait()
+        try:
+            worker = factory()
+        except BaseException:
+            with self._lock:
+                del self._building[key]
+            building.set()
+            raise
+        with self._lock:
+            del self._building[key]
+            entry = self._entries[key] = _HubEntry(worker=worker)
+            joined = self._join(session_id, key, entry)
+        building.set()
+        return joined
+
+    def _join(self, session_id: str, key: WorkerKey, entry: _HubEntry) -> SyncWorker:
+        entry.sessions.add(session_id)
+        entry.idle_since = None
+        self._session_keys[session_id] = key
+        return entry.worker
+
+    def unsubscribe(self, session_id: str) -> None:
+        with self._lock:
+            self._leave(session_id)
+
+    def _leave(self, session_id: str, keep: WorkerKey | None = None) -> None:
+        key = self._session_keys.get(session_id)
+        if key is None or key == keep:
+            return
+        del self._session_keys[session_id]
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.sessions.discard(session_id)
+            if session_id in entry.live:
+                entry.live.discard(session_id)
+                entry.worker.set_live(bool(entry.live))
+            if not entry.sessions:
+                entry.idle_since = self._clock()
+
+    def set_live(self, session_id: str, live: bool) -> None:
+        """Record whether ``session_id`` wants live sync; its worker polls while any of its sessions does."""
+        with self._lock:
+            entry = self._session_entry(session_id)
+            if entry is None:
+                return
+            if live:
+                entry.live.add(session_id)
+            else:
+                entry.live.discard(session_id)
+            # Re-applied on every call: a reset stops the worker's live sync for all sessions
+            entry.worker.set_live(bool(entry.live))
+
+    def configure(self, session_id: str, **settings: Any) -> bool:
+        """Apply ``session_id``'s sync settings (see :meth:`SyncWorker.configure`) to its worker.
+
+        Returns False, leaving the worker as it is, when the settings differ
+        from those in effect and other sessions watch the same worker.
+        """
+        with self._lock:
+            entry = self._session_entry(session_id)
+            if entry is None or settings == entry.settings:
+                return True
+            if entry.settings is not None and len(entry.sessions) > 1:
+                return False
+            entry.settings = settings
+            entry.worker.configure(**settings)
+            return True
+
+    def _session_entry(self, session_id: str) -> _HubEntry | None:
+        key = self._session_keys.get(session_id)
+        return self._entries.get(key) if key is not None else None
+
+    def subscribers(self, key: WorkerKey) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            return len(entry.sessions) if entry is not None else 0
+
+    def prune(self, is_active: Callable[[str], bool]) -> None:
+        """Drop subscriptions of sessions that ended (Streamlit does not report closed tabs)."""
+        with self._lock:
+            for session_id in [s for s in self._session_keys if not is_active(s)]:
+                self._leave(session_id)
+
+    def evict_idle(self) -> list[WorkerKey]:
+        """Stop and drop workers unwatched for longer than ``idle_ttl``; return their keys."""
+        now = self._clock()
+        with self._lock:
+            expired = [
+                key
+                for key, entry in self._entries.items()
+                if entry.idle_since is not None and now - entry.idle_since >= self.idle_ttl
+            ]
+            workers = [self._entries.pop(key).worker for key in expired]
+        for worker in workers:
+            # Outside the lock: joining a thread mid-request can take a while
+            worker.stop(timeout=5)
+        return expired
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-import io
+import datetime
 from pathlib import Path
 from typing import Any
 
-import pandas as pd
 import streamlit as st
 
-from ..config import API_QPS, NETWORKS, PAGE_SIZE_DEFAULT
+from ..config import API_QPS, DATA_DIR, NETWORKS, PAGE_SIZE_DEFAULT, VIEWER_ONLY
 from ..core.abi import find_all_events, load_abi_from_json
+from ..core.event_store import EventStore
+from ..core.exports import SnapshotError, load_snapshot, zstd_available
+from ..core.verification import (
+    Allowlist,
+    AllowlistError,
+    allowlist_digest,
+    load_allowlist_cached,
+)
 from .state import ensure_session_state
 
 
+@st.cache_resource(max_entries=4, show_spinner="Indexing allowlist...")
+def _allowlist(digest: str, _data: bytes) -> Allowlist:
+    # Shared by all sessions; the binary index under DATA_DIR survives restarts
+    cache_dir = Path(DATA_DIR) / "allowlists" if DATA_DIR else None
+    return load_allowlist_cached(_data, cache_dir=cache_dir, digest=digest)
+
+
 def render_sidebar() -> None:
     app = ensure_session_state(st)
     with st.sidebar:
@@ -54,7 +68,17 @@ def render_sidebar() -> None:
         st.divider()
         st.subheader("Contract")
         app.contract_address = st.text_input("Contract address", value=app.contract_address, placeholder="0x...")
-        start = st.button("Initial Sync (Update)", use_container_width=True, key="btn_initial_sync")
+        if VIEWER_ONLY:
+            st.caption("Read-only viewer: data is synced by `distributor-monitor sync`")
+        start = st.button("Initial Sync (Update)", use_container_width=True, key="btn_initial_sync", disabled=VIEWER_ONLY)
+
+        # .zst is only offered when the optional zstandard package can read it
+        snapshot_file = st.file_uploader(
+            "Warm start from snapshot JSON", type=["json", "gz"] + (["zst"] if zstd_available() else []), key="snapshot_upload"
+        )
+        import_snapshot = st.button(
+            "Import Snapshot", use_container_width=True, key="btn_import_snapshot", disabled=VIEWER_ONLY or snapshot_file is None
+        )
 
         st.subheader("Parameters")
         cols = st.columns(2)
@@ -66,66 +90,96 @@ def render_sidebar() -> None:
             app.confirmation_blocks = st.number_input("Confirmations", min_value=0, step=1, value=app.confirmation_blocks)
             app.rate_limit_qps = st.number_input("API QPS", min_value=0.0, step=0.5, value=float(app.rate_limit_qps or API_QPS))
             app.token_decimals = st.number_input("Token decimals", min_value=0, max_value=30, step=1, value=app.token_decimals)
+        app.backfill_chunk_blocks = st.number_input(
+            "Backfill chunk (blocks)",
+            min_value=0,
+            step=10_000,
+            value=app.backfill_chunk_blocks,
+            help="Initial sync loads history newest-first in chunks of this many blocks (0 = one range)",
+        )
 
         st.divider()
         st.subheader("Verification")
-        st.caption("Upload CSV with address, wave1_bard_wei, wave2_bard_wei columns to verify claims")
-        st.caption("Icons: ✅ = First match, ⚠️ = Duplicate claim, ❌ = Mismatch or not in CSV")
+        st.caption("Upload CSV with an address column and one waveN_..._wei column per wave (e.g. wave1_bard_wei)")
+        st.caption("Icons: ✅ = Claims an unclaimed wave, ⚠️ = Wave already claimed, ⏰ = After the wave deadline, ❌ = Mismatch or not in CSV")
         csv_file = st.file_uploader("Upload verification CSV", type=["csv"], key="csv_upload")
 
-        if csv_file is not None:
+        # Hash an upload once, not on every rerun; identical content is parsed once per process
+        if csv_file is not None and st.session_state.get("allowlist_file_id") != csv_file.file_id:
+            data = csv_file.getvalue()
             try:
-                # Read CSV file
-                csv_content = csv_file.read()
-                df = pd.read_csv(io.StringIO(csv_content.decode('utf-8')))
-
-                # Validate required columns
-                required_cols = ['address', 'wave1_bard_wei', 'wave2_bard_wei']
-                if all(col in df.columns for col in required_cols):
-                    # Process and store verification data
-                    verification_data: dict[str, dict[str, int]] = {}
-                    for _, row in df.iterrows():
-                        addr = str(row['address']).lower()
-                        wave1 = int(row['wave1_bard_wei']) if pd.notna(row['wave1_bard_wei']) else 0
-                        wave2 = int(row['wave2_bard_wei']) if pd.notna(row['wave2_bard_wei']) else 0
-                        verification_data[addr] = {
-                            'wave1_bard_wei': wave1,
-                            'wave2_bard_wei': wave2
-                        }
-
-                    app.verification_data = verification_data
-                    st.success(f"✅ Loaded {len(verification_data)} verification records")
-                else:
-                    st.error(f"❌ CSV must contain columns: {', '.join(required_cols)}")
-                    st.info(f"Found columns: {', '.join(df.columns)}")
-            except Exception as e:
-                st.error(f"❌ Error reading CSV: {str(e)}")
+                allowlist = _allowlist(allowlist_digest(data), data)
+            except AllowlistError as e:
+                st.error(f"❌ {e}")
+            else:
+                app.verification_data = allowlist
+                st.session_state.allowlist_file_id = csv_file.file_id
+                st.success(f"✅ Loaded {len(allowlist)} verification records")
 
         if app.verification_data:
             st.info(f"📊 {len(app.verification_data)} addresses loaded for verification")
             # Show first few addresses for debugging
-            if len(app.verification_data) > 0:
-                sample_addresses = list(app.verification_data.keys())[:3]
-                st.caption(f"Sample addresses: {', '.join(addr[:10] + '...' for addr in sample_addresses)}")
+            sample_addresses = app.verification_data.sample(3)
+            st.caption(f"Sample addresses: {', '.join(addr[:10] + '...' for addr in sample_addresses)}")
+            with st.expander(f"Wave deadlines ({len(app.verification_data.waves)} waves, UTC)"):
+                deadlines: dict[str, int] = {}
+                for wave in app.verification_data.waves:
+                    current = app.wave_deadlines.get(wave)
+                    day = st.date_input(
+                        wave,
+                        value=datetime.datetime.fromtimestamp(current, datetime.UTC).date() if current is not None else None,
+                        key=f"deadline_{wave}",
+                        help="Claims after the end of this day (UTC) are flagged ⏰",
+                    )
+                    if isinstance(day, datetime.date):
+                        end_of_day = datetime.datetime.combine(day, datetime.time.max, tzinfo=datetime.UTC)
+                        deadlines[wave] = int(end_of_day.timestamp())
+                app.wave_deadlines = deadlines
 
         st.divider()
         # Test controls (replace standard live buttons)
         st.caption("Live controls (tests)")
         live_test_cols = st.columns(2)
         with live_test_cols[0]:
-            start_live_test = st.button("Start Live (tests)", use_container_width=True, key="btn_start_live_tests")
+            start_live_test = st.button("Start Live (tests)", use_container_width=True, key="btn_start_live_tests", disabled=VIEWER_ONLY)
         with live_test_cols[1]:
-            stop_live_test = st.button("Stop Live (tests)", use_container_width=True, key="btn_stop_live_tests")
-
-        reset = st.button("Reset", type="secondary", use_container_width=True)
+            stop_live_test = st.button("Stop Live (tests)", use_container_width=True, key="btn_stop_live_tests", disabled=VIEWER_ONLY)
+
+        # The worker and its event log are shared by every session watching this contract
+        st.caption("Reset and Import Snapshot replace the synced history, including the saved copy, for every viewer")
+        confirm_reset = st.checkbox("Confirm reset for all viewers", key="confirm_reset", disabled=VIEWER_ONLY)
+        reset = st.button(
+            "Reset",
+            type="secondary",
+            use_container_width=True,
+            disabled=VIEWER_ONLY or not confirm_reset,
+            # Callbacks run before widgets are created, so the confirmation can be cleared here
+            on_click=lambda: st.session_state.update(confirm_reset=False),
+        )
 
         if reset:
-            app.events = []
+            # Detach from the shared store; the sync worker drops its data on the next run
+            app.store = EventStore(decimals=app.token_decimals)
+            app.events = app.store
+            app.trigger_reset = True
             app.last_block = 0
             app.live_running = False
             app.last_sync_time = None
-            app.verification_data = {}
+            app.verification_data = None
+            st.session_state.pop("allowlist_file_id", None)
 
+        if import_snapshot and snapshot_file is not None:
+            try:
+                snapshot = load_snapshot(snapshot_file.getvalue(), decimals=app.token_decimals)
+            except SnapshotError as e:
+                st.error(f"❌ {e}")
+            else:
+                if snapshot.chain in NETWORKS:
+                    app.chain = snapshot.chain
+                if snapshot.contract:
+                    app.contract_address = snapshot.contract
+                app.pending_snapshot = snapshot.baseline
+                app.trigger_initial_sync = False
         if start:
             app.trigger_initial_sync = True
         if start_live_test:
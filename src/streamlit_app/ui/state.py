@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import datetime
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import Any, cast
 
+from ..core.claims_aggregate import ClaimsBaseline
+from ..core.event_store import EventStore
+from ..core.event_table import EventTable
+from ..core.verification import Allowlist, ClaimVerifier
+
 
 @dataclass
 class AppState:
@@ -14,16 +20,25 @@ class AppState:
     rate_limit_qps: float = 3.0
     poll_interval_ms: int = 5000
     confirmation_blocks: int = 6
+    backfill_chunk_blocks: int = 100_000
     token_decimals: int = 18
     abi_events: list[dict[str, Any]] = field(default_factory=list)
     selected_event_names: list[str] = field(default_factory=list)
-    events: list[dict[str, Any]] = field(default_factory=list)
+    events: Sequence[Mapping[str, Any]] = field(default_factory=list)
+    store: EventStore = field(default_factory=EventStore)
     last_block: int = 0
     live_running: bool = False
     trigger_initial_sync: bool = False
     last_sync_time: datetime.datetime | None = None
     trigger_live_test: bool = False
-    verification_data: dict[str, dict[str, int]] = field(default_factory=dict)
+    verification_data: Allowlist | None = None
+    claim_verifier: ClaimVerifier | None = None
+    event_table: EventTable | None = None
+    # Store size when the events table was last built (live mode counts newer rows)
+    table_rows_shown: int | None = None
+    wave_deadlines: dict[str, int] = field(default_factory=dict)
+    trigger_reset: bool = False
+    pending_snapshot: ClaimsBaseline | None = None
 
 
 def ensure_session_state(st: Any) -> AppState:
@@ -39,7 +54,23 @@ def ensure_session_state(st: Any) -> AppState:
     if not hasattr(app_state, 'trigger_live_test'):
         app_state.trigger_live_test = False
     if not hasattr(app_state, 'verification_data'):
-        app_state.verification_data = {}
+        app_state.verification_data = None
+    if not hasattr(app_state, 'trigger_reset'):
+        app_state.trigger_reset = False
+    if not hasattr(app_state, 'backfill_chunk_blocks'):
+        app_state.backfill_chunk_blocks = 100_000
+    if not hasattr(app_state, 'pending_snapshot'):
+        app_state.pending_snapshot = None
+    if not hasattr(app_state, 'claim_verifier'):
+        app_state.claim_verifier = None
+    if not hasattr(app_state, 'wave_deadlines'):
+        app_state.wave_deadlines = {}
+    if not hasattr(app_state, 'event_table'):
+        app_state.event_table = None
+    if not hasattr(app_state, 'table_rows_shown'):
+        app_state.table_rows_shown = None
+    if not hasattr(app_state, 'store'):
+        app_state.store = EventStore(app_state.events, decimals=app_state.token_decimals)
 
     return app_state
 
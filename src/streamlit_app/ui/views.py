@@ -1,15 +1,35 @@
 from __future__ import annotations
 
 import datetime
-from typing import Any
-
-import altair as alt
-import pandas as pd
+import importlib.util
+import io
+import re
+from collections.abc import Callable
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
 import streamlit as st
 
-from ..core.claims_aggregate import aggregate_claims, build_cumulative_series
-from ..core.exports import build_snapshot, events_to_csv
-from .state import ensure_session_state
+from ..core.event_store import ADDRESS_BYTES, EventStore
+from ..core.event_table import EventPage, EventQuery, EventTable
+from ..core.exports import (
+    COMPRESSION_SUFFIXES,
+    SnapshotCache,
+    write_events_arrow_ipc,
+    write_events_csv,
+    write_events_parquet,
+    zstd_available,
+)
+from ..core.sync import SyncProgress
+from ..core.verification import Check, ClaimVerifier
+from .state import AppState, ensure_session_state
+
+# pandas and altair take ~0.7s to import, so they are loaded by the first frame or
+# chart drawn rather than on startup (an empty app never needs them)
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def _format_last_update_time(last_sync_time: datetime.datetime | None) -> str:
@@ -21,13 +41,369 @@ def _format_last_update_time(last_sync_time: datetime.datetime | None) -> str:
     return last_sync_time.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def render_main() -> None:
+def format_sync_progress(progress: SyncProgress) -> str:
+    """One-line sync status: blocks covered, pages, throughput and ETA."""
+    text = (
+        f"{progress.blocks_covered:,}/{progress.total_blocks:,} blocks ({progress.fraction:.0%})"
+        f" · {progress.pages} pages · {progress.logs:,} logs · {progress.logs_per_s:.1f} logs/s"
+    )
+    eta = progress.eta_s
+    if eta is not None:
+        text += f" · ETA {datetime.timedelta(seconds=round(eta))}"
+    return text
+
+
+_COMPRESSED_MIME: dict[str, str] = {"gzip": "application/gzip", "zstd": "application/zstd"}
+
+
+# Exports are only built when a download button is clicked (Streamlit runs a
+# callable ``data`` on demand) and are cached per store cache key (epoch, event
+# count, last block), so reruns in live mode do not serialize the whole store.
+# Keys are small tuples (the store is an unhashed ``_store`` argument) and the
+# caches are resources, so a hit is a dict lookup that returns the shared
+# object instead of unpickling a copy. Cached values must not be mutated.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _events_csv(key: tuple[int, int, int], compression: str | None, _store: EventStore) -> bytes:
+    buf = io.BytesIO()
+    write_events_csv(_store, buf, compression=compression)
+    return buf.getvalue()
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _events_parquet(key: tuple[int, int, int], _store: EventStore) -> bytes:
+    buf = io.BytesIO()
+    write_events_parquet(_store, buf)
+    return buf.getvalue()
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _events_arrow(key: tuple[int, int, int], _store: EventStore) -> bytes:
+    buf = io.BytesIO()
+    write_events_arrow_ipc(_store, buf)
+    return buf.getvalue()
+
+
+@st.cache_resource(show_spinner=False)
+def _snapshot_cache(chain: str, contract: str) -> SnapshotCache:
+    # Shared by sessions watching the same contract; updated from the claim delta
+    return SnapshotCache(chain=chain, contract=contract)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _snapshot_file(
+    key: tuple[int, int, int], chain: str, contract: str, decimals: int, compression: str | None, _store: EventStore
+) -> bytes:
+    buf = io.BytesIO()
+    _snapshot_cache(chain, contract).write(_store, buf, decimals=decimals, compression=compression)
+    return buf.getvalue()
+
+
+# Derived frames are memoized on the store cache key too, so a rerun without new
+# events reuses them instead of walking the history again
+_CHART_POINTS: int = 5_000
+_WORD_WEIGHTS: npt.NDArray[np.float64] = np.ldexp(1.0, 32 * np.arange(7, -1, -1))
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _cumulative_frame(key: tuple[int, int, int], decimals: int, _store: EventStore) -> pd.DataFrame:
+    """Cumulative claimed amount over time, thinned to at most ``_CHART_POINTS`` points."""
+    import pandas as pd
+
+    columns = _store.packed_columns()
+    timestamps = np.frombuffer(columns.timestamps, dtype=np.int64)
+    # uint256 amounts as float: chart precision, summed from big-endian 32-bit words
+    amounts = np.frombuffer(columns.amounts, dtype=">u4").reshape(-1, 8) @ _WORD_WEIGHTS
+    order = np.argsort(timestamps, kind="stable")
+    cumulative = np.cumsum(amounts[order]) / 10**decimals
+    timestamps = timestamps[order]
+    if len(order) > _CHART_POINTS:
+        # The series is monotonic, so evenly spaced points (last one included) keep its shape
+        keep = np.unique(np.linspace(0, len(order) - 1, _CHART_POINTS).astype(np.intp))
+        timestamps, cumulative = timestamps[keep], cumulative[keep]
+    return pd.DataFrame(
+        {"timestamp": timestamps, "cumulative_adj": cumulative, "datetime": pd.to_datetime(timestamps, unit="s")}
+    )
+
+
+# Icon per Check code; index 0 is unused
+_CHECK_ICONS: npt.NDArray[np.object_] = np.array(["", "✅", "⚠️", "❌", "❌", "⏰"], dtype=object)
+
+_SORT_LABELS: dict[str, str] = {"Block": "block_number", "Amount": "amount_raw", "Claimer": "claimer"}
+_CHECK_FILTERS: dict[str, Check | None] = {
+    "All": None,
+    "✅ First": Check.FIRST,
+    "⚠️ Duplicate": Check.DUPLICATE,
+    "❌ Mismatch": Check.MISMATCH,
+    "❌ Not listed": Check.UNLISTED,
+    "⏰ Late": Check.LATE,
+}
+_PAGE_SIZES: tuple[int, ...] = (100, 500, 1000)
+# Rows in the live "Latest Claims" tail
+LIVE_TAIL_ROWS: int = 50
+# Prefix matches offered by the claimer lookup
+_LOOKUP_MATCHES: int = 20
+# What the events table's claimer filter accepts: an address or a prefix of one
+_HEX_TEXT: re.Pattern[str] = re.compile(r"(0[xX])?[0-9a-fA-F]{0,40}")
+
+
+def _claim_verifier(app: AppState) -> ClaimVerifier | None:
+    """The session's verifier for the current allowlist and deadlines, if an allowlist is loaded."""
+    allowlist = app.verification_data
+    if not allowlist:
+        return None
+    verifier = app.claim_verifier
+    if verifier is None or verifier.allowlist is not allowlist or verifier.deadlines != app.wave_deadlines:
+        verifier = app.claim_verifier = ClaimVerifier(allowlist, deadlines=app.wave_deadlines)
+    return verifier
+
+
+def _event_table(app: AppState, store: EventStore) -> EventTable:
+    table = app.event_table
+    if table is None or table.store is not store:
+        table = app.event_table = EventTable(store)
+    return table
+
+
+def _page_frame(page: EventPage, statuses: npt.NDArray[np.int8] | None, decimals: int) -> pd.DataFrame:
+    """Display frame for one page of events, with check icons from store-order ``statuses``."""
+    import pandas as pd
+
+    df_events = pd.DataFrame(page.columns)
+    df_events["Check"] = _CHECK_ICONS[statuses[page.positions]] if statuses is not None else ""
+    scale = Decimal(10) ** decimals
+    df_events["amount"] = [float(Decimal(x) / scale) for x in df_events["amount_raw"]]
+    df_events["datetime"] = pd.to_datetime(df_events["timestamp"], unit="s")
+    # uint256 amounts and timestamps go out as strings to avoid overflow in Streamlit
+    df_events["amount_raw"] = df_events["amount_raw"].astype(str)
+    df_events["timestamp"] = df_events["timestamp"].astype(str)
+    return df_events[
+        ["Check", "claimer", "amount", "datetime", "tx_hash", "block_number", "log_index", "amount_raw", "timestamp"]
+    ]
+
+
+def _render_latest_claims(app: AppState, store: EventStore) -> None:
+    """Bounded tail of the newest events, redrawn on every live tick.
+
+    Its size is fixed, so a tick costs the same however long the history is;
+    the full table is only rebuilt on demand.
+    """
+    verifier = _claim_verifier(app)
+    with store.lock:
+        statuses = verifier.update(store) if verifier is not None else None
+        page = _event_table(app, store).query(EventQuery(), limit=LIVE_TAIL_ROWS)
+    st.subheader("Latest Claims")
+    st.dataframe(_page_frame(page, statuses, app.token_decimals), use_container_width=True, hide_index=True)
+    shown = app.table_rows_shown
+    if shown is not None and len(store) > shown:
+        st.caption(f"{len(store) - shown} new since the events table below was refreshed")
+
+
+def _render_events_table(app: AppState) -> None:
+    """Render one page of events; sorting and filtering run on the store, not the frame.
+
+    Drawn in its own fragment, outside the live one: live ticks leave it alone,
+    and it is rebuilt on full runs, on its own widget changes, or on refresh.
+    """
+    store = app.store
+    if not len(store):
+        return
+    st.subheader("Events")
+    verifier = _claim_verifier(app)
+    c1, c2, c3, c4, c5 = st.columns([2, 3, 2, 2, 2])
+    sort = _SORT_LABELS[c1.selectbox("Sort by", list(_SORT_LABELS), key="table_sort")]
+    claimer = c2.text_input("Claimer", key="table_claimer", placeholder="0x… address or prefix").strip() or None
+    from_block = c3.number_input("From block", min_value=0, value=None, step=1, key="table_from_block")
+    to_block = c4.number_input("To block", min_value=0, value=None, step=1, key="table_to_block")
+    check = c5.selectbox("Check", list(_CHECK_FILTERS), key="table_check", disabled=verifier is None)
+    c6, c7, c8 = st.columns([2, 2, 6])
+    descending = c6.toggle("Descending", value=True, key="table_descending")
+    page_size = c7.selectbox("Rows per page", _PAGE_SIZES, key="table_page_size")
+    page = int(c8.number_input("Page", min_value=1, value=1, step=1, key="table_page"))
+
+    query = EventQuery(
+        sort=sort,
+        descending=descending,
+        claimer=claimer,
+        from_block=None if from_block is None else int(from_block),
+        to_block=None if to_block is None else int(to_block),
+    )
+    table = _event_table(app, store)
+    with store.lock:
+        statuses = verifier.update(store) if verifier is not None else None
+        code = _CHECK_FILTERS[check]
+        mask = statuses == code if statuses is not None and code is not None else None
+        result = table.query(query, offset=(page - 1) * page_size, limit=page_size, mask=mask)
+        if result.total and not len(result.positions):
+            # Past the last page (e.g. after narrowing a filter): show the last one
+            page = (result.total - 1) // page_size + 1
+            result = table.query(query, offset=(page - 1) * page_size, limit=page_size, mask=mask)
+        app.table_rows_shown = len(store)
+
+    if claimer is not None and not result.total and not _HEX_TEXT.fullmatch(claimer):
+        st.caption("Enter a claimer address or a hex prefix of one (0x optional)")
+    st.dataframe(_page_frame(result, statuses, app.token_decimals), use_container_width=True, hide_index=True)
+    first = (page - 1) * page_size
+    c9, c10 = st.columns([8, 2])
+    c9.caption(f"Rows {first + 1 if result.total else 0}–{first + len(result.positions)} of {result.total}")
+    # Any widget change reruns just this fragment, picking up events added since
+    c10.button("🔄 Refresh table", key="table_refresh")
+
+
+def _render_claimer_lookup(app: AppState) -> None:
+    """Answer "did this address claim, when and how much" from the store's claimer index."""
+    store = app.store
+    if not len(store):
+        return
+    st.subheader("Claimer Lookup")
+    text = st.text_input("Address or prefix", key="lookup_address", placeholder="0x...").strip().lower()
+    if not text:
+        return
+    address: str | None = text if len(text.removeprefix("0x")) == 2 * ADDRESS_BYTES else None
+    if address is None:
+        matches = store.find_claimers(text, limit=_LOOKUP_MATCHES)
+        if not matches:
+            st.caption("No claimer starts with that prefix")
+            return
+        address = st.selectbox("Matching claimers", matches, key="lookup_match")
+    if address is None:
+        return
+    address = "0x" + address.removeprefix("0x")
+
+    verifier = _claim_verifier(app)
+    with store.lock:
+        positions = store.claimer_positions(address)
+        page = EventPage(
+            columns=store.columns_at(positions), positions=np.array(positions, dtype=np.intp), total=len(positions)
+        )
+        statuses = verifier.update(store) if verifier is not None and positions else None
+    expected = app.verification_data.expected(address) if app.verification_data else None
+    if expected is not None:
+        listed = ", ".join(f"{wave}: {_format_wei(wei, app.token_decimals)}" for wave, wei in expected.items())
+        st.caption(f"Allowlist: {listed}")
+    if not positions:
+        st.info(f"{address} has not claimed")
+        return
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Claims", len(positions))
+    c2.metric("Total Claimed", _format_wei(sum(page.columns["amount_raw"]), app.token_decimals))
+    # UTC, like the table's datetime column
+    last_claim = datetime.datetime.fromtimestamp(page.columns["timestamp"][-1], datetime.UTC)
+    c3.metric("Last Claim", f"{last_claim:%Y-%m-%d %H:%M:%S}")
+    st.dataframe(_page_frame(page, statuses, app.token_decimals), use_container_width=True, hide_index=True)
+
+
+def _format_wei(wei: int, decimals: int) -> str:
+    return f"{Decimal(wei) / (Decimal(10) ** decimals):f}".rstrip("0").rstrip(".") if wei else "0"
+
+
+def render_reconciliation(app: AppState, store: EventStore) -> None:
+    """Per-wave claimed/unclaimed counts and outstanding liability against the allowlist."""
+    import pandas as pd
+
+    verifier = _claim_verifier(app)
+    if verifier is None:
+        return
+    # Verifies only events added since the last render
+    verifier.update(store)
+    reconciliation = verifier.reconciliation
+    st.subheader("Reconciliation")
+    c1, c2 = st.columns(2)
+    c1.metric("Addresses Claimed", f"{reconciliation.claimed_addresses} / {reconciliation.listed_addresses}")
+    summary = reconciliation.summary()
+    c2.metric("Outstanding", _format_wei(sum(w.outstanding_wei for w in summary), app.token_decimals))
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "wave": w.wave,
+                    "listed": w.listed,
+                    "claimed": w.claimed,
+                    "unclaimed": w.unclaimed,
+                    "claimed_amount": _format_wei(w.claimed_wei, app.token_decimals),
+                    "outstanding_amount": _format_wei(w.outstanding_wei, app.token_decimals),
+                }
+                for w in summary
+            ]
+        ),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    def unclaimed_csv() -> bytes:
+        buf = io.BytesIO()
+        reconciliation.write_csv(buf)
+        return buf.getvalue()
+
+    st.download_button("Export Unclaimed CSV", data=unclaimed_csv, file_name="unclaimed.csv", mime="text/csv")
+
+
+def render_main(*, on_tick: Callable[[AppState], None] | None = None, run_every: float | None = None) -> None:
+    """Render the main content.
+
+    Metrics, chart and reconciliation are drawn by a fragment. With
+    ``run_every`` Streamlit reruns only that fragment on each tick, after
+    ``on_tick`` has pulled the latest sync state into the session, and it also
+    shows a bounded tail of the newest claims. The full events table and the
+    claimer lookup are separate fragments rebuilt on demand; exports are drawn
+    once per full run.
+    """
+    st.fragment(_render_live, run_every=run_every)(on_tick, run_every is not None)
+    st.fragment(_render_events_table)(ensure_session_state(st))
+    st.fragment(_render_claimer_lookup)(ensure_session_state(st))
+
     app = ensure_session_state(st)
-    events: list[dict[str, Any]] = app.events
+    store = app.store
+    token_decimals = app.token_decimals
+    if len(store):
+        # Keys are read on click, so exports include events added by later ticks
+        # gzip is always available; zstd needs the optional zstandard package
+        compressions = ["none", "gzip"] + (["zstd"] if zstd_available() else [])
+        choice = st.selectbox("Export compression (CSV/JSON)", compressions, key="export_compression")
+        compression = None if choice == "none" else choice
+        suffix = COMPRESSION_SUFFIXES.get(choice, "")
+        cexp1, cexp2, cexp3, cexp4 = st.columns(4)
+        with cexp1:
+            st.download_button(
+                "Export CSV",
+                data=lambda: _events_csv(store.cache_key, compression, store),
+                file_name=f"events.csv{suffix}",
+                mime=_COMPRESSED_MIME.get(choice, "text/csv"),
+            )
+        with cexp2:
+            chain, contract = app.chain, app.contract_address
+            st.download_button(
+                "Export Snapshot JSON",
+                data=lambda: _snapshot_file(store.cache_key, chain, contract, token_decimals, compression, store),
+                file_name=f"snapshot.json{suffix}",
+                mime=_COMPRESSED_MIME.get(choice, "application/json"),
+            )
+        # Columnar exports need the optional pyarrow dependency
+        if importlib.util.find_spec("pyarrow") is not None:
+            with cexp3:
+                st.download_button(
+                    "Export Parquet",
+                    data=lambda: _events_parquet(store.cache_key, store),
+                    file_name="events.parquet",
+                    mime="application/vnd.apache.parquet",
+                )
+            with cexp4:
+                st.download_button(
+                    "Export Arrow IPC",
+                    data=lambda: _events_arrow(store.cache_key, store),
+                    file_name="events.arrow",
+                    mime="application/vnd.apache.arrow.file",
+                )
+
+
+def _render_live(on_tick: Callable[[AppState], None] | None, live: bool) -> None:
+    app = ensure_session_state(st)
+    if on_tick is not None:
+        on_tick(app)
+    store = app.store
 
     # Use user-configured token decimals
     token_decimals = app.token_decimals
-    agg = aggregate_claims(events, decimals=token_decimals)
+    agg = store.aggregates(decimals=token_decimals)
 
     c1, c2, c3, c4 = st.columns(4)
     # Format the total claimed to show reasonable number of decimal places
@@ -58,14 +434,10 @@ def render_main() -> None:
         st.info("🔄 **Last Updated:** Never")
 
     # Cumulative chart
-    series = build_cumulative_series(events, decimals=token_decimals)
-    if series:
-        df = pd.DataFrame(series, columns=["timestamp", "cumulative_adj"])
-        # Convert timestamp to datetime for better chart display
-        df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
-        # Convert Decimal to float for Altair compatibility
-        df['cumulative_adj'] = df['cumulative_adj'].astype(float)
+    if len(store):
+        import altair as alt
 
+        df = _cumulative_frame(store.cache_key, token_decimals, store)
         chart = (
             alt.Chart(df)
             .mark_line()
@@ -77,86 +449,7 @@ def render_main() -> None:
         )
         st.altair_chart(chart, use_container_width=True)
 
-    if events:
-        df_events = pd.DataFrame(events)
-        df_events = df_events.sort_values(["timestamp", "block_number", "log_index"], ascending=True)
-
-        # Add converted amount column BEFORE converting to strings
-        if 'amount_raw' in df_events.columns:
-            from decimal import Decimal
-            df_events['amount'] = df_events['amount_raw'].apply(
-                lambda x: float(Decimal(x) / (Decimal(10) ** token_decimals)) if x else 0
-            )
-
-        # Add verification check column with duplicate detection
-        claim_count_by_address: dict[str, int] = {}
-
-        def check_verification(row: Any) -> str:
-            if not app.verification_data:
-                return ""
-
-            claimer = str(row.get('claimer', '')).lower()
-            amount_raw = int(row.get('amount_raw', 0))
-
-            # Debug: Show what we're checking
-            # st.write(f"Debug: Checking {claimer} with amount {amount_raw}")
-            # st.write(f"Debug: Available addresses: {list(app.verification_data.keys())[:3]}...")
-
-            if claimer in app.verification_data:
-                expected_wave1 = app.verification_data[claimer]['wave1_bard_wei']
-                expected_wave2 = app.verification_data[claimer]['wave2_bard_wei']
-
-                # Check if amount matches either wave1 or wave2
-                if amount_raw == expected_wave1 or amount_raw == expected_wave2:
-                    # Track how many times this address has matched
-                    claim_count_by_address[claimer] = claim_count_by_address.get(claimer, 0) + 1
-
-                    if claim_count_by_address[claimer] == 1:
-                        return "✅"  # First match
-                    else:
-                        return "⚠️"  # Duplicate match (suspicious)
-                else:
-                    return "❌"  # Amount doesn't match
-            else:
-                # Address not in verification data - show cross
-                return "❌"  # Not in verification CSV
-
-        df_events['Check'] = df_events.apply(check_verification, axis=1)
-
-        # Convert timestamp to readable datetime BEFORE converting to strings
-        if 'timestamp' in df_events.columns:
-            df_events['datetime'] = pd.to_datetime(df_events['timestamp'], unit='s')
-
-        # Convert large integers to strings to avoid overflow in Streamlit
-        for col in df_events.columns:
-            if col in ['amount_raw', 'timestamp']:  # Keep these as strings to avoid overflow
-                df_events[col] = df_events[col].astype(str)
-            elif df_events[col].dtype in ['int64', 'object']:
-                # Check if column contains large integers
-                try:
-                    max_val = df_events[col].max()
-                    if isinstance(max_val, int) and abs(max_val) > 2**53:  # JavaScript safe integer limit
-                        df_events[col] = df_events[col].astype(str)
-                except (TypeError, ValueError):
-                    pass
-
-        # Reorder columns to show converted values first
-        cols = list(df_events.columns)
-        if 'amount' in cols and 'datetime' in cols:
-            # Put converted columns first, including Check column
-            priority_cols = ['Check', 'claimer', 'amount', 'datetime', 'tx_hash', 'block_number', 'log_index']
-            ordered_cols = [col for col in priority_cols if col in cols]
-            remaining_cols = [col for col in cols if col not in ordered_cols]
-            df_events = df_events[ordered_cols + remaining_cols]
-
-        st.dataframe(df_events, use_container_width=True, hide_index=True)
-
-        cexp1, cexp2 = st.columns(2)
-        with cexp1:
-            csv_text = events_to_csv(events)
-            st.download_button("Export CSV", data=csv_text, file_name="events.csv", mime="text/csv")
-        with cexp2:
-            snapshot = build_snapshot(chain=app.chain, contract=app.contract_address, events=events, decimals=token_decimals)
-            st.download_button("Export Snapshot JSON", data=pd.Series(snapshot).to_json(), file_name="snapshot.json", mime="application/json")
-
+    if live and len(store):
+        _render_latest_claims(app, store)
 
+    render_reconciliation(app, store)
@@ -1,12 +1,48 @@
 from __future__ import annotations
 
 import importlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+# Seconds ``import streamlit_app.app`` may take on top of streamlit and numpy,
+# which every run needs anyway; override on slow machines
+IMPORT_BUDGET_S = float(os.getenv("IMPORT_BUDGET_S", "0.5"))
+# Loaded by the features that need them (frames, charts, CSV parsing, log decoding)
+LAZY_MODULES = ("pandas", "altair", "eth_abi", "eth_utils", "pyarrow")
+
+_PROBE = """
+import json, sys, time
+import numpy, streamlit
+start = time.perf_counter()
+import streamlit_app.app
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in sys.argv[1:] if m in sys.modules]}))
+"""
+
 
 def test_app_imports_without_errors() -> None:
     pytest.importorskip("streamlit")
     module = importlib.import_module("streamlit_app.app")
     assert hasattr(module, "main")
 
+
+def test_app_import_stays_within_startup_budget() -> None:
+    pytest.importorskip("streamlit")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(SRC_DIR), os.environ.get("PYTHONPATH", "")])}
+    runs = []
+    for _ in range(3):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, *LAZY_MODULES], env=env, capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(out.stdout.splitlines()[-1]))
+
+    assert runs[0]["loaded"] == []
+    # Best of three, so a busy machine does not fail the budget on its own
+    elapsed = min(run["elapsed"] for run in runs)
+    assert elapsed < IMPORT_BUDGET_S, f"import streamlit_app.app took {elapsed:.2f}s (budget {IMPORT_BUDGET_S}s)"
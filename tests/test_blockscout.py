@@ -39,15 +39,18 @@ def test_blockscout_pagination_mocked() -> None:
     # Monkeypatch the internal page fetcher
     client._get_logs_page = Mock(side_effect=[page1, page2, []])  # type: ignore[attr-defined]
 
+    pages: list[list[dict[str, Any]]] = []
     logs = client.fetch_logs_paginated(
         address="0x1111111111111111111111111111111111111111",
         topic0="0xabc",
         from_block=0,
         to_block=100,
         page_size=1,
+        on_page=pages.append,
     )
 
     assert [log_item["transactionHash"] for log_item in logs] == ["0x11", "0x12"]
+    assert pages == [page1, page2]
 
 
 def test_blockscout_normalizes_hex_fields() -> None:
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import eth_abi
+import pytest
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+
+from streamlit_app import cli
+from streamlit_app.core.decode import decode_logs
+from streamlit_app.core.event_log import SqliteEventLog, event_log_path
+from streamlit_app.core.event_store import EventStore
+from streamlit_app.core.exports import events_to_csv, read_snapshot
+from streamlit_app.core.worker import SyncWorker
+
+CLAIM_ABI: dict[str, Any] = {
+    "type": "event",
+    "name": "Claim",
+    "inputs": [
+        {"name": "account", "type": "address", "indexed": False},
+        {"name": "amount", "type": "uint256", "indexed": False},
+    ],
+    "anonymous": False,
+}
+
+
+def _mk_log(block: int) -> dict[str, Any]:
+    claimer = to_checksum_address("0x000000000000000000000000000000000000dEaD")
+    return {
+        "topics": ["0x" + event_abi_to_log_topic(CLAIM_ABI).hex()],
+        "data": "0x" + eth_abi.encode(["address", "uint256"], [claimer, 10**6]).hex(),
+        "blockNumber": block,
+        "transactionHash": f"0x{block:064x}",
+        "logIndex": 0,
+        "timeStamp": 1_700_000_000 + block,
+    }
+
+
+def test_select_event_abi_prefers_named_then_claim_like() -> None:
+    abi: list[dict[str, Any]] = [{"type": "event", "name": "Transfer", "inputs": []}, CLAIM_ABI]
+    assert cli.select_event_abi(abi, None)["name"] == "Claim"
+    assert cli.select_event_abi(abi, "Transfer")["name"] == "Transfer"
+    with pytest.raises(ValueError):
+        cli.select_event_abi(abi, "Missing")
+
+
+def test_sync_once_writes_log_that_a_read_only_worker_follows(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    abi_path = tmp_path / "abi.json"
+    abi_path.write_text(json.dumps([CLAIM_ABI]))
+    log = SqliteEventLog(tmp_path / "events.sqlite")
+    blockscout = Mock()
+    blockscout.fetch_logs_paginated = Mock(side_effect=[[_mk_log(100)], [_mk_log(995)]])
+    rpc = Mock()
+    rpc.get_latest_block_number = Mock(return_value=1000)
+
+    def fake_create_worker(**kwargs: Any) -> SyncWorker:
+        return SyncWorker(
+            blockscout_client=blockscout,
+            rpc_client=rpc,
+            address=kwargs["contract_address"],
+            event_abi=kwargs["event_abi"],
+            event_log=log,
+        )
+
+    monkeypatch.setattr(cli, "create_worker", fake_create_worker)
+    viewer = SyncWorker(blockscout_client=None, rpc_client=None, address="0x22", event_abi=CLAIM_ABI, event_log=log, read_only=True)
+    args = cli.build_parser().parse_args(
+        ["sync", "--contract", "0x22", "--abi", str(abi_path), "--confirmations", "0", "--once", "--data-dir", str(tmp_path)]
+    )
+
+    # Empty log: runs initial sync
+    assert cli.run_sync(args, threading.Event()) == 0
+    assert log.head().cursor == 1000
+    assert len(viewer.run_once().store) == 1
+
+    # Log has data: one live tick from the stored cursor
+    assert cli.run_sync(args, threading.Event()) == 0
+    assert blockscout.fetch_logs_paginated.call_args.kwargs["from_block"] == 1000
+    state = viewer.run_once()
+    assert [e["block_number"] for e in state.store] == [100, 995]
+    # Nothing new in the log: the viewer keeps its published state
+    assert viewer.run_once() is state
+    with pytest.raises(RuntimeError):
+        viewer.request_initial_sync(0)
+
+
+def test_export_streams_compressed_files_from_the_log(tmp_path: Path) -> None:
+    abi_path = tmp_path / "abi.json"
+    abi_path.write_text(json.dumps([CLAIM_ABI]))
+    path = event_log_path(tmp_path, chain="sepolia", contract="0x22", topic0="0x" + event_abi_to_log_topic(CLAIM_ABI).hex())
+    store = EventStore(decode_logs([CLAIM_ABI], [_mk_log(100), _mk_log(200)]), decimals=6)
+    SqliteEventLog(path).replace(store.packed_rows(), cursor=300)
+
+    args = cli.build_parser().parse_args(
+        ["export", "--contract", "0x22", "--abi", str(abi_path), "--decimals", "6", "--data-dir", str(tmp_path)]
+        + ["--events", str(tmp_path / "events.csv.gz"), "--snapshot", str(tmp_path / "snapshot.json.gz")]
+    )
+    assert cli.run_export(args) == 0
+
+    assert gzip.decompress((tmp_path / "events.csv.gz").read_bytes()).decode() == events_to_csv(store)
+    snapshot = read_snapshot(tmp_path / "snapshot.json.gz", decimals=18)
+    assert snapshot.baseline.claims_count == 2
+    assert snapshot.baseline.claimed_raw == {"0x000000000000000000000000000000000000dead": 2 * 10**6}
+
+    # Without the optional codec a .zst export fails with the install hint instead of a traceback
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, "zstandard", None)
+        args.events, args.snapshot = tmp_path / "events.csv.zst", None
+        assert cli.run_export(args) == 1
+        assert not (tmp_path / "events.csv.zst").exists()
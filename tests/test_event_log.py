@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+from streamlit_app.core.claims_aggregate import ClaimsBaseline
+from streamlit_app.core.event_log import SqliteEventLog, event_log_path
+from streamlit_app.core.event_store import EventStore, pack_event
+from streamlit_app.core.worker import SyncWorker
+
+CLAIMER = "0x" + "ab" * 20
+
+
+def _mk_evt(block: int, idx: int = 0, amount_raw: int = 1_000_000) -> dict[str, Any]:
+    return {
+        "claimer": CLAIMER,
+        "amount_raw": amount_raw,
+        "tx_hash": f"0x{block:064x}",
+        "block_number": block,
+        "log_index": idx,
+        "timestamp": 1_700_000_000 + block,
+    }
+
+
+def test_event_log_round_trips_store_and_cursor(tmp_path: Path) -> None:
+    log = SqliteEventLog(tmp_path / "events.sqlite")
+    assert log.cursor() is None
+    assert len(log.load(decimals=6)) == 0
+
+    store = EventStore([_mk_evt(10), _mk_evt(12, amount_raw=2**255)], decimals=6)
+    log.replace(store.packed_rows(), cursor=20)
+    # Appends are idempotent and may arrive out of chain order
+    log.append([pack_event(_mk_evt(11, 2)), pack_event(_mk_evt(12, amount_raw=2**255))], cursor=30)
+
+    loaded = SqliteEventLog(tmp_path / "events.sqlite").load(decimals=6)
+    assert [e["block_number"] for e in loaded] == [10, 11, 12]
+    assert loaded[-1]["amount_raw"] == 2**255
+    assert loaded.aggregates(decimals=6).claims_count == 3
+    assert log.cursor() == 30
+
+    log.replace([], cursor=5)
+    assert len(log.load(decimals=6)) == 0
+    log.clear()
+    assert log.cursor() is None
+
+
+def test_event_log_moves_a_reorged_log_instead_of_appending_it(tmp_path: Path) -> None:
+    log = SqliteEventLog(tmp_path / "events.sqlite")
+    log.append([pack_event(_mk_evt(90)), pack_event({**_mk_evt(100, amount_raw=10), "tx_hash": "0x" + "cd" * 32})], cursor=100)
+    head = log.head()
+
+    moved = pack_event({**_mk_evt(101, amount_raw=10), "tx_hash": "0x" + "cd" * 32})
+    log.append([moved, pack_event(_mk_evt(90))], cursor=110)
+    # Followers see the move as a new row and move it in their store too
+    assert log.rows_since(head.last_seq) == [moved]
+    loaded = log.load(decimals=6)
+    assert [e["block_number"] for e in loaded] == [90, 101]
+    assert loaded.aggregates(decimals=6).total_claimed_raw == 1_000_010
+
+    # Logs written under the old (block_number, log_index, tx_hash) key keep the latest copy
+    with sqlite3.connect(log.path) as conn:
+        conn.execute("DROP INDEX events_log_key")
+        conn.execute(
+            "INSERT INTO events (block_number, log_index, timestamp, claimer, amount, tx_hash) VALUES (102, 0, 0, ?, ?, ?)",
+            (moved.claimer, moved.amount, moved.tx_hash),
+        )
+    conn.close()
+    assert [e["block_number"] for e in SqliteEventLog(log.path).load(decimals=6)] == [90, 102]
+
+
+def test_event_log_path_is_keyed_by_chain_contract_and_topic(tmp_path: Path) -> None:
+    path = event_log_path(tmp_path, chain="mainnet", contract="0xABC", topic0="0xDEF")
+    assert path == tmp_path / "mainnet_0xabc_def.sqlite"
+
+
+def _mk_worker(log: SqliteEventLog) -> tuple[SyncWorker, Mock]:
+    blockscout = Mock()
+    blockscout.fetch_logs_paginated = Mock(return_value=[])
+    rpc = Mock()
+    rpc.get_latest_block_number = Mock(return_value=1000)
+    worker = SyncWorker(
+        blockscout_client=blockscout,
+        rpc_client=rpc,
+        address="0x2222222222222222222222222222222222222222",
+        event_abi={"type": "event", "name": "Claim", "inputs": [], "anonymous": False},
+        decimals=6,
+        confirmation_blocks=5,
+        event_log=log,
+    )
+    return worker, blockscout
+
+
+def test_worker_warm_starts_from_event_log(tmp_path: Path) -> None:
+    log = SqliteEventLog(tmp_path / "events.sqlite")
+    log.replace(EventStore([_mk_evt(100), _mk_evt(200)]).packed_rows(), cursor=500)
+
+    worker, blockscout = _mk_worker(log)
+    # Persisted events are available before any API call
+    assert worker.state.aggregates.claims_count == 2
+    assert worker.state.last_block == 200
+
+    # Live sync resumes from the persisted cursor (minus the reorg margin)
+    worker._live = True
+    worker.run_once()
+    assert blockscout.fetch_logs_paginated.call_args.kwargs["from_block"] == 495
+    assert log.cursor() == 995
+
+    worker.reset()
+    assert log.cursor() is None
+    assert len(log.load(decimals=6)) == 0
+
+
+def test_worker_imports_snapshot_and_resumes_after_its_block(tmp_path: Path) -> None:
+    log = SqliteEventLog(tmp_path / "events.sqlite")
+    worker, blockscout = _mk_worker(log)
+    baseline = ClaimsBaseline(last_block=993, claimed_raw={CLAIMER: 7_000_000}, claims_count=3)
+
+    worker.import_snapshot(baseline)
+    state = worker.state
+    assert state.aggregates.claims_count == 3
+    assert state.aggregates.total_claimed_raw == 7_000_000
+    assert state.last_block == 993
+    blockscout.fetch_logs_paginated.assert_not_called()
+
+    worker._live = True
+    worker.run_once()
+    assert blockscout.fetch_logs_paginated.call_args.kwargs["from_block"] == 994
+
+    # The baseline survives a restart through the event log
+    restored, _ = _mk_worker(log)
+    assert restored.state.aggregates.total_claimed_raw == 7_000_000
+    assert restored.state.store.baseline == baseline
+
+
+def test_interrupted_backfill_resumes_from_event_log(tmp_path: Path) -> None:
+    log = SqliteEventLog(tmp_path / "events.sqlite")
+    worker, _ = _mk_worker(log)
+    worker.configure(backfill_chunk_blocks=400)
+    worker._pending_from_block = 0
+    worker.run_once()
+    assert log.backfill() == (0, 600)
+
+    # The pending range is re-split with the new worker's chunk size (default: one chunk)
+    restarted, blockscout = _mk_worker(log)
+    assert restarted.state.syncing
+    assert restarted.state.backfill_from == 601
+    restarted.run_once()
+    assert blockscout.fetch_logs_paginated.call_args.kwargs["from_block"] == 0
+    assert log.backfill() is None
+    assert not restarted.state.syncing
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from streamlit_app.core.claims_aggregate import ClaimsBaseline
+from streamlit_app.core.decode import ClaimEvent
+from streamlit_app.core.event_store import EventStore
+
+CLAIMER_A = "0x" + "aa" * 20
+CLAIMER_B = "0x" + "bb" * 20
+
+
+def _mk_evt(block: int, idx: int, claimer: str = CLAIMER_A, amount_raw: int = 1_000_000) -> dict[str, Any]:
+    return {
+        "claimer": claimer,
+        "amount_raw": amount_raw,
+        "tx_hash": f"0x{block:064x}",
+        "block_number": block,
+        "log_index": idx,
+        "timestamp": 1_700_000_000 + block,
+    }
+
+
+def test_merge_is_idempotent_and_keeps_chain_order() -> None:
+    store = EventStore([_mk_evt(10, 0), _mk_evt(12, 0)], decimals=6)
+    version = store.version
+
+    added = store.merge([_mk_evt(12, 0), _mk_evt(11, 1), _mk_evt(13, 0)])
+
+    assert [(e["block_number"], e["log_index"]) for e in added] == [(11, 1), (13, 0)]
+    assert [e["block_number"] for e in store] == [10, 11, 12, 13]
+    assert store.last_block == 13
+    assert store.version != version
+    version = store.version
+
+    # Re-merging the same batch adds nothing and leaves the version unchanged
+    assert store.merge([_mk_evt(11, 1), _mk_evt(13, 0)]) == []
+    assert store.version == version
+
+
+def test_reorged_log_is_moved_not_counted_twice() -> None:
+    tx_hash = "0x" + "cd" * 32
+    store = EventStore([_mk_evt(90, 0, CLAIMER_B), {**_mk_evt(100, 0, amount_raw=10), "tx_hash": tx_hash}])
+    epoch = store.epoch
+
+    # The confirmation overlap refetches the log after a reorg moved its tx one block later
+    moved = {**_mk_evt(101, 0, amount_raw=10), "tx_hash": tx_hash}
+    assert store.merge([moved]) == [moved]
+    assert [(e["block_number"], e["tx_hash"]) for e in store] == [(90, _mk_evt(90, 0)["tx_hash"]), (101, tx_hash)]
+    agg = store.aggregates(decimals=6)
+    assert (agg.total_claimed_raw, agg.claims_count, agg.unique_claimers) == (1_000_010, 2, 2)
+    assert [e["block_number"] for e in store.get_claimer_history(CLAIMER_A)] == [101]
+    assert store.epoch != epoch
+    assert store.merge([moved]) == []
+
+    # A loaded store has the same dedup keys
+    loaded = EventStore.from_packed(store.packed_rows(), decimals=6)
+    assert loaded.merge([moved, _mk_evt(90, 0, CLAIMER_B)]) == []
+    assert loaded.merge([{**moved, "block_number": 102}]) != [] and len(loaded) == 2
+
+
+def test_running_aggregates_match_full_recompute() -> None:
+    store = EventStore(decimals=6)
+    store.merge([_mk_evt(1, 0, CLAIMER_A), _mk_evt(2, 0, CLAIMER_B, 2_000_000)])
+    store.merge([_mk_evt(2, 0, CLAIMER_B, 2_000_000), _mk_evt(3, 0, CLAIMER_A.upper().replace("0X", "0x"), 500_000)])
+
+    agg = store.aggregates(decimals=6)
+    assert agg.total_claimed_raw == 3_500_000
+    assert agg.claims_count == 3
+    assert agg.unique_claimers == 2
+    assert agg.distribution_by_address == {CLAIMER_A: Decimal("1.5"), CLAIMER_B: Decimal("2")}
+
+    # Other decimals are an exact rescale that keeps the epoch (and the caches keyed on it)
+    epoch = store.epoch
+    rescaled = store.aggregates(decimals=5)
+    assert rescaled.total_claimed_adj == Decimal("35")
+    assert rescaled.distribution_by_address == {CLAIMER_A: Decimal("15"), CLAIMER_B: Decimal("20")}
+    assert store.aggregates(decimals=5) is rescaled
+    assert store.aggregates(decimals=6) is not rescaled and store.epoch == epoch
+
+    # A new event rescales only its claimer's total; the other entries are kept as they are
+    untouched = rescaled.distribution_by_address[CLAIMER_B]
+    store.merge([_mk_evt(4, 0, CLAIMER_A, 1_000_000)])
+    updated = store.aggregates(decimals=5)
+    assert updated.distribution_by_address == {CLAIMER_A: Decimal("25"), CLAIMER_B: Decimal("20")}
+    assert updated.distribution_by_address[CLAIMER_B] is untouched
+    assert (updated.total_claimed_adj, updated.claims_count) == (Decimal("45"), 4)
+
+
+def test_backfill_pages_are_spliced_in_without_per_row_inserts(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = EventStore([_mk_evt(b, 0) for b in range(1000, 1100)])
+
+    def per_row(*_args: Any) -> None:
+        raise AssertionError("page took the per-row insert path")
+
+    monkeypatch.setattr(store, "_insert", per_row)
+    # One older chunk arriving as ascending pages: pages 2..k land between page 1 and the history
+    for page in range(5):
+        added = store.merge([_mk_evt(b, i) for b in range(500 + page * 20, 520 + page * 20) for i in (1, 0)])
+        assert len(added) == 40
+    # A re-sent page and an in-batch duplicate are deduplicated on the same path
+    assert store.merge([_mk_evt(600, 0), _mk_evt(600, 0)]) == [_mk_evt(600, 0)]
+    assert store.merge([_mk_evt(510, 0), _mk_evt(511, 0)]) == []
+
+    keys = [(e["block_number"], e["log_index"]) for e in store]
+    assert keys == sorted(keys) and len(keys) == 301
+    assert store.aggregates(decimals=6).claims_count == 301
+    assert len(store.get_claimer_history(CLAIMER_A)) == 301
+
+
+def test_events_from_block_and_clear() -> None:
+    store = EventStore([_mk_evt(b, 0) for b in (5, 7, 9)])
+    assert [e["block_number"] for e in store.events_from_block(7)] == [7, 9]
+    assert store.events_from_block(10) == []
+
+    store.clear()
+    assert len(store) == 0
+    assert store.last_block == 0
+    assert store.merge([_mk_evt(5, 0)]) != []
+
+
+def test_rows_round_trip_from_packed_columns() -> None:
+    big_amount = 2**255 + 12345
+    evt = _mk_evt(42, 3, CLAIMER_B, big_amount)
+    store = EventStore([evt])
+
+    row = store[0]
+    assert isinstance(row, ClaimEvent)
+    assert row == evt
+    assert dict(row) == evt
+    assert store[-1:] == [row]
+    assert store.to_columns()["amount_raw"] == [big_amount]
+    # Packed columns only: block/log/timestamp (8 bytes each) + claimer, amount, tx hash
+    assert store.nbytes == 3 * 8 + 20 + 32 + 32
+
+
+def test_bulk_load_streams_rows_and_sums_totals_per_claimer() -> None:
+    amounts = [2**256 - 1, 2**256 - 1, 65_535, 1, 2**128, 0, 7]
+    events = [_mk_evt(10 + i, i % 2, CLAIMER_A if i % 3 else CLAIMER_B, a) for i, a in enumerate(amounts)]
+    merged = EventStore(events, decimals=6)
+    baseline = ClaimsBaseline(last_block=5, claimed_raw={CLAIMER_B: 3}, claims_count=2)
+
+    # A one-shot iterator read in chunks smaller than the input, as from a database cursor
+    loaded = EventStore.from_packed(iter(merged.packed_rows()), decimals=6, baseline=baseline, chunk_rows=3)
+    assert loaded.to_columns() == merged.to_columns()
+    agg, expected = loaded.aggregates(decimals=6), merged.aggregates(decimals=6)
+    assert agg.total_claimed_raw == expected.total_claimed_raw + 3
+    assert agg.claims_count == 9
+    assert agg.distribution_by_address == {
+        CLAIMER_A: expected.distribution_by_address[CLAIMER_A],
+        CLAIMER_B: expected.distribution_by_address[CLAIMER_B] + Decimal("0.000003"),
+    }
+
+
+def test_claim_event_is_a_read_only_mapping() -> None:
+    evt = ClaimEvent(claimer=CLAIMER_A, amount_raw=1, tx_hash="0x01", block_number=2, log_index=0, timestamp=3)
+    assert evt["claimer"] == CLAIMER_A
+    assert evt.get("missing", "x") == "x"
+    assert "tx_hash" in evt
+    assert list(evt) == ["claimer", "amount_raw", "tx_hash", "block_number", "log_index", "timestamp"]
+    assert not hasattr(evt, "__dict__")
+
+
+def test_seeded_baseline_counts_in_aggregates_and_skips_covered_blocks() -> None:
+    store = EventStore([_mk_evt(90, 0), _mk_evt(110, 0)], decimals=6)
+    store.seed(ClaimsBaseline(last_block=100, claimed_raw={CLAIMER_B: 5_000_000}, claims_count=4))
+
+    # Events up to the baseline block are covered by it and dropped
+    assert [e["block_number"] for e in store] == [110]
+    assert store.merge([_mk_evt(100, 1), _mk_evt(120, 0)]) == [_mk_evt(120, 0)]
+
+    agg = store.aggregates(decimals=6)
+    assert agg.total_claimed_raw == 7_000_000
+    assert agg.claims_count == 6
+    assert agg.distribution_by_address == {CLAIMER_A: Decimal("2"), CLAIMER_B: Decimal("5")}
+    assert store.aggregates(decimals=5).total_claimed_adj == Decimal("70")
+
+    store.clear()
+    assert store.baseline is None
+    assert EventStore(decimals=6).last_block == 0
+
+
+def test_claimer_index_answers_history_and_prefix_lookups() -> None:
+    claimer_c = "0x" + "ab" * 19 + "00"
+    store = EventStore([_mk_evt(10, 0), _mk_evt(12, 0, CLAIMER_B), _mk_evt(14, 1)])
+    # Live append, backfilled older row and an out-of-order insert all keep the index sorted
+    store.merge([_mk_evt(20, 0, claimer_c, 7)])
+    store.merge([_mk_evt(5, 0), _mk_evt(6, 2, CLAIMER_B)])
+    store.merge([_mk_evt(11, 3)])
+
+    history = store.get_claimer_history(CLAIMER_A.upper().replace("0X", "0x"))
+    assert [(e["block_number"], e["log_index"]) for e in history] == [(5, 0), (10, 0), (11, 3), (14, 1)]
+    assert [store[i]["claimer"] for i in store.claimer_positions(CLAIMER_B)] == [CLAIMER_B, CLAIMER_B]
+    assert store.get_claimer_history(claimer_c)[0]["amount_raw"] == 7
+    assert store.get_claimer_history("0x" + "cc" * 20) == store.get_claimer_history("not an address") == []
+
+    assert store.find_claimers("0xA") == [CLAIMER_A, claimer_c]
+    assert store.find_claimers("abab", limit=1) == [claimer_c]
+    assert store.find_claimers("0x") == [CLAIMER_A, claimer_c, CLAIMER_B]
+    assert store.find_claimers("0xzz") == []
+
+    # Many new claimers at once are merged into the sorted prefix list
+    many = ["0x" + f"{i:02x}" * 20 for i in range(0x10, 0x90)]
+    store.merge([_mk_evt(100 + i, 0, claimer) for i, claimer in enumerate(many)])
+    assert store.find_claimers("0x", limit=1000) == sorted([*many, CLAIMER_A, claimer_c, CLAIMER_B])
+
+    # Bulk loads index in one pass; clears drop the index
+    loaded = EventStore.from_packed(store.packed_rows())
+    assert loaded.claimer_positions(CLAIMER_A) == store.claimer_positions(CLAIMER_A)
+    assert loaded.find_claimers("0xb") == [CLAIMER_B]
+    loaded.clear()
+    assert loaded.find_claimers("") == [] and loaded.get_claimer_history(CLAIMER_A) == []
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from streamlit_app.core.event_store import EventStore
+from streamlit_app.core.event_table import EventQuery, EventTable
+from streamlit_app.ui import views
+
+CLAIMER_A = "0x" + "aa" * 20
+CLAIMER_B = "0x" + "bb" * 20
+
+
+def _mk_evt(block: int, claimer: str, amount_raw: int) -> dict[str, Any]:
+    return {
+        "claimer": claimer,
+        "amount_raw": amount_raw,
+        "tx_hash": f"0x{block:064x}",
+        "block_number": block,
+        "log_index": 0,
+        "timestamp": 1_700_000_000 + block,
+    }
+
+
+def test_pages_are_windowed_sorted_and_filtered_on_the_store() -> None:
+    amounts = {1: 5, 2: 2**200, 3: 7, 4: 256, 5: 1}
+    store = EventStore([_mk_evt(b, CLAIMER_A if b % 2 else CLAIMER_B, a) for b, a in amounts.items()])
+    table = EventTable(store)
+
+    page = table.query(EventQuery(), offset=1, limit=2)
+    assert page.total == 5
+    assert page.columns["block_number"] == [4, 3]
+    assert page.positions.tolist() == [3, 2]
+    assert table.query(EventQuery(descending=False), offset=4, limit=10).columns["block_number"] == [5]
+
+    by_amount = table.query(EventQuery(sort="amount_raw"), limit=10)
+    assert by_amount.columns["amount_raw"] == sorted(amounts.values(), reverse=True)
+
+    page = table.query(EventQuery(claimer=CLAIMER_A.upper().replace("0X", "0x"), from_block=2, to_block=5), limit=10)
+    assert (page.total, page.columns["block_number"]) == (2, [5, 3])
+    assert table.query(EventQuery(claimer="0xnothex"), limit=10).total == 0
+    # A prefix matches in any case, including an odd number of hex digits
+    assert table.query(EventQuery(claimer="0xAA"), limit=10).columns["block_number"] == [5, 3, 1]
+    assert table.query(EventQuery(claimer="b", to_block=3), limit=10).columns["block_number"] == [2]
+    assert table.query(EventQuery(claimer="0x" + "aa" * 19 + "a"), limit=10).total == 3
+
+    # The claimer filter is answered by the store's claimer index, not a column scan
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(store, "packed_columns", Mock(side_effect=AssertionError("scanned the columns")))
+        assert table.query(EventQuery(claimer=CLAIMER_B), limit=10).columns["block_number"] == [4, 2]
+
+    mask = np.array([True, False, True, True, False])
+    page = table.query(EventQuery(sort="amount_raw", descending=False), limit=10, mask=mask)
+    assert page.columns["amount_raw"] == [5, 7, 256]
+
+    # The amount order is rebuilt once the store changes
+    store.merge([_mk_evt(6, CLAIMER_B, 10)])
+    assert table.query(EventQuery(sort="amount_raw", descending=False), offset=3, limit=1).columns["amount_raw"] == [10]
+
+    with pytest.raises(ValueError):
+        table.query(EventQuery(sort="tx_hash"))
+    with pytest.raises(ValueError):
+        table.query(EventQuery(), mask=mask)
+
+
+def test_live_tail_frame_covers_only_the_newest_rows() -> None:
+    store = EventStore([_mk_evt(b, CLAIMER_A, 10**18 * b) for b in range(1, 201)])
+    page = EventTable(store).query(EventQuery(), limit=views.LIVE_TAIL_ROWS)
+    statuses = np.full(len(store), 1, dtype=np.int8)
+    frame = views._page_frame(page, statuses, 18)
+
+    assert len(frame) == views.LIVE_TAIL_ROWS
+    assert frame["block_number"].iloc[0] == 200
+    assert frame["amount"].iloc[0] == 200.0
+    assert frame["amount_raw"].iloc[0] == str(200 * 10**18)
+    assert set(frame["Check"]) == {"✅"}
@@ -1,8 +1,35 @@
 from __future__ import annotations
 
+import gzip
+import io
+import json
+import sys
 from typing import Any
 
-from streamlit_app.core.exports import build_snapshot, events_to_csv
+import pytest
+
+from streamlit_app.core.claims_aggregate import ClaimsBaseline
+from streamlit_app.core.event_store import EventStore
+from streamlit_app.core.exports import (
+    CompressionError,
+    SnapshotCache,
+    SnapshotError,
+    arrow_schema,
+    build_snapshot,
+    compressed_writer,
+    compression_for_path,
+    decompress,
+    events_to_csv,
+    iter_events_csv,
+    iter_snapshot_json,
+    load_snapshot,
+    uint256_values,
+    write_events_arrow_ipc,
+    write_events_csv,
+    write_events_parquet,
+    write_snapshot,
+    zstd_available,
+)
 
 
 def test_build_snapshot_and_csv() -> None:
@@ -44,3 +71,169 @@ def test_build_snapshot_and_csv() -> None:
     assert ",1_000_000,".replace("_", "") in csv_text
 
 
+def test_snapshot_round_trips_into_a_baseline() -> None:
+    events: list[dict[str, Any]] = [
+        {"claimer": "0xAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA", "amount_raw": 1_234_567, "block_number": 10},
+        {"claimer": "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa", "amount_raw": 2**200, "block_number": 15},
+    ]
+    snapshot = build_snapshot(chain="mainnet", contract="0xcc", events=events, decimals=6)
+
+    loaded = load_snapshot(json.dumps(snapshot).encode(), decimals=18)
+    assert (loaded.chain, loaded.contract) == ("mainnet", "0xcc")
+    # Amounts come back in raw units using the decimals recorded in the snapshot
+    assert loaded.baseline == ClaimsBaseline(
+        last_block=15, claimed_raw={"0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa": 1_234_567 + 2**200}, claims_count=2
+    )
+
+
+def test_snapshot_cache_updates_from_the_claim_delta() -> None:
+    def evt(block: int, claimer: str, amount_raw: int) -> dict[str, Any]:
+        return {
+            "claimer": claimer,
+            "amount_raw": amount_raw,
+            "tx_hash": f"0x{block:064x}",
+            "block_number": block,
+            "log_index": 0,
+            "timestamp": block,
+        }
+
+    a, b, c = ("0x" + ch * 40 for ch in "abc")
+    store = EventStore([evt(1, a, 10**6), evt(2, b, 5)], decimals=6)
+    cache = SnapshotCache(chain="mainnet", contract="0xcc")
+    first = cache.snapshot(store, decimals=6)
+    assert cache.snapshot(store, decimals=6) is first
+    mark, changed = store.changed_claimers(None)
+    assert changed is None
+
+    store.merge([evt(3, c, 1), evt(4, a, 10**6)])
+    _, changed = store.changed_claimers(mark)
+    assert changed == [c, a]
+    # A bulk-loaded store journals its rows too, and a spliced batch reports each claimer once
+    loaded = EventStore.from_packed(store.packed_rows(), decimals=6)
+    loaded_mark, _ = loaded.changed_claimers(None)
+    assert loaded_mark == (loaded.epoch, 4)
+    loaded.merge([evt(5, b, 1), evt(6, c, 1), evt(7, b, 1)])
+    assert loaded.changed_claimers(loaded_mark)[1] == [b, c]
+    snapshot = cache.snapshot(store, decimals=6)
+    expected = build_snapshot(
+        chain="mainnet", contract="0xcc", events=store, decimals=6, aggregates=store.aggregates(decimals=6), last_block=4
+    )
+    assert snapshot == expected
+    assert snapshot["claimed_by"][a] == "2"
+    buf = io.BytesIO()
+    cache.write(store, buf, decimals=6)
+    assert json.loads(buf.getvalue()) == expected
+
+    # A clear starts a new epoch, so the next snapshot is rebuilt from scratch
+    store.clear()
+    store.merge([evt(9, b, 7)])
+    assert cache.snapshot(store, decimals=6)["claimed_by"] == {b: "0.000007"}
+
+
+def test_load_snapshot_rejects_invalid_input() -> None:
+    with pytest.raises(SnapshotError):
+        load_snapshot("not json", decimals=6)
+    with pytest.raises(SnapshotError):
+        load_snapshot(json.dumps({"claimed_by": {}}), decimals=6)
+    with pytest.raises(SnapshotError):
+        load_snapshot(json.dumps({"last_block": 1, "claimed_by": {"0xaa": "0.0000001"}}), decimals=6)
+    # A corrupt or truncated gzip upload is a snapshot error, not a crash
+    archive = gzip.compress(json.dumps({"last_block": 1, "claimed_by": {}}).encode())
+    truncated, bad_deflate, bad_method = archive[:-6], archive[:10] + b"\xff" * 4 + archive[14:], archive[:2] + b"\x07" + archive[3:]
+    for corrupt in (truncated, bad_deflate, bad_method):
+        with pytest.raises(SnapshotError, match="Cannot read snapshot"):
+            load_snapshot(corrupt, decimals=6)
+
+
+def test_missing_zstd_codec_is_a_compression_error_with_an_install_hint(monkeypatch: pytest.MonkeyPatch) -> None:
+    # None in sys.modules makes `import zstandard` raise ImportError
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    assert not zstd_available()
+    with pytest.raises(SnapshotError, match="pip install"):
+        load_snapshot(b"\x28\xb5\x2f\xfd" + b"\x00" * 8, decimals=6)
+    with pytest.raises(CompressionError, match="pip install"), compressed_writer(io.BytesIO(), "zstd"):
+        pass
+    with pytest.raises(CompressionError, match="Corrupt gzip"):
+        decompress(gzip.compress(b"{}")[:-4])
+
+
+def test_iter_events_csv_streams_store_in_chunks() -> None:
+    events = [
+        {
+            "claimer": f"0x{i:040x}",
+            "amount_raw": 2**200 + i,
+            "tx_hash": f"0x{i:064x}",
+            "block_number": 10 + i,
+            "log_index": 0,
+            "timestamp": 1000 + i,
+        }
+        for i in range(5)
+    ]
+    store = EventStore(events)
+
+    chunks = list(iter_events_csv(store, chunk_rows=2))
+    assert len(chunks) == 3
+    assert chunks[0].splitlines()[0] == "claimer,amount_raw,tx_hash,block_number,log_index,timestamp"
+    # Same text as the row-wise writer for plain mappings, amounts kept exact
+    assert "".join(chunks) == "".join(iter_events_csv(events, chunk_rows=2)) == events_to_csv(events)
+    assert f",{2**200 + 4}," in chunks[-1]
+    assert events_to_csv(EventStore()) == "claimer,amount_raw,tx_hash,block_number,log_index,timestamp\r\n"
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_exports_stream_and_read_back(compression: str) -> None:
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    events = [
+        {"claimer": f"0x{i:040x}", "amount_raw": 10**18 + i, "tx_hash": f"0x{i:064x}", "block_number": i, "log_index": 0, "timestamp": i}
+        for i in range(1, 6)
+    ]
+    snapshot = build_snapshot(chain="mainnet", contract="0xcc", events=events, decimals=18)
+    # Streaming JSON matches a one-shot dump, chunk boundaries included
+    assert "".join(iter_snapshot_json(snapshot, chunk_entries=2)) == json.dumps(snapshot, separators=(",", ":"))
+
+    csv_buf, snap_buf = io.BytesIO(), io.BytesIO()
+    write_events_csv(events, csv_buf, compression=compression, chunk_rows=2)
+    write_snapshot(snapshot, snap_buf, compression=compression)
+    assert decompress(csv_buf.getvalue()).decode() == events_to_csv(events)
+    loaded = load_snapshot(snap_buf.getvalue(), decimals=6)
+    assert loaded.baseline.claims_count == 5
+    assert loaded.baseline.claimed_raw["0x" + "0" * 39 + "3"] == 10**18 + 3
+    if compression == "gzip":
+        assert gzip.decompress(csv_buf.getvalue()) == events_to_csv(events).encode()
+    assert compression_for_path(f"snapshot.json{'.gz' if compression == 'gzip' else '.zst'}") == compression
+    assert compression_for_path("snapshot.json") is None
+
+
+def test_columnar_exports_keep_uint256_exact_in_row_groups() -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    events = [
+        {
+            "claimer": f"0x{i:040x}",
+            "amount_raw": 2**256 - 1 - i,
+            "tx_hash": f"0x{i:064x}",
+            "block_number": 10 + i,
+            "log_index": i,
+            "timestamp": 1000 + i,
+        }
+        for i in range(5)
+    ]
+
+    buf = io.BytesIO()
+    write_events_parquet(events, buf, chunk_rows=2)
+    buf.seek(0)
+    parquet = pq.ParquetFile(buf)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert uint256_values(table.column("amount_raw")) == [e["amount_raw"] for e in events]
+    assert table.column("claimer").to_pylist() == [e["claimer"] for e in events]
+
+    buf = io.BytesIO()
+    write_events_arrow_ipc(EventStore(events), buf, chunk_rows=2)
+    reader = pa.ipc.open_file(pa.BufferReader(buf.getvalue()))
+    assert reader.num_record_batches == 3
+    ipc_table = reader.read_all()
+    assert ipc_table.schema.equals(arrow_schema())
+    assert uint256_values(ipc_table.column("amount_raw")) == [e["amount_raw"] for e in events]
+    assert ipc_table.column("block_number").to_pylist() == [10, 11, 12, 13, 14]
@@ -2,6 +2,14 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from streamlit_app.core.event_store import EventStore
+from streamlit_app.core.worker import SyncState
 from streamlit_app.ui.state import AppState
 
 
@@ -59,3 +67,29 @@ def test_live_mode_reset() -> None:
     assert app.live_running is False
     assert app.events == []
     assert app.last_block == 0
+
+
+def test_live_tick_pulls_worker_state_and_reruns_the_page_on_structural_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ticks refresh the session from the worker; finished syncs rerun the whole page."""
+    app_module = pytest.importorskip("streamlit_app.app")
+    store = EventStore([{"claimer": "0x" + "aa" * 20, "amount_raw": 1, "tx_hash": "0x01", "block_number": 5}])
+    state = SyncState(store=store, aggregates=store.aggregates(decimals=18), last_block=5, version=1, syncing=True)
+    worker = SimpleNamespace(state=state)
+    rerun = Mock(side_effect=RuntimeError("rerun"))
+    monkeypatch.setattr(app_module.st, "rerun", rerun)
+    monkeypatch.setattr(app_module.st, "info", Mock())
+    tick = app_module.follow_worker(worker, state, refresh_seconds=5)
+
+    app = AppState()
+    worker.state = replace(state, last_block=9)
+    tick(app)
+    assert (app.store, app.last_block) == (store, 9)
+    rerun.assert_not_called()
+
+    worker.state = replace(state, syncing=False)
+    with pytest.raises(RuntimeError, match="rerun"):
+        tick(app)
+    # Live sync stopped by another viewer (e.g. a reset) reruns the page too
+    worker.state = replace(state, live=True)
+    with pytest.raises(RuntimeError, match="rerun"):
+        tick(app)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from streamlit_app.service import SyncHub
+
+KEY_A = ("mainnet", "0x" + "aa" * 20, "0x01")
+KEY_B = ("mainnet", "0x" + "bb" * 20, "0x01")
+
+
+def test_hub_shares_workers_and_evicts_them_once_unwatched() -> None:
+    now = [0.0]
+    hub = SyncHub(idle_ttl=60, clock=lambda: now[0])
+    factory = Mock(side_effect=lambda: Mock(name="worker"))
+
+    worker = hub.subscribe("s1", KEY_A, factory)
+    assert hub.subscribe("s2", KEY_A, factory) is worker
+    assert hub.subscribe("s1", KEY_A, factory) is worker
+    assert factory.call_count == 1
+    assert hub.subscribers(KEY_A) == 2
+
+    # Switching key moves the subscription; a closed session is pruned
+    other = hub.subscribe("s1", KEY_B, factory)
+    hub.prune(lambda session_id: session_id != "s2")
+    assert (hub.subscribers(KEY_A), hub.subscribers(KEY_B)) == (0, 1)
+
+    # Kept warm for the TTL, then stopped and dropped
+    now[0] = 59
+    assert hub.evict_idle() == []
+    now[0] = 61
+    assert hub.evict_idle() == [KEY_A]
+    worker.stop.assert_called_once()
+    assert len(hub) == 1
+
+    hub.unsubscribe("s1")
+    now[0] = 200
+    assert hub.evict_idle() == [KEY_B]
+    other.stop.assert_called_once()
+    # A new subscriber gets a fresh worker
+    assert hub.subscribe("s3", KEY_A, factory) is not worker
+
+
+def test_live_sync_runs_while_any_session_wants_it() -> None:
+    hub = SyncHub()
+    worker = hub.subscribe("s1", KEY_A, Mock)
+    hub.subscribe("s2", KEY_A, Mock)
+
+    hub.set_live("s1", True)
+    hub.set_live("s2", True)
+    # One viewer stopping leaves live sync on for the other
+    hub.set_live("s1", False)
+    assert worker.set_live.call_args_list[-1].args == (True,)
+    # The last live viewer leaving (here by switching contract) stops it
+    hub.subscribe("s2", KEY_B, Mock)
+    assert worker.set_live.call_args_list[-1].args == (False,)
+
+
+def test_sync_settings_change_only_without_other_viewers() -> None:
+    hub = SyncHub()
+    worker = hub.subscribe("s1", KEY_A, Mock)
+    assert hub.configure("s1", page_size=100)
+    hub.subscribe("s2", KEY_A, Mock)
+
+    # Matching settings are accepted; conflicting ones leave the worker as configured
+    assert hub.configure("s2", page_size=100)
+    assert not hub.configure("s2", page_size=500)
+    worker.configure.assert_called_once_with(page_size=100)
+
+    hub.unsubscribe("s1")
+    assert hub.configure("s2", page_size=500)
+    worker.configure.assert_called_with(page_size=500)
+
+
+def test_hub_builds_workers_outside_its_lock() -> None:
+    hub = SyncHub()
+    release = threading.Event()
+    built: list[Mock] = []
+
+    def slow_factory() -> Mock:
+        release.wait(5)
+        built.append(Mock(name="worker"))
+        return built[-1]
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    try:
+        loading = pool.submit(hub.subscribe, "s1", KEY_A, slow_factory)
+        _wait_until(lambda: KEY_A in hub._building)
+        waiting = pool.submit(hub.subscribe, "s2", KEY_A, slow_factory)
+        # Other keys and sessions are not blocked by the build
+        assert hub.subscribe("s3", KEY_B, Mock) is not None
+        hub.unsubscribe("s3")
+        release.set()
+        assert loading.result(5) is waiting.result(5)
+    finally:
+        pool.shutdown()
+    assert len(built) == 1
+    assert hub.subscribers(KEY_A) == 2
+
+
+def _wait_until(predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
@@ -6,7 +6,14 @@ from unittest.mock import Mock
 import eth_abi
 from eth_utils import event_abi_to_log_topic, to_checksum_address
 
-from streamlit_app.core.sync import Cursor, SyncResult, initial_sync
+from streamlit_app.core.sync import (
+    Cursor,
+    ProgressTracker,
+    SyncProgress,
+    SyncResult,
+    backfill_ranges,
+    initial_sync,
+)
 
 
 def _make_claim_event_abi() -> dict[str, Any]:
@@ -21,6 +28,18 @@ def _make_claim_event_abi() -> dict[str, Any]:
     }
 
 
+def _mk_log(event_abi: dict[str, Any], block: int) -> dict[str, Any]:
+    claimer = to_checksum_address("0x000000000000000000000000000000000000dEaD")
+    return {
+        "topics": ["0x" + event_abi_to_log_topic(event_abi).hex()],
+        "data": "0x" + eth_abi.encode(["address", "uint256"], [claimer, 10**6]).hex(),
+        "blockNumber": block,
+        "transactionHash": f"0x{block:064x}",
+        "logIndex": 0,
+        "timeStamp": 1_700_000_000 + block,
+    }
+
+
 def test_initial_sync_paginates_decodes_and_dedups() -> None:
     event_abi = _make_claim_event_abi()
     topic0 = event_abi_to_log_topic(event_abi).hex()
@@ -73,3 +92,55 @@ def test_initial_sync_paginates_decodes_and_dedups() -> None:
     assert result2.aggregates.total_claimed_raw == result.aggregates.total_claimed_raw
 
 
+def test_backfill_ranges_are_newest_first_and_cover_range() -> None:
+    assert backfill_ranges(0, 249, 100) == [(150, 249), (50, 149), (0, 49)]
+    assert backfill_ranges(10, 20, 0) == [(10, 20)]
+    assert backfill_ranges(30, 20, 100) == []
+
+
+def test_progress_tracker_reports_coverage_throughput_and_eta() -> None:
+    now = [100.0]
+    reports: list[SyncProgress] = []
+    tracker = ProgressTracker(1, 1000, reports.append, clock=lambda: now[0])
+
+    # Newest chunk first, two pages
+    tracker.start_range(501, 1000)
+    now[0] = 102.0
+    tracker.page([{"blockNumber": 600}, {"blockNumber": 700}])
+    assert reports[-1].blocks_covered == 200
+    now[0] = 104.0
+    tracker.page([{"blockNumber": 750}])
+    tracker.finish_range()
+
+    progress = reports[-1]
+    assert (progress.blocks_covered, progress.pages, progress.logs) == (500, 2, 3)
+    assert progress.fraction == 0.5
+    assert progress.logs_per_s == 0.75
+    assert progress.eta_s == 4.0
+
+
+def test_initial_sync_reports_progress_per_page() -> None:
+    abi = _make_claim_event_abi()
+
+    def fetch_logs_paginated(**kwargs: Any) -> list[dict[str, Any]]:
+        pages = [[_mk_log(abi, 10)], [_mk_log(abi, 30)]]
+        for page in pages:
+            kwargs["on_page"](page)
+        return [log for page in pages for log in page]
+
+    client = Mock()
+    client.fetch_logs_paginated = fetch_logs_paginated
+    reports: list[SyncProgress] = []
+    res = initial_sync(
+        blockscout_client=client,
+        address="0x2222222222222222222222222222222222222222",
+        event_abi=abi,
+        from_block=1,
+        to_block=40,
+        page_size=1,
+        decimals=6,
+        progress=reports.append,
+    )
+
+    assert res.aggregates.claims_count == 2
+    assert [(p.pages, p.blocks_covered) for p in reports] == [(1, 10), (2, 30), (2, 40)]
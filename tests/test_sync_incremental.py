@@ -6,6 +6,8 @@ from unittest.mock import Mock
 import eth_abi
 from eth_utils import event_abi_to_log_topic, to_checksum_address
 
+from streamlit_app.core.decode import decode_logs
+from streamlit_app.core.event_store import EventStore
 from streamlit_app.core.sync import SyncResult, incremental_sync
 
 
@@ -75,3 +77,33 @@ def test_incremental_sync_with_overlap_confirmation_window() -> None:
     keys = {(e["tx_hash"], e["log_index"]) for e in res.events}
     assert len(keys) == len(res.events)
 
+
+def test_incremental_sync_merges_into_persistent_store() -> None:
+    event_abi = _make_claim_event_abi()
+    claimer = to_checksum_address("0x000000000000000000000000000000000000dEaD")
+    amount = 10**6
+
+    store = EventStore(decode_logs([event_abi], [_mk_log(event_abi, b, 0, claimer, amount) for b in (198, 199, 200)]), decimals=6)
+    overlap_and_new = [_mk_log(event_abi, b, 0, claimer, amount) for b in (199, 200, 201, 202)]
+
+    mock_client = Mock()
+    mock_client.fetch_logs_paginated = Mock(return_value=overlap_and_new)  # type: ignore[attr-defined]
+
+    res = incremental_sync(
+        blockscout_client=mock_client,
+        address=to_checksum_address("0x2222222222222222222222222222222222222222"),
+        event_abi=event_abi,
+        latest_block=210,
+        confirmation_blocks=5,
+        page_size=1000,
+        decimals=6,
+        store=store,
+    )
+
+    # Overlap window starts from the store's cursor, and only new logs are merged
+    assert mock_client.fetch_logs_paginated.call_args.kwargs["from_block"] == 195
+    assert res.store is store
+    assert [e["block_number"] for e in res.new_events] == [201, 202]
+    assert len(store) == 5
+    assert res.cursor.last_block == 202
+    assert res.aggregates.total_claimed_raw == 5 * amount
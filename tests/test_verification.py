@@ -3,10 +3,25 @@
 from __future__ import annotations
 
 import io
-from unittest.mock import MagicMock
+import sys
+from unittest.mock import MagicMock, Mock
 
+import numpy as np
 import pandas as pd
-
+import pytest
+
+from streamlit_app.core import verification
+from streamlit_app.core.event_store import EventStore
+from streamlit_app.core.verification import (
+    AllowlistError,
+    Check,
+    ClaimVerifier,
+    WaveReconciliation,
+    allowlist_digest,
+    load_allowlist,
+    load_allowlist_cached,
+    read_allowlist,
+)
 from streamlit_app.ui.state import AppState
 
 
@@ -189,3 +204,167 @@ def test_csv_column_validation():
 0x1234,1000"""
     df_invalid = pd.read_csv(io.StringIO(invalid_csv))
     assert not all(col in df_invalid.columns for col in required_cols)
+
+
+def test_load_allowlist_packs_exact_wei_and_indexes_addresses():
+    csv_data = (
+        "address,wave1_bard_wei,wave2_bard_wei,note\n"
+        "0xABCDEF1234567890123456789012345678901234,500000000000000000,1500000000000000000,x\n"
+        f"0x1234567890123456789012345678901234567890,{2**200 + 1},,y\n"
+        "0xabcdef1234567890123456789012345678901234,7,256,dup\n"
+    )
+
+    allowlist = load_allowlist(csv_data.encode(), chunk_rows=2)
+
+    assert len(allowlist) == 2
+    # Wei beyond int64 stays exact; empty cells count as 0
+    assert allowlist.expected('0x1234567890123456789012345678901234567890') == {
+        'wave1_bard_wei': 2**200 + 1,
+        'wave2_bard_wei': 0,
+    }
+    # Lookups ignore case and the last row for a repeated address wins
+    assert allowlist.expected('0xABCDEF1234567890123456789012345678901234') == {'wave1_bard_wei': 7, 'wave2_bard_wei': 256}
+    assert '0x' + '00' * 20 not in allowlist
+    assert allowlist.expected('0xunknown') is None
+    assert allowlist.sample(1) == ['0x1234567890123456789012345678901234567890']
+
+
+def test_load_allowlist_rejects_bad_input():
+    with pytest.raises(AllowlistError, match="must contain columns"):
+        load_allowlist(b"address,amount_wei\n0x1234,1000\n")
+    with pytest.raises(AllowlistError, match="line 3"):
+        load_allowlist(b"address,wave1_bard_wei,wave2_bard_wei\n" + b"0x" + b"11" * 20 + b",1,2\n0x1234,1,2\n")
+    with pytest.raises(AllowlistError, match="Cannot read CSV"):
+        load_allowlist(b"address,wave1_bard_wei\n" + b"0x" + b"11" * 20 + b",1,2,3\n")
+    with pytest.raises(AllowlistError, match="wave2_bard_wei"):
+        load_allowlist(b"address,wave1_bard_wei,wave2_bard_wei\n" + b"0x" + b"11" * 20 + b",1,-2\n")
+
+
+def test_load_allowlist_without_pyarrow_uses_pandas(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "pyarrow.csv", None)
+    rows = "".join(f"0x{i:040x},{10**24 + i},{i}\n" for i in range(5))
+
+    allowlist = load_allowlist(("address,wave1_bard_wei,wave2_bard_wei\n" + rows).encode(), chunk_rows=2)
+
+    assert len(allowlist) == 5
+    assert allowlist.expected(f"0x{3:040x}") == {'wave1_bard_wei': 10**24 + 3, 'wave2_bard_wei': 3}
+
+
+def _claim(block: int, claimer: str, amount_raw: int) -> dict:
+    return {
+        'claimer': claimer,
+        'amount_raw': amount_raw,
+        'tx_hash': f'0x{block:064x}',
+        'block_number': block,
+        'log_index': 0,
+        'timestamp': 1_700_000_000 + block,
+    }
+
+
+def test_claim_verifier_consumes_waves_and_updates_incrementally():
+    a, b, c = ('0x' + ch * 40 for ch in 'abc')
+    allowlist = load_allowlist(f"address,wave1_bard_wei,wave2_bard_wei\n{a},100,{2**70}\n{b},5,6\n".encode())
+    store = EventStore([_claim(10, a, 100), _claim(11, b, 7), _claim(12, c, 100), _claim(13, a, 100)])
+    verifier = ClaimVerifier(allowlist)
+
+    assert verifier.update(store).tolist() == [Check.FIRST, Check.MISMATCH, Check.UNLISTED, Check.DUPLICATE]
+
+    # Appended events are verified against the waves consumed so far
+    store.merge([_claim(20, a, 2**70), _claim(21, b, 5), _claim(22, b, 5)])
+    assert verifier.update(store).tolist()[4:] == [Check.FIRST, Check.FIRST, Check.DUPLICATE]
+    assert verifier.claim_waves.tolist() == [0, -1, -1, -1, 1, 0, -1]
+
+    # A backfilled older event takes wave 1 first, so everything is re-verified
+    store.merge([_claim(5, a, 100)])
+    assert verifier.update(store).tolist() == [
+        Check.FIRST, Check.DUPLICATE, Check.MISMATCH, Check.UNLISTED, Check.DUPLICATE, Check.FIRST, Check.FIRST, Check.DUPLICATE
+    ]
+
+    store.clear()
+    assert verifier.update(store).tolist() == []
+
+
+def test_claim_verifier_handles_any_number_of_waves_and_deadlines():
+    a = '0x' + 'aa' * 20
+    header = ",".join(f"wave{i}_bard_wei" for i in (10, 2, 1, 3, 4, 5))
+    # Columns come out in wave order; wave 3 and 4 share an amount, wave 5 is empty
+    allowlist = load_allowlist(f"address,{header},note\n{a},10,2,1,7,7,,x\n".encode())
+    assert allowlist.waves == tuple(f"wave{i}_bard_wei" for i in (1, 2, 3, 4, 5, 10))
+
+    verifier = ClaimVerifier(allowlist, deadlines={'wave3_bard_wei': 1_700_000_050, 'wave10_bard_wei': 1_700_000_000})
+    store = EventStore([_claim(10, a, 7), _claim(60, a, 7), _claim(70, a, 7), _claim(80, a, 10), _claim(90, a, 0)])
+
+    assert verifier.update(store).tolist() == [Check.FIRST, Check.FIRST, Check.DUPLICATE, Check.LATE, Check.MISMATCH]
+    assert verifier.claim_waves.tolist() == [2, 3, -1, 5, -1]
+
+
+def test_reconciliation_tracks_unclaimed_addresses_and_outstanding_wei():
+    a, b, c = ('0x' + ch * 40 for ch in 'abc')
+    allowlist = load_allowlist(
+        f"address,wave1_bard_wei,wave2_bard_wei\n{a},{2**200},{2**70}\n{b},5,0\n{c},7,9\n".encode()
+    )
+    verifier = ClaimVerifier(allowlist)
+    reconciliation = verifier.reconciliation
+    assert reconciliation.listed_addresses == 3
+    assert reconciliation.summary()[0] == WaveReconciliation(
+        wave='wave1_bard_wei', listed=3, claimed=0, expected_wei=2**200 + 12, claimed_wei=0
+    )
+
+    store = EventStore([_claim(10, a, 2**200), _claim(11, b, 6), _claim(12, b, 5), _claim(13, b, 5)])
+    verifier.update(store)
+    store.merge([_claim(20, a, 2**70)])
+    verifier.update(store)
+
+    wave1, wave2 = reconciliation.summary()
+    assert (wave1.claimed, wave1.unclaimed, wave1.outstanding_wei) == (2, 1, 7)
+    assert (wave2.listed, wave2.claimed, wave2.outstanding_wei) == (2, 1, 9)
+    assert reconciliation.claimed_addresses == 2
+    assert reconciliation.unclaimed_addresses() == [c]
+    assert reconciliation.unclaimed_addresses('wave2_bard_wei') == [c]
+    assert reconciliation.is_claimed(b, 'wave1_bard_wei') and not reconciliation.is_claimed(c, 'wave1_bard_wei')
+
+    buf = io.BytesIO()
+    reconciliation.write_csv(buf)
+    assert buf.getvalue().decode().splitlines() == [
+        "address,wave1_bard_wei,wave2_bard_wei,outstanding_wei",
+        f"{c},7,9,16",
+    ]
+
+    # A re-verification (here after a clear) starts the report over
+    store.clear()
+    verifier.update(store)
+    assert reconciliation.claimed_addresses == 0
+    assert reconciliation.summary()[0].outstanding_wei == 2**200 + 12
+    assert len(list(reconciliation.iter_csv(chunk_rows=2))) == 2
+
+
+def test_allowlist_index_is_cached_on_disk_by_content_hash(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    data = (
+        "address,wave1_bard_wei,wave2_bard_wei\n"
+        f"0x{'00' * 19}01,{2**100},0\n"
+        f"0x{'ff' * 20},256,1\n"
+    ).encode()
+
+    first = load_allowlist_cached(data, cache_dir=tmp_path)
+    (index_path,) = tmp_path.glob("*.allowlist")
+    assert index_path.stem == allowlist_digest(data) == first.digest
+
+    # Same bytes again: the index is mapped from disk instead of parsing the CSV
+    monkeypatch.setattr(verification, "load_allowlist", Mock(side_effect=AssertionError("parsed again")))
+    cached = load_allowlist_cached(data, cache_dir=tmp_path)
+    assert cached.digest == first.digest
+    assert cached.expected(f"0x{'00' * 19}01") == {'wave1_bard_wei': 2**100, 'wave2_bard_wei': 0}
+    assert cached.expected(f"0x{'ff' * 20}") == first.expected(f"0x{'ff' * 20}")
+    assert len(cached) == 2
+
+    # Sessions verifying against the mapped index share what is owed and never copy the amounts
+    assert np.shares_memory(verification._byte_view(cached.amounts, 32), cached.amounts)
+    first_session, second_session = ClaimVerifier(cached), ClaimVerifier(cached)
+    assert first_session.reconciliation._totals is second_session.reconciliation._totals is cached.totals
+    first_session.update(EventStore([_claim(5, f"0x{'ff' * 20}", 256)]))
+    assert first_session.reconciliation.claimed_addresses == 1
+    assert second_session.reconciliation.claimed_addresses == 0
+
+    index_path.write_bytes(b"garbage")
+    with pytest.raises(AllowlistError):
+        read_allowlist(index_path)
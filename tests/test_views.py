@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from streamlit_app.core.claims_aggregate import build_cumulative_series
+from streamlit_app.core.event_store import EventStore
+from streamlit_app.ui import views
+
+
+def _mk_evt(claimer: str, amount_raw: int, block: int, ts: int) -> dict[str, Any]:
+    return {
+        "claimer": claimer,
+        "amount_raw": amount_raw,
+        "tx_hash": f"0x{block:064x}",
+        "block_number": block,
+        "log_index": 0,
+        "timestamp": ts,
+    }
+
+
+def test_cumulative_chart_frame_matches_series_and_is_thinned(monkeypatch: pytest.MonkeyPatch) -> None:
+    events = [_mk_evt("0x" + "aa" * 20, 10**18 * b + 2**100, b, 1000 + (b * 37) % 50) for b in range(1, 60)]
+    store = EventStore(events)
+    series = build_cumulative_series(store, decimals=18)
+
+    frame = views._cumulative_frame(store.cache_key, 18, store)
+    assert frame["timestamp"].tolist() == [ts for ts, _ in series]
+    assert frame["cumulative_adj"].tolist() == pytest.approx([float(c) for _, c in series])
+    # Same key: the shared frame is returned without reading the store
+    monkeypatch.setattr(store, "packed_columns", None)
+    assert views._cumulative_frame(store.cache_key, 18, store) is frame
+    monkeypatch.undo()
+
+    monkeypatch.setattr(views, "_CHART_POINTS", 10)
+    store.merge([_mk_evt("0x" + "bb" * 20, 1, 100, 2000)])
+    thinned = views._cumulative_frame(store.cache_key, 18, store)
+    assert len(thinned) == 10
+    assert thinned["cumulative_adj"].iloc[-1] == pytest.approx(float(series[-1][1]) + 1e-18)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import eth_abi
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+
+from streamlit_app.core.event_log import SqliteEventLog
+from streamlit_app.core.worker import SyncWorker
+
+
+def _make_claim_event_abi() -> dict[str, Any]:
+    return {
+        "type": "event",
+        "name": "Claim",
+        "inputs": [
+            {"name": "account", "type": "address", "indexed": False},
+            {"name": "amount", "type": "uint256", "indexed": False},
+        ],
+        "anonymous": False,
+    }
+
+
+def _mk_log(event_abi: dict[str, Any], block: int, idx: int = 0, amount: int = 10**6) -> dict[str, Any]:
+    claimer = to_checksum_address("0x000000000000000000000000000000000000dEaD")
+    data = eth_abi.encode(["address", "uint256"], [claimer, amount])
+    return {
+        "address": to_checksum_address("0x1111111111111111111111111111111111111111"),
+        "topics": ["0x" + event_abi_to_log_topic(event_abi).hex()],
+        "data": "0x" + data.hex(),
+        "blockNumber": block,
+        "transactionHash": f"0x{block:064x}",
+        "logIndex": idx,
+        "timeStamp": 1_700_000_000 + block,
+    }
+
+
+def _mk_worker(logs_by_call: list[list[dict[str, Any]]], latest: int = 1000) -> tuple[SyncWorker, Mock]:
+    blockscout = Mock()
+    blockscout.fetch_logs_paginated = Mock(side_effect=logs_by_call)
+    rpc = Mock()
+    rpc.get_latest_block_number = Mock(return_value=latest)
+    worker = SyncWorker(
+        blockscout_client=blockscout,
+        rpc_client=rpc,
+        address="0x2222222222222222222222222222222222222222",
+        event_abi=_make_claim_event_abi(),
+        decimals=6,
+        confirmation_blocks=5,
+    )
+    return worker, blockscout
+
+
+def test_worker_initial_sync_then_live_tick_publishes_state() -> None:
+    abi = _make_claim_event_abi()
+    worker, blockscout = _mk_worker([[_mk_log(abi, 100), _mk_log(abi, 200)], [_mk_log(abi, 990)]])
+
+    worker._pending_from_block = 50
+    state = worker.run_once()
+    assert not state.syncing
+    assert state.aggregates.claims_count == 2
+    assert state.last_block == 200
+    assert blockscout.fetch_logs_paginated.call_args.kwargs["to_block"] == 1000
+
+    # Not live and nothing pending: no API calls, same state
+    assert worker.run_once() is state
+
+    worker._live = True
+    state = worker.run_once()
+    # Live window starts below the scanned head, not the last event block
+    assert blockscout.fetch_logs_paginated.call_args.kwargs["from_block"] == 995
+    assert state.aggregates.claims_count == 3
+    assert state.last_block == 990
+    assert state.last_sync_time is not None
+
+
+def _wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_worker_thread_runs_in_background_and_reports_errors() -> None:
+    abi = _make_claim_event_abi()
+    worker, blockscout = _mk_worker([[_mk_log(abi, 100)]])
+    try:
+        worker.request_initial_sync(0)
+        _wait_for(lambda: len(worker.state.store) == 1 and not worker.state.syncing)
+        assert len(worker.state.store) == 1
+
+        blockscout.fetch_logs_paginated.side_effect = RuntimeError("rate limited")
+        worker.request_initial_sync(0)
+        _wait_for(lambda: worker.state.error is not None)
+        assert worker.state.error == "rate limited"
+        # Failed resync keeps previously synced data
+        assert len(worker.state.store) == 1
+    finally:
+        worker.stop(timeout=5)
+    assert not worker.running
+
+
+def test_worker_reset_drops_data_and_stops_live() -> None:
+    abi = _make_claim_event_abi()
+    worker, _ = _mk_worker([[_mk_log(abi, 100)]])
+    worker._pending_from_block = 0
+    worker.run_once()
+    worker._live = True
+
+    worker.reset()
+    assert len(worker.state.store) == 0
+    assert not worker.state.live
+
+
+def test_worker_reset_during_sync_is_applied_between_steps(tmp_path: Path) -> None:
+    abi = _make_claim_event_abi()
+    worker, blockscout = _mk_worker([])
+    log = worker.event_log = SqliteEventLog(tmp_path / "events.sqlite")
+    first_page_seen, reset_done = threading.Event(), threading.Event()
+
+    def fetch_logs_paginated(**kwargs: Any) -> list[dict[str, Any]]:
+        kwargs["on_page"]([_mk_log(abi, 100)])
+        first_page_seen.set()
+        reset_done.wait(5)
+        kwargs["on_page"]([_mk_log(abi, 200)])
+        return []
+
+    blockscout.fetch_logs_paginated = fetch_logs_paginated
+    try:
+        worker.request_initial_sync(0)
+        assert first_page_seen.wait(5)
+        # Reset from the session thread while the step is mid-fetch
+        worker.reset()
+        reset_done.set()
+        _wait_for(lambda: not worker.state.syncing)
+    finally:
+        worker.stop(timeout=5)
+
+    # The abandoned step neither published nor persisted anything after the reset
+    assert len(worker.state.store) == 0
+    assert worker.state.last_block == 0
+    assert len(log.load(decimals=6)) == 0 and log.cursor() is None
+
+
+def test_worker_backfills_newest_first_with_live_ticks_in_between() -> None:
+    abi = _make_claim_event_abi()
+    worker, blockscout = _mk_worker(
+        [[_mk_log(abi, 950)], [_mk_log(abi, 996)], [_mk_log(abi, 600)], [_mk_log(abi, 100)]]
+    )
+    worker.configure(backfill_chunk_blocks=400, poll_interval_s=3600)
+    worker._pending_from_block = 0
+
+    # Newest chunk first, published right away
+    state = worker.run_once()
+    assert blockscout.fetch_logs_paginated.call_args.kwargs["from_block"] == 601
+    assert state.syncing
+    assert state.backfill_from == 601
+    assert [e["block_number"] for e in state.store] == [950]
+
+    # A due live tick runs before the next chunk
+    worker._live = True
+    state = worker.run_once()
+    assert blockscout.fetch_logs_paginated.call_args.kwargs["from_block"] == 995
+    assert state.last_block == 996
+
+    # Older chunks fill in behind while the next live tick is not due
+    worker.run_once()
+    state = worker.run_once()
+    calls = [c.kwargs["from_block"] for c in blockscout.fetch_logs_paginated.call_args_list]
+    assert calls == [601, 995, 201, 0]
+    assert [e["block_number"] for e in state.store] == [100, 600, 950, 996]
+    assert not state.syncing
+    assert state.backfill_from is None
+
+
+def test_worker_publishes_partial_aggregates_and_progress_per_page() -> None:
+    abi = _make_claim_event_abi()
+    worker, blockscout = _mk_worker([])
+    seen: list[tuple[int, int | None]] = []
+
+    def fetch_logs_paginated(**kwargs: Any) -> list[dict[str, Any]]:
+        for page in ([_mk_log(abi, 300)], [_mk_log(abi, 600)]):
+            kwargs["on_page"](page)
+            state = worker.state
+            assert state.progress is not None
+            seen.append((state.aggregates.claims_count, state.progress.blocks_covered))
+        return [_mk_log(abi, 300), _mk_log(abi, 600)]
+
+    blockscout.fetch_logs_paginated = fetch_logs_paginated
+    worker._pending_from_block = 1
+    state = worker.run_once()
+
+    assert seen == [(1, 300), (2, 600)]
+    assert state.aggregates.claims_count == 2
+    assert state.progress is None